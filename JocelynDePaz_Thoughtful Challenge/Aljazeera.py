@@ -1,115 +1,490 @@
 import logging
-from RPA.Excel.Files import Files
-from RPA.HTTP import HTTP
 from robocorp import workitems
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+# selenium.webdriver (all browser drivers) is imported by the methods that need it, so importing
+# this module stays cheap and the first import can happen while Chrome is pre-warmed in the background.
 from selenium.common.exceptions import TimeoutException, ElementNotInteractableException, NoSuchElementException
 import time
-import re
+import json
 import os
+from urllib.parse import quote, urljoin
 from CustomSelenium import CustomSelenium  
+from ImageDownloader import ImageDownloader
+from ImageStore import ImageStore, image_base_name, sanitize_filename
+from BrowserSession import BrowserSession
+from SearchBackend import SeleniumBackend
+from OutputSink import create_sink
+from CrawlIndex import CrawlIndex
+from Instrumentation import Instrumentation, timed
+from TextAnalytics import TextAnalytics
+from DateParser import DateParser
+from Checkpoint import Checkpoint, MAX_AGE as MAX_CHECKPOINT_AGE
+from DriverSupervisor import DriverRestarted
+from NewsArticle import NewsArticle
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+ARTICLES_XPATH = "//article[contains(@class, 'gc u-clickable-card')]"
+
+# Reads every loaded result card in a single round trip. Mirrors the fields the
+# legacy per-element extraction reads (innerText is what WebElement.text returns).
+# With the third argument set, the cards that were read are removed from the page (windowed extraction).
+EXTRACT_CARDS_SCRIPT = """
+var xpath = arguments[0], limit = arguments[1], remove = arguments[2];
+var snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var text = function (root, selector) {
+    var node = root.querySelector(selector);
+    return node ? (node.innerText || '').trim() : null;
+};
+var cards = [];
+for (var i = 0; i < snapshot.snapshotLength && cards.length < limit; i++) {
+    var card = snapshot.snapshotItem(i);
+    var link = card.querySelector('.u-clickable-card__link');
+    var image = card.querySelector('.gc__image');
+    cards.push({
+        title: link ? (link.innerText || '').trim() : null,
+        news_url: link ? link.href : null,
+        date: text(card, '.screen-reader-text'),
+        description: text(card, '.gc__excerpt'),
+        image_url: image ? image.src : null
+    });
+    if (remove) {
+        card.parentNode.removeChild(card);
+    }
+}
+return JSON.stringify(cards);
+"""
+
+# Hides the ad container and consent overlay with a stylesheet (so late arrivals are hidden too),
+# and clicks 'Allow all' and the ad close button if they are already there. Never waits.
+DISMISS_OVERLAYS_SCRIPT = """
+if (!document.getElementById('scraper-overlay-style')) {
+    var style = document.createElement('style');
+    style.id = 'scraper-overlay-style';
+    style.textContent = '.container--ads, #onetrust-consent-sdk { visibility: hidden !important; pointer-events: none !important; }';
+    document.head.appendChild(style);
+}
+var cookieClicked = false;
+var buttons = document.getElementsByTagName('button');
+for (var i = 0; i < buttons.length; i++) {
+    if (buttons[i].textContent.trim() === 'Allow all') {
+        buttons[i].click();
+        cookieClicked = true;
+        break;
+    }
+}
+var adClose = document.querySelector('.ads__close-button');
+if (adClose) {
+    adClose.click();
+}
+return cookieClicked;
+"""
+
+SORT_STATE_SCRIPT = """
+var select = document.getElementById('search-sort-option');
+return select && select.selectedIndex >= 0 ? select.options[select.selectedIndex].text.trim() : null;
+"""
+
+SORT_URL_PARAMS = {"Date": "date", "Relevance": "relevance"}
+
+# Date text of the last loaded card, used to stop loading once results are older than the cutoff.
+LAST_CARD_DATE_SCRIPT = """
+var cards = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var node = cards.snapshotLength ? cards.snapshotItem(cards.snapshotLength - 1).querySelector('.screen-reader-text') : null;
+return node ? (node.innerText || '').trim() : null;
+"""
+
+# Clicks 'Show more' and calls back as soon as new cards are appended to the DOM (or the timeout passes),
+# so each click costs one async round trip instead of a clickable wait plus count polling.
+SHOW_MORE_SCRIPT = """
+var xpath = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var count = function () {
+    return document.evaluate('count(' + xpath + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue;
+};
+var lastDate = function () {
+    var cards = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var node = cards.snapshotLength ? cards.snapshotItem(cards.snapshotLength - 1).querySelector('.screen-reader-text') : null;
+    return node ? (node.innerText || '').trim() : null;
+};
+var before = count();
+var button = document.querySelector('.show-more-button');
+if (!button || button.disabled || button.offsetParent === null) {
+    done({before: before, after: before, button: false, timed_out: false, ms: 0, last_date: lastDate()});
+    return;
+}
+var started = performance.now(), finished = false, observer, timer;
+var finish = function (timedOut) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done({before: before, after: count(), button: true, timed_out: timedOut, ms: performance.now() - started, last_date: lastDate()});
+};
+observer = new MutationObserver(function () {
+    if (count() > before) { finish(false); }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(function () { finish(true); }, timeoutMs);
+button.click();
+"""
+
 class Aljazeera:
-    def __init__(self):
-        self.browser = CustomSelenium()
-        self.excel = Files()
-        self.http = HTTP()
-        self.base_url = "https://www.aljazeera.com/"
+    def __init__(self, worker_id=0, output_dir=None, base_url=None, browser_profile="standard", index_path=None, snapshot_path=None):
+        self.browser = CustomSelenium(worker_id=worker_id, profile=browser_profile)
+        self.session = BrowserSession(self.browser)
+        self.output_dir = output_dir or os.path.join(os.getcwd(), "output")
+        self.images = ImageDownloader()
+        self.image_store = ImageStore(os.path.join(self.output_dir, "images"), self.images, alias_dir=self.output_dir)
+        # id(record) -> (record, future) of the queued image downloads
+        self.pending_images = {}
+        # Deep mode: full-article reader, created on first use, and id(record) -> (record, future) of its fetches
+        self.deep = False
+        self.articles = None
+        self.pending_articles = {}
+        # Page snapshots (see SnapshotArchive), created on first use
+        self.snapshot = False
+        self.snapshots = None
+        self.snapshot_path = snapshot_path or os.path.join(self.output_dir, "snapshots")
+        self.base_url = base_url or "https://www.aljazeera.com/"
         self.search_phrase = None
+        self.analytics = None
+        self.dates = DateParser()
+        self.cutoff = None
         self.max_results = None
+        self.extraction_mode = "batched"
+        self.navigation_mode = "direct"
+        self.direct_results_timeout = 5
+        self.backend = "selenium"
+        self.backends = {"selenium": SeleniumBackend(self)}
+        self.show_more_timeout = 10
+        self.output_formats = ["xlsx"]
+        self.sinks = None
+        self.show_more_latencies = []
+        self.window_latencies = []
+        self.index = CrawlIndex(index_path or os.path.join(self.output_dir, "crawl_index.sqlite"))
+        self.index_pending = []
+        self.use_index = True
+        self.only_new = False
+        self.checkpoint = None
+        self.instrumentation = Instrumentation(os.path.join(self.output_dir, "run_report.json"))
+        self.instrumentation.track_bytes("images", lambda: self.image_store.bytes_downloaded)
 
-    def configure(self, search_phrase, max_results, sort_by):
+    def configure(self, search_phrase, max_results, sort_by, extraction_mode="batched", navigation_mode="direct", backend="selenium",
+                  use_index=True, only_new=False, since=None, months=None, resume=True, deep=False, snapshot=False,
+                  item_id=None, checkpoint_max_age=MAX_CHECKPOINT_AGE):
+        """
+        :param item_id: Id of the work item; a retry of it resumes from the checkpoint of the failed attempt.
+        :param checkpoint_max_age: Seconds a checkpoint can be resumed after it was started; None for no limit.
+        :param deep: Also fetch every article behind news_url and add full-text counts (see ArticleReader).
+        :param snapshot: Archive a compressed copy of every loaded results page (see SnapshotArchive).
+        """
         self.search_phrase = search_phrase
-        self.max_results = min(max_results, 100)
+        self.analytics = TextAnalytics(search_phrase)
+        # Only windowed extraction keeps the page small enough for more than 100 results
+        self.max_results = max_results if extraction_mode == "windowed" else min(max_results, 100)
         self.sort_by = sort_by
+        self.extraction_mode = extraction_mode
+        self.navigation_mode = navigation_mode
+        self.backend = backend
+        self.use_index = use_index
+        self.only_new = only_new
+        self.cutoff = self.dates.cutoff(since, months)
+        self.deep = deep
+        self.snapshot = snapshot
+        self.session.supervisor.begin_item()
+        self.checkpoint = Checkpoint.for_item(
+            os.path.join(self.output_dir, "checkpoints"), max_age=checkpoint_max_age, item_id=item_id,
+            search_phrase=search_phrase, max_results=self.max_results, sort_by=sort_by, extraction_mode=extraction_mode,
+            backend=backend, use_index=use_index, only_new=only_new, since=since, months=months
+        )
+        if not resume:
+            self.checkpoint.clear()
         logging.info(f"Configured scraper with search_phrase: '{search_phrase}' and max_results: {self.max_results}")
+        if self.cutoff:
+            logging.info(f"Keeping news published since {self.cutoff.isoformat()}")
+
+    def article_reader(self):
+        if self.articles is None:
+            from ArticleReader import ArticleReader
+            articles = self.articles = ArticleReader()
+            self.instrumentation.track_bytes("articles", lambda: articles.bytes_received)
+        return self.articles
+
+    def snapshot_archive(self):
+        if self.snapshots is None:
+            from SnapshotArchive import SnapshotArchive
+            self.snapshots = SnapshotArchive(self.snapshot_path)
+        return self.snapshots
+
+    def begin_snapshot(self):
+        """
+        Starts the snapshot directory of the configured search, with the settings re-extraction needs.
+        """
+        if not self.snapshot:
+            return
+        search_id = self.snapshot_archive().begin_search(
+            search_phrase=self.search_phrase,
+            sort_by=self.sort_by,
+            max_results=self.max_results,
+            cutoff=self.cutoff.isoformat() if self.cutoff else None,
+            backend=self.backend,
+            extraction_mode=self.extraction_mode,
+            search_url=self.search_url()
+        )
+        logging.info(f"Archiving the results pages under {os.path.join(self.snapshot_path, search_id)}")
+
+    def snapshot_page(self, page, url):
+        if self.snapshot:
+            self.snapshot_archive().save(page, url)
+
+    def snapshot_loaded_page(self):
+        if self.snapshot:
+            self.snapshot_page(self.browser.driver.page_source, self.browser.driver.current_url)
+
+    def get_backend(self, name):
+        if name not in self.backends:
+            if name == "http":
+                from HttpBackend import HttpBackend
+                backend = self.backends[name] = HttpBackend()
+                backend.on_page = self.snapshot_page
+                self.instrumentation.track_bytes("http_backend", lambda: backend.bytes_received)
+            else:
+                raise ValueError(f"Unknown backend: {name}")
+        return self.backends[name]
+
+    def collect_news(self):
+        """
+        Runs the search on the configured backend and returns the news records.
+        A lightweight backend is tried first when selected; the browser is only started when it finds no results.
+        """
+        return list(self.stream_news())
+
+    def stream_news(self):
+        """
+        Generator version of collect_news: yields each record as soon as its analysis batch is done, while
+        the backend is still loading the next results. Image names are set later (attach_image).
+        """
+        if self.extraction_mode == "legacy":
+            self.open_search()
+            self.load_more_results()
+            yield from self.extract_latest_news()
+            return
 
-    def open_site(self):
+        resumed = self.resume_from_checkpoint()
+        yield from resumed
+        if self.checkpoint.stage == "extracted":
+            return
+
+        self.begin_snapshot()
+        chain = [self.backend] if self.backend == "selenium" else [self.backend, "selenium"]
+        for name in chain:
+            backend = self.get_backend(name)
+            found = 0
+            try:
+                with self.instrumentation.span(f"backend.{name}"):
+                    while True:
+                        try:
+                            # Each batch is turned into records (and its images queued) before the next one is
+                            # loaded, so found is also the position of the next card in the results
+                            for cards in backend.fetch_card_batches(self.search_url(), self.max_results, self.stop_at,
+                                                                    start=found):
+                                found += len(cards)
+                                for records in self.iter_news_records(cards):
+                                    yield from records
+                            break
+                        except DriverRestarted as e:
+                            # The browser was replaced: open the search again and carry on after the last card
+                            # read. The supervisor limits restarts.
+                            logging.warning(f"{e}; restoring the search for '{self.search_phrase}' sorted by {self.sort_by} "
+                                            f"from card {found + 1}")
+            except Exception as e:
+                if name == "selenium" or found:
+                    raise
+                logging.warning(f"{name} backend failed: {str(e)}")
+            if found:
+                logging.info(f"{name} backend returned {found} cards")
+                self.save_checkpoint(stage="extracted")
+                return
+            logging.info(f"{name} backend found no results")
+
+    def resume_from_checkpoint(self):
+        """
+        Restores the records of an earlier failed attempt at this work item. Their images are queued again
+        (downloads that completed are served from the image store) and their cards are skipped while extracting.
+        """
+        if not self.checkpoint.load():
+            return []
+        records = []
+        for entry in self.checkpoint.entries:
+            card, record = entry["card"], entry["record"]
+            if entry["new"]:
+                if self.use_index:
+                    self.index_pending.append((card, record))
+                if card["image_url"] and record["image_name"] == 'N/A':
+                    self.queue_image_download(card["image_url"], record)
+            self.queue_article_fetch(record)
+            records.append(record)
+        logging.info(f"Resuming from checkpoint: {len(records)} articles already processed, stage '{self.checkpoint.stage}'")
+        return records
+
+    def save_checkpoint(self, stage=None):
+        """
+        Saves the extraction progress and the image store manifest, so finished downloads survive a crash too.
+        """
         try:
-            self.browser.set_webdriver() 
+            self.image_store.save_manifest()
+            self.checkpoint.save(stage)
+        except Exception as e:
+            logging.error(f"Failed to save checkpoint: {str(e)}")
+
+    def clear_checkpoint(self):
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+
+    def is_expired(self, date_text):
+        """
+        True when the date is older than the configured cutoff. Cards without a readable date are kept.
+        """
+        if self.cutoff is None:
+            return False
+        published = self.dates.parse(date_text)
+        return published is not None and published < self.cutoff
+
+    def stop_at(self, card):
+        """
+        True when results sorted newest first have reached a card older than the cutoff, so nothing after it is needed.
+        """
+        return self.sort_by == "Date" and self.is_expired(card["date"])
+
+    def open_search(self):
+        """
+        Brings the browser to the sorted search results for the configured phrase.
+        Goes straight to the search results URL and only falls back to the interactive
+        homepage flow (search trigger, search box, sort select) when that page shows no results.
+        """
+        if self.navigation_mode == "direct":
+            if self.open_search_url():
+                return
+            logging.info("Direct search URL returned no results, falling back to the interactive search")
             self.browser.open_url(self.base_url)
-            logging.info(f"Opened site: {self.base_url}")
+        else:
+            self.open_site()
+        self.initiate_search()
+        self.search_news()
+        self.filter_and_sort_results()
+
+    def search_url(self):
+        url = urljoin(self.base_url, f"search/{quote(self.search_phrase, safe='')}")
+        sort_param = SORT_URL_PARAMS.get(self.sort_by)
+        return f"{url}?sort={sort_param}" if sort_param else url
+
+    @timed("open_search_url")
+    def open_search_url(self):
+        """
+        Opens the search results URL directly. Returns False when no result cards show up in time.
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
+        url = self.search_url()
+        self.open_site(url)
+        try:
+            self.wait_until(EC.presence_of_element_located((By.XPATH, ARTICLES_XPATH)), self.direct_results_timeout)
+        except TimeoutException:
+            return False
+        self.dismiss_overlays()
+
+        selected_sort = self.browser.driver.execute_script(SORT_STATE_SCRIPT)
+        if selected_sort is not None and self.sort_by and selected_sort != self.sort_by:
+            self.filter_and_sort_results()
+        logging.info(f"Opened search results directly: {url}")
+        return True
+
+    @timed("open_site")
+    def open_site(self, url=None):
+        url = url or self.base_url
+        try:
+            self.instrumentation.attach_driver(self.session.acquire())
+            self.browser.open_url(url)
+            logging.info(f"Opened site: {url}")
+        except DriverRestarted:
+            # Recovered by stream_news; the work item has not failed
+            raise
         except Exception as e:
             workitems.inputs.current.fail(
                 exception_type='APPLICATION',
                 code='OPEN_SITE_FAILED',
-                message=f"Failed to open site {self.base_url}: {str(e)}"
+                message=f"Failed to open site {url}: {str(e)}"
             )
-            logging.error(f"Failed to open site {self.base_url}: {str(e)}")
+            logging.error(f"Failed to open site {url}: {str(e)}")
             raise
 
-    def close_cookie_banner(self):
+    def dismiss_overlays(self):
+        """
+        Hides ads and the cookie banner without waiting for either to appear.
+        """
         try:
-            cookie_button_selector = (By.XPATH, "//button[text()='Allow all']")
-            cookie_button = WebDriverWait(self.browser.driver, 10).until(
-                EC.element_to_be_clickable(cookie_button_selector)
-            )
-            cookie_button.click()
-            logging.info("Closed cookie consent banner by clicking 'Allow all'.")
-        except TimeoutException:
-            logging.info("Cookie consent banner did not appear or was not interactable.")
+            if self.browser.driver.execute_script(DISMISS_OVERLAYS_SCRIPT):
+                self.session.cookie_banner_closed = True
+                logging.info("Closed cookie consent banner by clicking 'Allow all'.")
         except Exception as e:
-            logging.error(f"Failed to close cookie consent banner: {str(e)}")
+            logging.error(f"Failed to dismiss overlays: {str(e)}")
+
+    def close_cookie_banner(self):
+        if self.session.cookie_banner_closed:
+            return
+        self.dismiss_overlays()
+        if not self.session.cookie_banner_closed:
+            logging.info("Cookie consent banner did not appear or was not interactable.")
 
+    @timed("initiate_search")
     def initiate_search(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
             self.close_cookie_banner()
 
             search_button_selector = (By.CSS_SELECTOR, "div.site-header__search-trigger > button.no-styles-button")
-            search_button = WebDriverWait(self.browser.driver, 10).until(
-                EC.element_to_be_clickable(search_button_selector)
-            )
+            search_button = self.wait_until(EC.element_to_be_clickable(search_button_selector), 10)
             search_button.click()
             logging.info("Clicked search button")
         except TimeoutException:
             try:
                 burger_menu_selector = (By.CSS_SELECTOR, "button.site-header__menu-trigger")
-                burger_menu_button = WebDriverWait(self.browser.driver, 10).until(
-                    EC.element_to_be_clickable(burger_menu_selector)
-                )
+                burger_menu_button = self.wait_until(EC.element_to_be_clickable(burger_menu_selector), 10)
                 burger_menu_button.click()
                 logging.info("Opened burger menu")
                 
                 search_box_selector = (By.CSS_SELECTOR, "input.search-bar__input")
-                search_box = WebDriverWait(self.browser.driver, 10).until(
-                    EC.visibility_of_element_located(search_box_selector)
-                )
+                search_box = self.wait_until(EC.visibility_of_element_located(search_box_selector), 10)
                 search_box.click()
                 logging.info("Clicked search box inside burger menu")
             except Exception as e:
                 logging.error(f"Search box not found or not interactable after opening burger menu: {str(e)}")
                 raise
 
+    @timed("search_news")
     def search_news(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
 
-            search_box = WebDriverWait(self.browser.driver, 10).until(
-                EC.visibility_of_element_located((By.XPATH, "//div[@class='search-bar__input-container']/input[@class='search-bar__input']"))
-            )
+            search_box = self.wait_until(EC.visibility_of_element_located((By.XPATH, "//div[@class='search-bar__input-container']/input[@class='search-bar__input']")), 10)
             search_box.clear() 
             search_box.send_keys(self.search_phrase)
             search_box.send_keys(Keys.ENTER)
 
-            add_element = (By.CLASS_NAME, "ads__close-button")
-            add = WebDriverWait(self.browser.driver, 10).until(
-                    EC.visibility_of_element_located(add_element)
-                )
-            add.click()
-            
-            ads_container = self.browser.driver.find_element(By.CLASS_NAME, "container--ads")
-            self.browser.driver.execute_script("arguments[0].style.visibility='hidden'", ads_container)
+            self.dismiss_overlays()
             logging.info("Ads container hidden.")
 
             logging.info(f"Searched news with phrase: {self.search_phrase}")
+        except DriverRestarted:
+            raise
         except TimeoutException as e:
             workitems.inputs.current.fail(
                 exception_type='APPLICATION',
@@ -135,17 +510,22 @@ class Aljazeera:
             logging.error(f"Failed to search news with phrase {self.search_phrase}: {str(e)}")
             raise
 
+    @timed("filter_and_sort_results")
     def filter_and_sort_results(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import Select
+
         try:
             sort_selector = (By.ID, "search-sort-option")
-            sort_element = WebDriverWait(self.browser.driver, 10).until(
-                EC.element_to_be_clickable(sort_selector)
-            )
+            sort_element = self.wait_until(EC.element_to_be_clickable(sort_selector), 10)
             
             select = Select(sort_element)
             select.select_by_visible_text(self.sort_by)
             logging.info("Sorted results by date")
 
+        except DriverRestarted:
+            raise
         except TimeoutException as e:
             workitems.inputs.current.fail(
                 exception_type='APPLICATION',
@@ -164,12 +544,13 @@ class Aljazeera:
             raise
     
     def get_loaded_articles(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
             articles_selector = (By.CLASS_NAME, "gc.u-clickable-card")
 
-            WebDriverWait(self.browser.driver, 10).until(
-                EC.visibility_of_element_located(articles_selector)
-            )
+            self.wait_until(EC.visibility_of_element_located(articles_selector), 10)
             
             articles = self.browser.driver.find_elements(*articles_selector)
 
@@ -179,29 +560,64 @@ class Aljazeera:
             logging.error(f"Failed to get loaded articles: {str(e)}")
             raise
 
+    def wait_until(self, condition, timeout, target=None):
+        """
+        WebDriverWait on the driver (or on target, e.g. an element); the time is reported as waiting.
+        When the wait times out, a quick probe tells a slow page from a dead browser, which is restarted.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.instrumentation.waiting():
+            try:
+                return WebDriverWait(target or self.browser.driver, timeout).until(condition)
+            except TimeoutException:
+                self.session.supervisor.probe()
+                raise
+
+    def click_show_more(self):
+        """
+        Clicks 'Show more' and waits for exactly the DOM change that appends the next cards.
+        :return: Dict with the card count before and after, whether the button existed, and the latency in ms.
+        """
+        self.browser.driver.set_script_timeout(self.show_more_timeout + 5)
+        with self.instrumentation.waiting():
+            return self.browser.driver.execute_async_script(SHOW_MORE_SCRIPT, ARTICLES_XPATH, self.show_more_timeout * 1000)
+
+    @timed("load_more_results")
     def load_more_results(self):
+        """
+        Clicks 'Show more' until max_results cards are in the DOM or the button is gone.
+        Only newly appended cards are counted, and per-click latencies are kept in show_more_latencies.
+        """
         try:
-            total_loaded_results = 0
+            total_loaded_results, articles = self.get_loaded_articles()
+            self.show_more_latencies = []
+            last_date = self.browser.driver.execute_script(LAST_CARD_DATE_SCRIPT, ARTICLES_XPATH) if self.cutoff else None
 
             while total_loaded_results < self.max_results:
-                loaded_results, articles = self.get_loaded_articles()
-                total_loaded_results += loaded_results
-                if total_loaded_results >= self.max_results:
+                if self.stop_at({"date": last_date}):
+                    logging.info(f"Stopped loading: the last loaded article ({last_date}) is older than the cutoff.")
                     break
-
-                show_more_button_selector = (By.CLASS_NAME, "show-more-button")
-                try:
-                    show_more_button = WebDriverWait(self.browser.driver, 10).until(
-                        EC.element_to_be_clickable(show_more_button_selector)
-                    )
-                    show_more_button.click()
-                    logging.info(f"Clicked 'Show more' button, total loaded: {total_loaded_results}")
-                except TimeoutException:
+                result = self.click_show_more()
+                if not result["button"]:
                     logging.info("No more articles to load or 'Show more' button not found.")
                     break
-            
+                if result["after"] <= result["before"]:
+                    logging.info(f"'Show more' added no articles within {self.show_more_timeout}s.")
+                    break
+
+                total_loaded_results = int(result["after"])
+                last_date = result["last_date"]
+                self.show_more_latencies.append(result["ms"])
+                logging.info(f"Clicked 'Show more' button: {int(result['after'] - result['before'])} new articles in {result['ms']:.0f} ms, total loaded: {total_loaded_results}")
+
+            if self.show_more_latencies:
+                average = sum(self.show_more_latencies) / len(self.show_more_latencies)
+                logging.info(f"'Show more' clicks: {len(self.show_more_latencies)}, average latency: {average:.0f} ms")
             logging.info(f"Total articles loaded: {total_loaded_results}")
 
+        except DriverRestarted:
+            raise
         except TimeoutException as e:
             workitems.inputs.current.fail(
                 exception_type='APPLICATION',
@@ -220,28 +636,199 @@ class Aljazeera:
             raise
 
     #@error_handler(code='EXTRACT_LATEST_NEWS_FAILED', message='Failed to extract latest news')
+    @timed("extract_latest_news")
     def extract_latest_news(self):
         """
         Extracts the latest news articles' details such as title, date, description, image name, and other metadata.
-        Processes the articles and adds them to a list for further processing.
+        Uses a single batched script call unless extraction_mode is set to "legacy".
+        """
+        if self.extraction_mode == "legacy":
+            return self.extract_latest_news_legacy()
+        return self.extract_latest_news_batched()
+
+    def extract_latest_news_batched(self):
+        """
+        Reads every loaded card in one execute_script round trip and builds the news records from the returned JSON.
         """
+        try:
+            return self.build_news_records(self.read_loaded_cards())
+        except DriverRestarted:
+            raise
+        except Exception as e:
+            logging.error(f"Failed to extract latest news: {str(e)}")
+            workitems.inputs.current.fail(
+                exception_type='APPLICATION',
+                code='EXTRACT_NEWS_FAILED',
+                message=f"Failed to extract latest news: {str(e)}"
+            )
+            raise
+
+    @timed("read_loaded_cards")
+    def read_loaded_cards(self):
+        self.snapshot_loaded_page()
+        return json.loads(self.browser.driver.execute_script(EXTRACT_CARDS_SCRIPT, ARTICLES_XPATH, self.max_results))
+
+    def read_card_windows(self, start=0):
+        """
+        Windowed extraction: yields each newly loaded batch of cards and removes those cards from the page
+        before clicking 'Show more' again, so the DOM never holds more than one batch and the cost of each
+        batch stays flat however many results are requested. Per-batch latencies are kept in window_latencies.
+        :param start: Number of cards already read before the browser was restarted. They are loaded and
+                      removed again, but not yielded.
+        """
+        remaining = self.max_results - start
+        skip = start
+        self.window_latencies = []
+        started = time.perf_counter()
+        while remaining > 0:
+            # Before the script removes the window's cards from the page
+            self.snapshot_loaded_page()
+            cards = json.loads(self.browser.driver.execute_script(EXTRACT_CARDS_SCRIPT, ARTICLES_XPATH, remaining + skip, True))
+            self.window_latencies.append((time.perf_counter() - started) * 1000)
+            cards, skip = cards[skip:], max(0, skip - len(cards))
+            remaining -= len(cards)
+            if cards:
+                yield cards
+            if remaining <= 0 or any(self.stop_at(card) for card in cards):
+                break
+
+            started = time.perf_counter()
+            result = self.click_show_more()
+            if not result["button"] or result["after"] <= result["before"]:
+                logging.info("No more articles to load or 'Show more' added no articles.")
+                break
+
+        if self.window_latencies:
+            average = sum(self.window_latencies) / len(self.window_latencies)
+            logging.info(f"Windowed extraction: {len(self.window_latencies)} batches, "
+                         f"{self.max_results - start - remaining} cards, average {average:.0f} ms per batch")
+
+    @timed("build_news_records")
+    def build_news_records(self, cards):
+        return [record for records in self.iter_news_records(cards) for record in records]
+
+    def iter_news_records(self, cards):
+        """
+        Builds the records for the cards. Cards already in the crawl index with unchanged content reuse
+        the stored record and image (or are left out when only_new is set). The new ones are analysed in
+        batches, and every batch is written to the checkpoint; cards already in the checkpoint are skipped.
+        Yields the records of each batch once it is analysed.
+        """
+        news_data = []
+        batch = []
+        for card in cards:
+            if self.stop_at(card):
+                logging.info(f"Stopped extraction at the first article older than the cutoff: {card['title']} ({card['date']})")
+                break
+            if self.is_expired(card["date"]) or self.checkpoint.is_processed(card):
+                continue
+            try:
+                with self.instrumentation.span("article", news_url=card["news_url"]):
+                    cached = self.cached_news_record(card)
+                    if cached is not None:
+                        if not self.only_new:
+                            news_data.append(cached)
+                            batch.append((card, cached, False))
+                        continue
+                    record = self.build_news_record(card)
+                    news_data.append(record)
+                    batch.append((card, record, True))
+                    if self.use_index:
+                        self.index_pending.append((card, record))
+            except Exception as e:
+                logging.error(f"Error processing article: {str(e)}")
+                workitems.inputs.current.fail(
+                    exception_type='APPLICATION',
+                    code='ARTICLE_PROCESSING_ERROR',
+                    message=f"Error processing article: {str(e)}"
+                )
+                continue
+            if len(batch) >= self.checkpoint.every:
+                self.checkpoint_records(batch)
+                batch = []
+                yield news_data
+                news_data = []
+        self.checkpoint_records(batch)
+        if news_data:
+            yield news_data
+
+    def checkpoint_records(self, batch):
+        """
+        Analyses the newly built records of the batch and adds the batch to the checkpoint.
+        :param batch: (card, record, new) triples.
+        """
+        if not batch:
+            return
+        self.analytics.analyse_batch([record for card, record, new in batch if new])
+        for card, record, new in batch:
+            self.checkpoint.add(card, record, new)
+            self.queue_article_fetch(record)
+        self.save_checkpoint()
+
+    def cached_news_record(self, card):
+        if not self.use_index:
+            return None
+        published = self.dates.parse(card["date"])
+        published_at = published.isoformat() if published else None
+        cached = self.index.lookup(card, published_at)
+        if cached is not None:
+            record, search_phrase = cached
+            # The same day, but the card's relative date may read differently than when it was stored
+            record.update({"date": card["date"] if card["date"] is not None else 'N/A', "published_at": published_at})
+            image_present = record["image_name"] == 'N/A' or os.path.exists(os.path.join(self.output_dir, record["image_name"]))
+            if image_present:
+                if search_phrase != self.search_phrase:
+                    record["search_phrase_count"] = self.count_search_phrase(record["title"], record["description"])
+                self.index.count_lookup(hit=True)
+                logging.info(f"Known article, reused from crawl index: {record['title']}")
+                return record
+        self.index.count_lookup(hit=False)
+        return None
+
+    def count_search_phrase(self, title, description):
+        return self.analytics.count_phrase(f"{title}\n{description}")
+
+    def build_news_record(self, card):
+        """
+        Turns the raw fields of a result card into a NewsArticle.
+        search_phrase_count, contains_money and money_mentions are filled in by TextAnalytics.analyse_batch.
+        :param card: Dict with title, news_url, date, description and image_url (missing values as None).
+        """
+        if card["title"] is None:
+            raise NoSuchElementException("Card has no 'u-clickable-card__link' element")
+        record = NewsArticle.from_card(card, self.dates.parse(card["date"]))
+
+        logging.info(f"Extracted news: {record.title} - {record.date} - {record.description[:50]}...")
+        if card["image_url"]:
+            self.queue_image_download(card["image_url"], record)
+        else:
+            logging.warning("No image found for this article.")
+        return record
+
+    def extract_latest_news_legacy(self):
+        """
+        Extracts the articles element by element. Kept as a fallback and as the baseline for benchmarks/bench_extraction.py.
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
             news_data = []
             total_loaded_results = 0
 
-            articles = self.browser.driver.find_elements(By.XPATH, "//article[contains(@class, 'gc u-clickable-card')]")
-            time.sleep(2)
+            articles = self.browser.driver.find_elements(By.XPATH, ARTICLES_XPATH)
+            self.instrumentation.sleep(2)
 
             for i in range(len(articles)):
                 if total_loaded_results >= self.max_results:
                     break
                 
                 try:
-                    article = self.browser.driver.find_elements(By.XPATH, "//article[contains(@class, 'gc u-clickable-card')]")[i]
+                    article = self.browser.driver.find_elements(By.XPATH, ARTICLES_XPATH)[i]
 
                     title_element = article.find_element(By.CLASS_NAME, 'u-clickable-card__link')
                     self.browser.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", title_element)
-                    time.sleep(1)
+                    self.instrumentation.sleep(1)
                     
                     title = title_element.text.strip()
 
@@ -253,6 +840,12 @@ class Aljazeera:
                     except NoSuchElementException:
                         date = "N/A"
 
+                    if self.stop_at({"date": date}):
+                        logging.info(f"Stopped extraction at the first article older than the cutoff: {title} ({date})")
+                        break
+                    if self.is_expired(date):
+                        continue
+
                     try:
                         description_element = article.find_element(By.CLASS_NAME, 'gc__excerpt')
                         description = description_element.text.strip()
@@ -261,28 +854,32 @@ class Aljazeera:
 
                     # Extract image URL, if available
                     try:
-                        image_element = WebDriverWait(article, 10).until(
-                            EC.visibility_of_element_located((By.CLASS_NAME, 'gc__image'))
-                        )
+                        if self.browser.images_enabled:
+                            image_element = self.wait_until(EC.visibility_of_element_located((By.CLASS_NAME, 'gc__image')), 10, target=article)
+                        else:
+                            # Not rendered without images; the src is there all the same
+                            image_element = article.find_element(By.CLASS_NAME, 'gc__image')
                         image_url = image_element.get_attribute('src') if image_element else 'N/A'
                         image_name = self.download_image(image_url, title)
                     except Exception:
                         logging.warning("No image found for this article.")
                         image_name = 'N/A'
 
-                    search_phrase_count = title.lower().count(self.search_phrase.lower()) + description.lower().count(self.search_phrase.lower())
+                    search_phrase_count = self.count_search_phrase(title, description)
                     
                     contains_money = self.check_for_money(title + " " + description)
 
-                    news_data.append({
-                        "title": title,
-                        "date": date,
-                        "description": description,
-                        "image_name": image_name,
-                        "search_phrase_count": search_phrase_count,
-                        "contains_money": contains_money,
-                        "news_url": url
-                    })
+                    published = self.dates.parse(date)
+                    news_data.append(NewsArticle(
+                        title,
+                        date=date,
+                        published_at=published.isoformat() if published else None,
+                        description=description,
+                        image_name=image_name,
+                        search_phrase_count=search_phrase_count,
+                        contains_money=contains_money,
+                        news_url=url
+                    ))
 
                     total_loaded_results += 1
                     logging.info(f"Extracted news: {title} - {date} - {description[:50]}...")
@@ -308,18 +905,100 @@ class Aljazeera:
 
     
     def sanitize_filename(self, filename):
-        return re.sub(r'[<>:"/\\|?*]', '_', filename)
-    
-    def download_image(self, url, title=""):
+        return sanitize_filename(filename)
+
+    def image_base_name(self, title=""):
+        return image_base_name(title)
+
+    def queue_image_download(self, url, record):
+        """
+        Hands the image to the image store's download pool.
+        The readable image_name is set on the record by join_image_downloads once the content hash is known.
+        """
+        self.pending_images[id(record)] = (record, self.image_store.submit(url))
+        logging.info(f"Queued image download from {url}")
+
+    def queue_article_fetch(self, record):
+        """
+        In deep mode, hands the record's article to the article reader, unless it was read before
+        (e.g. a record reused from the crawl index). attach_article adds the results to the record.
+        """
+        if not self.deep or not record.get("news_url") or record.get("body_word_count") is not None:
+            return
+        self.pending_articles[id(record)] = (record, self.article_reader().submit(record["news_url"], self.search_phrase))
+
+    def attach_article(self, record):
+        """
+        Waits for the record's queued article, if any, and adds the full-text fields (None when it failed).
+        Safe to call from another thread, like attach_image.
+        """
+        queued = self.pending_articles.pop(id(record), None)
+        if queued is None:
+            return
+        from ArticleReader import DEEP_FIELDS
+
         try:
-            image_name = url.split("/")[-1].split('?')[0]
-            logging.info(f"Raw extracted image name: {image_name}")
+            record.update(queued[1].result())
+        except Exception as e:
+            logging.error(f"Failed to read article '{record['title']}': {str(e)}")
+            record.update(dict.fromkeys(DEEP_FIELDS))
 
-            sanitized_title = self.sanitize_filename("_".join(title.split()[:3])) 
-            image_name = f"{sanitized_title}.jpg"
+    def finish_record(self, record):
+        """
+        Completes a record once its image and (in deep mode) its article are in. The enrich stage of NewsPipeline.
+        """
+        self.attach_image(record)
+        self.attach_article(record)
+
+    @timed("join_image_downloads")
+    def join_image_downloads(self):
+        """
+        Waits for the queued downloads and sets image_name on each record ('N/A' when its image failed),
+        and in deep mode for the queued articles. The now final records are written to the crawl index. Must run before the records are saved; records
+        streamed through NewsPipeline are already complete, so only the bookkeeping is left.
+        """
+        pending = list(self.pending_images.values())
+        articles = list(self.pending_articles.values())
+        with self.instrumentation.waiting():
+            for record, _ in pending:
+                self.attach_image(record)
+            for record, _ in articles:
+                self.attach_article(record)
+        self.image_store.finish()
+        logging.info(f"Finished {len(pending)} image downloads. Image store: {self.image_store.stats()}")
+        if self.snapshots is not None and self.snapshot:
+            self.snapshots.finish()
+            logging.info(f"Page snapshots: {self.snapshots.stats()}")
+        if self.articles is not None and self.deep:
+            logging.info(f"Article reader: {self.articles.stats()}")
+        if self.checkpoint is not None and self.checkpoint.entries:
+            # Keeps the final image names, so a retry after a failed save does not download again
+            self.checkpoint.rewrite()
+
+        if self.index_pending:
+            indexed, self.index_pending = self.index_pending, []
+            self.index.store(indexed, self.search_phrase)
+        if self.use_index:
+            logging.info(f"Crawl index: {self.index.stats()}")
 
-            image_path = os.path.join(os.getcwd(), "output", image_name)
-            self.http.download(url, image_path)
+    def attach_image(self, record):
+        """
+        Waits for the record's queued download, if any, and sets its image_name ('N/A' when the image failed).
+        Safe to call from another thread (the streaming pipeline's enricher).
+        """
+        queued = self.pending_images.pop(id(record), None)
+        if queued is None:
+            return
+        try:
+            entry = queued[1].result()
+            record["image_name"] = self.image_store.alias(entry, self.image_base_name(record["title"]))
+        except Exception as e:
+            logging.error(f"Failed to download image for '{record['title']}': {str(e)}")
+            record["image_name"] = 'N/A'
+
+    def download_image(self, url, title=""):
+        try:
+            image_name = self.image_store.alias(self.image_store.fetch(url), self.image_base_name(title))
             logging.info(f"Downloaded image: {image_name} from {url}")
             return image_name
         except Exception as e:
@@ -332,63 +1011,29 @@ class Aljazeera:
             raise
 
     def check_for_money(self, text):
-        money_patterns = [
-            r"\$\d+(?:\.\d{1,2})?",  
-            r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+dollars?",  
-            r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+USD",  
-            r"£\d+(?:,\d{3})*(?:\.\d{1,2})?",  
-            r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+pounds?",  
-            r"€\d+(?:,\d{3})*(?:\.\d{1,2})?",  
-            r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+euros?"
-        ]
-        for pattern in money_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                logging.info(f"Money pattern found in text: {text}")
-                return True
-        return False
+        mentions = self.analytics.find_money(text)
+        if mentions:
+            logging.debug(f"Money mentioned in text: {', '.join(mention['text'] for mention in mentions)}")
+        return bool(mentions)
+
+    def open_outputs(self):
+        if self.sinks is None:
+            self.sinks = [create_sink(output_format, self.output_dir) for output_format in self.output_formats]
+            for sink in self.sinks:
+                sink.open()
+                logging.info(f"Opened {sink.extension} output at {sink.path}")
+        return self.sinks
 
+    @timed("save_to_excel")
     def save_to_excel(self, news_data):
+        """
+        Appends the records to the run's output sinks (task_extracted.xlsx, plus any other output_formats).
+        Rows from every work item of the run end up in the same files, which are finalised by close_outputs.
+        """
         try:
-            output_path = os.path.join(os.getcwd(), "output", "task_extracted.xlsx")
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            sheet_name = "Sheet" 
-            sheet_name = "News"
-
-            if os.path.exists(output_path):
-                self.excel.open_workbook(output_path)
-                logging.info(f"Opened existing Excel workbook at {output_path}")
-
-            else:
-                self.excel.create_workbook(output_path)
-                logging.info(f"Created new Excel workbook at {output_path}")
-            self.excel.create_workbook(output_path)
-            logging.info(f"Created new Excel workbook at {output_path}")
-
-            processed_data = []
-            for item in news_data:
-                processed_data.append({
-                    "title": item["title"],
-                    "date": item["date"],
-                    "description": item["description"],
-                    "image_name": item["image_name"],
-                    "search_phrase_count": item["search_phrase_count"],
-                    "contains_money": item["contains_money"],
-                    "news_url": item["news_url"]
-                })
-                
-            if self.excel.worksheet_exists(sheet_name):
-                    self.excel.remove_worksheet(sheet_name)
-                    logging.info(f"Removed existing worksheet '{sheet_name}'")
-
-            self.excel.create_worksheet(sheet_name)
-            self.excel.set_active_worksheet(sheet_name)
-            logging.info(f"Created and set active worksheet '{sheet_name}'")
-
-            self.excel.append_rows_to_worksheet(processed_data, header=True)
-
-            self.excel.save_workbook(output_path)
-            logging.info(f"Saved data to Excel workbook at {output_path}")
-            
+            for sink in self.open_outputs():
+                sink.write_many(news_data)
+            logging.info(f"Appended {len(news_data)} rows to {', '.join(self.output_formats)} output")
 
         except Exception as e:
             workitems.inputs.current.fail(
@@ -399,11 +1044,48 @@ class Aljazeera:
             logging.error(f"Failed to save data to Excel: {str(e)}")
             raise
 
-    
+    @timed("close_outputs")
+    def close_outputs(self):
+        if self.sinks is None:
+            return
+        sinks, self.sinks = self.sinks, None
+        for sink in sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logging.error(f"Failed to finalise {sink.path}: {str(e)}")
+                raise
+
+    def write_run_report(self, **extra):
+        """
+        Writes output/run_report.json: per-item and per-stage timings, WebDriver commands, waiting vs
+        active time and bytes downloaded, plus the browser session, image store and crawl index stats.
+        """
+        if self.articles is not None:
+            extra.setdefault("article_reader", self.articles.stats())
+        if self.snapshots is not None:
+            extra.setdefault("snapshots", self.snapshots.stats())
+        try:
+            return self.instrumentation.write_report(
+                session=self.session.metrics(),
+                image_store=self.image_store.stats(),
+                crawl_index=self.index.stats(),
+                **extra
+            )
+        except Exception as e:
+            logging.error(f"Failed to write run report: {str(e)}")
+
     def close_browser(self):
         try:
-            self.browser.close_browser()
-            logging.info("Closed browser successfully")
+            self.session.close()
+            for backend in self.backends.values():
+                backend.close()
+            self.index.close()
+            if self.articles is not None:
+                self.articles.close()
+            if self.snapshots is not None:
+                self.snapshots.close()
+            logging.info(f"Closed browser successfully. Session metrics: {self.session.metrics()}")
         except Exception as e:
             workitems.inputs.current.fail(
                 exception_type='APPLICATION',
@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from lxml import etree, html
+
+from HttpBackend import USER_AGENT
+from HttpPool import HttpPool, RetryableStatus, raise_for_retryable
+from TextAnalytics import TextAnalytics
+
+# Fields deep mode adds to every record; None when the article could not be fetched.
+DEEP_FIELDS = ("body_word_count", "body_phrase_count", "body_contains_money", "body_money_mentions")
+
+# Paragraphs of the article body, most specific layout first.
+BODY_PARAGRAPHS = [
+    etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' wysiwyg ')]//p"),
+    etree.XPath("//main//article//p"),
+    etree.XPath("//article//p"),
+    etree.XPath("//main//p"),
+]
+
+# One TextAnalytics per search phrase in each parser process.
+analytics_by_phrase = {}
+
+
+def article_text(page):
+    """
+    Text of the article body paragraphs in page (HTML text or bytes), or of every paragraph when
+    none of the known body layouts matches.
+    """
+    document = html.fromstring(page)
+    for paragraphs in BODY_PARAGRAPHS:
+        nodes = paragraphs(document)
+        if nodes:
+            break
+    else:
+        nodes = document.iter("p")
+    return "\n".join(" ".join(node.text_content().split()) for node in nodes)
+
+
+def analyse_article(page, search_phrase):
+    """
+    Runs in the parser processes.
+    :return: Dict with the DEEP_FIELDS for the article in page.
+    """
+    analytics = analytics_by_phrase.get(search_phrase)
+    if analytics is None:
+        analytics = analytics_by_phrase[search_phrase] = TextAnalytics(search_phrase)
+    text = article_text(page)
+    mentions = analytics.find_money(text)
+    return {
+        "body_word_count": len(text.split()),
+        "body_phrase_count": analytics.count_phrase(text),
+        "body_contains_money": bool(mentions),
+        "body_money_mentions": mentions,
+    }
+
+
+def copy_outcome(source, target):
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class ArticleReader(HttpPool):
+    """
+    Deep mode: fetches the full articles behind the collected news_url values and analyses their text.
+
+    Pages are fetched on a bounded thread pool sharing one keep-alive connection pool, with at most
+    per_host requests in flight and at most rate_per_host requests started per second for each host.
+    Parsing and analysis run in a process pool, so the lxml and regex work does not compete with the
+    fetch threads (or the browser) for the GIL. Articles are never opened in the browser.
+    """
+    thread_name_prefix = "article-fetch"
+    resource = "article"
+    settings = dict(HttpPool.settings, rate_per_host=float, parse_workers=lambda value: max(1, int(value)))
+
+    def __init__(self, max_workers=8, per_host=4, rate_per_host=5.0, parse_workers=None, retries=2, backoff=0.5, timeout=20):
+        super().__init__(max_workers, per_host, retries, backoff, timeout)
+        self.parsers = None
+        self.next_slots = {}
+        self.bytes_received = 0
+        self.fetched = 0
+        self.failed = 0
+        self.apply_settings(rate_per_host=rate_per_host, parse_workers=parse_workers)
+
+    def configure(self, max_workers=None, per_host=None, rate_per_host=None, parse_workers=None):
+        """
+        Updates the fetch settings. Running pools are drained and rebuilt on the next submit.
+        """
+        if self.update_settings(max_workers=max_workers, per_host=per_host, rate_per_host=rate_per_host,
+                                parse_workers=parse_workers):
+            self.next_slots = {}
+
+    def create_session(self):
+        session = super().create_session()
+        session.headers["User-Agent"] = USER_AGENT
+        return session
+
+    def start(self):
+        if self.executor is None:
+            super().start()
+            # Spawned rather than forked: the fetch, image and pipeline threads may hold locks at fork time
+            self.parsers = ProcessPoolExecutor(max_workers=self.parse_workers or os.cpu_count() or 1,
+                                               mp_context=multiprocessing.get_context("spawn"))
+        return self.executor
+
+    def submit(self, url, search_phrase):
+        """
+        Queues the article and returns immediately.
+        :return: Future resolving to the analysis dict (see analyse_article).
+        """
+        result = Future()
+        fetched = self.start().submit(self.fetch, url)
+        fetched.add_done_callback(lambda done: self.parse(done, search_phrase, result))
+        return result
+
+    def parse(self, fetched, search_phrase, result):
+        """
+        Hands a fetched page to the parser processes; the fetch thread is free again right away.
+        """
+        try:
+            parsed = self.parsers.submit(analyse_article, fetched.result(), search_phrase)
+        except Exception as e:
+            result.set_exception(e)
+            return
+        parsed.add_done_callback(lambda done: copy_outcome(done, result))
+
+    def fetch(self, url):
+        """
+        Downloads the article page, retrying connection errors and retryable status codes with exponential backoff.
+        :return: The page bytes.
+        """
+        try:
+            content = self.with_retries(url, lambda: self.get_page(url))
+        except (requests.RequestException, RetryableStatus):
+            with self.lock:
+                self.failed += 1
+            raise
+        with self.lock:
+            self.bytes_received += len(content)
+            self.fetched += 1
+        return content
+
+    def get_page(self, url):
+        self.wait_for_slot(url)
+        response = self.session.get(url, timeout=self.timeout)
+        raise_for_retryable(response, url)
+        response.raise_for_status()
+        return response.content
+
+    def wait_for_slot(self, url):
+        """
+        Spaces the requests to one host at least 1 / rate_per_host seconds apart.
+        """
+        if not self.rate_per_host:
+            return
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slots.get(host, now))
+            self.next_slots[host] = slot + 1 / self.rate_per_host
+        if slot > now:
+            time.sleep(slot - now)
+
+    def stats(self):
+        return {"fetched": self.fetched, "failed": self.failed, "bytes_received": self.bytes_received}
+
+    def close(self):
+        # The fetch threads hand their pages to the parsers, so they are drained first
+        super().close()
+        if self.parsers is not None:
+            self.parsers.shutdown(wait=True)
+            self.parsers = None
@@ -0,0 +1,152 @@
+import logging
+import threading
+from selenium.common.exceptions import WebDriverException
+
+from DriverSupervisor import DriverRestarted, DriverSupervisor
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class BrowserSession:
+    """
+    Keeps one CustomSelenium driver alive across work items.
+    The browser is recycled only after max_items searches, when the Chrome process tree has
+    grown by more than max_memory_growth_mb since launch, or when the driver stops answering.
+    prewarm() launches the first browser in the background, so Chrome boots while the work item is read.
+    Every driver runs under a DriverSupervisor, which restarts it when it hangs or dies.
+    """
+
+    def __init__(self, browser, max_items=25, max_memory_growth_mb=512):
+        self.logger = logging.getLogger(__name__)
+        self.browser = browser
+        self.max_items = max_items
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.items_served = 0
+        self.launch_memory_mb = None
+        self.cookie_banner_closed = False
+        self.launches = 0
+        self.launches_avoided = 0
+        self.recycles = {}
+        self.prewarm_thread = None
+        self.prewarmed = 0
+        self.supervisor = DriverSupervisor(self)
+
+    def acquire(self):
+        """
+        Returns a ready driver, reusing the running one whenever possible.
+        """
+        if self.wait_for_prewarm():
+            self.prewarmed += 1
+            return self.browser.driver
+        if self.browser.driver is None:
+            self.launch()
+            return self.browser.driver
+
+        reason = self.recycle_reason()
+        if reason:
+            self.logger.info(f"Recycling browser after {self.items_served} items: {reason}")
+            self.recycles[reason] = self.recycles.get(reason, 0) + 1
+            self.close()
+            self.launch()
+        else:
+            self.launches_avoided += 1
+        self.items_served += 1
+        return self.browser.driver
+
+    def launch(self):
+        self.browser.set_webdriver()
+        self.supervisor.attach(self.browser.driver)
+        self.launches += 1
+        self.items_served = 1
+        self.cookie_banner_closed = False
+        self.launch_memory_mb = self.memory_mb()
+
+    def prewarm(self):
+        """
+        Starts launching the browser on a background thread; acquire() waits for it.
+        Does nothing when a browser is already running or being launched.
+        """
+        if self.browser.driver is not None or self.prewarm_thread is not None:
+            return
+        self.prewarm_thread = threading.Thread(target=self.prewarm_launch, name="browser-prewarm", daemon=True)
+        self.prewarm_thread.start()
+
+    def prewarm_launch(self):
+        try:
+            self.launch()
+            self.logger.info("Browser pre-warmed")
+        except Exception as e:
+            # acquire() launches again in the foreground
+            self.logger.warning(f"Browser pre-warm failed: {e}")
+
+    def wait_for_prewarm(self):
+        """
+        Waits for a running pre-warm launch. True when it left a browser ready to use.
+        """
+        thread, self.prewarm_thread = self.prewarm_thread, None
+        if thread is None:
+            return False
+        thread.join()
+        return self.browser.driver is not None
+
+    def relaunch(self, reason):
+        """
+        Starts a fresh browser after the supervisor stopped a dead one.
+        """
+        self.logger.info(f"Relaunching the browser: {reason}")
+        self.browser.close_browser()
+        self.launch()
+
+    def recycle_reason(self):
+        if not self.is_healthy():
+            return "unhealthy"
+        if self.items_served >= self.max_items:
+            return "max_items"
+        memory = self.memory_mb()
+        if memory is not None and self.launch_memory_mb is not None:
+            if memory - self.launch_memory_mb > self.max_memory_growth_mb:
+                return "memory_growth"
+        return None
+
+    def is_healthy(self):
+        try:
+            self.browser.driver.execute_script("return document.readyState")
+            return True
+        except WebDriverException as e:
+            self.logger.warning(f"Browser session is unresponsive: {e}")
+            return False
+        except DriverRestarted as e:
+            # The supervisor already replaced the dead browser with a fresh one
+            self.logger.warning(f"Browser session was restarted by the health check: {e}")
+            return True
+
+    def memory_mb(self):
+        """
+        Resident memory of chromedriver and every Chrome process it spawned, or None without psutil.
+        """
+        if psutil is None:
+            return None
+        try:
+            root = psutil.Process(self.browser.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+        except (AttributeError, psutil.Error):
+            return None
+
+    def close(self):
+        self.wait_for_prewarm()
+        self.browser.close_browser()
+        self.browser.driver = None
+
+    def metrics(self):
+        return {
+            "launches": self.launches,
+            "launches_avoided": self.launches_avoided,
+            "recycles": dict(self.recycles),
+            "prewarmed": self.prewarmed,
+            "driver_source": self.browser.driver_source,
+            **self.supervisor.metrics(),
+        }
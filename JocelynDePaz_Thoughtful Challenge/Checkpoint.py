@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from NewsArticle import NewsArticle, json_default
+
+# Checkpoints older than this (seconds) are discarded instead of resumed.
+MAX_AGE = 24 * 3600
+
+
+class Checkpoint:
+    """
+    Extraction progress of one work item, kept in <directory>/<key>.jsonl until the item is done.
+    The key is derived from the work item id and the search settings, so a retried work item finds the
+    checkpoint of its failed attempt, while a new work item with the same payload starts over. A checkpoint
+    older than max_age is discarded, in case the id does not tell them apart (e.g. local work-item files).
+
+    Each processed card is appended with its record, so saving costs the same however long the run
+    gets. Stage lines mark how far the item got: "extracting" while cards are still being processed,
+    "extracted" once the record list is complete. On resume the records are restored as they were
+    and the cards already processed are skipped.
+
+    Written lines list the records an output sink already received (see mark_written), so a resumed
+    attempt does not write them to the same sink again.
+    """
+
+    def __init__(self, path, every=25, max_age=MAX_AGE):
+        """
+        :param every: Cards processed between saves.
+        :param max_age: Seconds after its creation a checkpoint is still resumed; None for no limit.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.every = every
+        self.max_age = max_age
+        self.created_at = None
+        self.stage = "extracting"
+        self.entries = []
+        self.processed = set()
+        self.written = {}
+        self.saved = 0
+        # The pipeline's writer thread marks records written while the producer saves cards
+        self.lock = threading.RLock()
+
+    @classmethod
+    def for_item(cls, directory, every=25, max_age=MAX_AGE, item_id=None, **settings):
+        """
+        :param item_id: Id of the work item.
+        :param settings: Search settings of the work item (phrase, max_results, sort order, ...).
+        """
+        settings["item_id"] = item_id
+        key = hashlib.sha1(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        return cls(os.path.join(directory, f"{key}.jsonl"), every, max_age)
+
+    def load(self):
+        """
+        Reads the checkpoint of an earlier attempt. Returns False when there is none, or when it is
+        older than max_age (it is deleted then).
+        """
+        if not os.path.exists(self.path):
+            return False
+        self.entries = []
+        self.written = {}
+        self.created_at = None
+        truncated = False
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    state = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line of an attempt that died while saving
+                    truncated = True
+                    break
+                if "created_at" in state:
+                    self.created_at = state["created_at"]
+                elif "stage" in state:
+                    self.stage = state["stage"]
+                elif "written" in state:
+                    self.written.setdefault(state["sink"], set()).update(state["written"])
+                else:
+                    state["record"] = NewsArticle.from_dict(state["record"])
+                    self.entries.append(state)
+        # Checkpoints written before created_at was recorded fall back to the file time
+        if self.created_at is None:
+            self.created_at = os.path.getmtime(self.path)
+        if self.max_age is not None and time.time() - self.created_at > self.max_age:
+            self.logger.info(f"Discarding checkpoint {self.path}: created {(time.time() - self.created_at) / 3600:.1f} h ago")
+            self.clear()
+            return False
+        self.processed = {entry["card"]["news_url"] for entry in self.entries}
+        self.saved = len(self.entries)
+        if truncated:
+            self.rewrite()
+        self.logger.info(f"Loaded checkpoint {self.path}: {len(self.entries)} processed cards, stage '{self.stage}'")
+        return True
+
+    def add(self, card, record, new):
+        """
+        :param new: True when the record was built in this run (not reused from the crawl index).
+        """
+        self.entries.append({"card": card, "record": record, "new": new})
+        self.processed.add(card["news_url"])
+
+    def is_processed(self, card):
+        return card["news_url"] in self.processed
+
+    def is_written(self, sink, news_url):
+        return news_url in self.written.get(sink, ())
+
+    def mark_written(self, sink, news_urls):
+        """
+        Records that the sink received the records with these news_url values.
+        :param sink: Key of the sink; the same key on resume means the same destination.
+        """
+        if not news_urls:
+            return
+        with self.lock:
+            self.written.setdefault(sink, set()).update(news_urls)
+            self.append([{"sink": sink, "written": list(news_urls)}])
+
+    def save(self, stage=None):
+        """
+        Appends the cards added since the last save, and the stage when it changed.
+        """
+        lines = self.entries[self.saved:]
+        self.saved = len(self.entries)
+        if stage and stage != self.stage:
+            lines = lines + [{"stage": stage, "saved_at": time.time()}]
+            self.stage = stage
+        self.append(lines)
+
+    def append(self, lines):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                if self.created_at is None:
+                    self.created_at = time.time()
+                    f.write(json.dumps({"created_at": self.created_at}) + "\n")
+                for line in lines:
+                    f.write(json.dumps(line, ensure_ascii=False, default=json_default) + "\n")
+
+    def rewrite(self):
+        """
+        Rewrites the whole checkpoint, picking up changes made to records already saved (e.g. image names).
+        """
+        tmp_path = f"{self.path}.part"
+        with self.lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                if self.created_at is None:
+                    self.created_at = time.time()
+                f.write(json.dumps({"created_at": self.created_at}) + "\n")
+                for entry in self.entries:
+                    f.write(json.dumps(entry, ensure_ascii=False, default=json_default) + "\n")
+                for sink, news_urls in self.written.items():
+                    f.write(json.dumps({"sink": sink, "written": sorted(news_urls)}, ensure_ascii=False) + "\n")
+                f.write(json.dumps({"stage": self.stage, "saved_at": time.time()}) + "\n")
+            os.replace(tmp_path, self.path)
+        self.saved = len(self.entries)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.entries = []
+        self.processed = set()
+        self.written = {}
+        self.stage = "extracting"
+        self.saved = 0
+        self.created_at = None
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from NewsArticle import NewsArticle
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    news_url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    search_phrase TEXT,
+    image_url TEXT,
+    record TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+"""
+
+
+class CrawlIndex:
+    """
+    SQLite index of the articles seen in earlier runs, keyed by news_url.
+    A card whose content hash matches the stored one is served from the index instead of being
+    re-analysed and its image re-downloaded. Image URLs and their validators live in the ImageStore manifest.
+    """
+
+    def __init__(self, path):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.connection = None
+        self.hits = 0
+        self.misses = 0
+
+    def open(self):
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.connection = sqlite3.connect(self.path)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    @staticmethod
+    def content_hash(card, published_at=None):
+        """
+        :param published_at: ISO publication datetime parsed from the card's date. Only its day is hashed, as
+        relative dates ("3 hours ago") read differently on every run; the raw date is used when it did not parse.
+        """
+        date = published_at[:10] if published_at else card.get("date")
+        content = "\x1f".join(str(value) for value in (card.get("title"), date, card.get("description"), card.get("image_url")))
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def lookup(self, card, published_at=None):
+        """
+        Returns (record, search_phrase) stored for the card when its content is unchanged, otherwise None.
+        :param published_at: ISO publication datetime parsed from the card's date.
+        """
+        row = self.open().execute(
+            "SELECT content_hash, search_phrase, record FROM articles WHERE news_url = ?", (card["news_url"],)
+        ).fetchone()
+        if row is None or row[0] != self.content_hash(card, published_at):
+            return None
+        return NewsArticle.from_dict(json.loads(row[2])), row[1]
+
+    def count_lookup(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def store(self, entries, search_phrase):
+        """
+        :param entries: (card, record) pairs whose records are final (image downloads joined).
+        """
+        now = time.time()
+        connection = self.open()
+        with connection:
+            connection.executemany(
+                """
+                INSERT INTO articles (news_url, content_hash, search_phrase, image_url, record, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(news_url) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    search_phrase = excluded.search_phrase,
+                    image_url = excluded.image_url,
+                    record = excluded.record,
+                    last_seen = excluded.last_seen
+                """,
+                [
+                    (card["news_url"], self.content_hash(card, record.get("published_at")), search_phrase, card.get("image_url"),
+                     record.to_json(), now, now)
+                    for card, record in entries
+                ],
+            )
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
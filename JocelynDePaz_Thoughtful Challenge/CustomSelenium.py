@@ -1,16 +1,64 @@
-from RPA.core.webdriver import start
 import logging
-from selenium import webdriver
 from selenium.common.exceptions import WebDriverException
+import json
 import os
+import shutil
+import tempfile
+
+BASE_DEBUGGING_PORT = 9222
+
+# Driver binaries resolved by RPA.core.webdriver, by browser. Later launches start the cached binary
+# directly and skip importing RPA.core.webdriver and its driver lookup (or download).
+DRIVER_CACHE_PATH = os.environ.get(
+    "DRIVER_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "aljazeera-robot", "drivers.json")
+)
+
+# Ad, tracking and analytics hosts plus web fonts, blocked through CDP by the "lean" profile.
+LEAN_BLOCKED_URLS = [
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*googletagservices.com*",
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*adservice.google.*",
+    "*amazon-adsystem.com*",
+    "*scorecardresearch.com*",
+    "*chartbeat.com*",
+    "*chartbeat.net*",
+    "*permutive.com*",
+    "*taboola.com*",
+    "*outbrain.com*",
+    "*facebook.net*",
+    "*.woff*",
+    "*.ttf*",
+    "*.otf*",
+]
+
+LEAN_DISK_CACHE_BYTES = 64 * 1024 * 1024
 
 class CustomSelenium:
 
-    def __init__(self):
+    def __init__(self, worker_id=0, profile="standard", capture_network=False, driver_cache_path=DRIVER_CACHE_PATH):
+        """
+        :param worker_id: Selects the debugging port and profile dir so workers don't collide.
+        :param profile: "standard" (load everything) or, opt-in, "lean" (eager page load, no images or fonts,
+            ads and trackers blocked, capped disk cache).
+        :param capture_network: Record Chrome performance logs so network_bytes can report transfer sizes.
+        :param driver_cache_path: JSON file remembering the resolved driver binaries; None disables the cache.
+        """
         self.driver = None
         self.logger = logging.getLogger(__name__)
+        self.worker_id = worker_id
+        self.debugging_port = BASE_DEBUGGING_PORT + worker_id
+        self.profile_dir = None
+        self.profile = profile
+        self.capture_network = capture_network
+        self.driver_cache_path = driver_cache_path
+        self.driver_source = None
 
     def set_chrome_options(self):
+        from selenium import webdriver
+
         options = webdriver.ChromeOptions()
         options.add_argument('--headless')
         options.add_argument('--no-sandbox')
@@ -18,19 +66,123 @@ class CustomSelenium:
         options.add_argument("--disable-gpu")
         options.add_argument('--disable-web-security')
         options.add_argument("--start-maximized")
-        options.add_argument('--remote-debugging-port=9222')
+        options.add_argument(f'--remote-debugging-port={self.debugging_port}')
+        options.add_argument(f'--user-data-dir={self.get_profile_dir()}')
         options.add_argument('--disable-dev-shm-usage')  
         options.add_experimental_option("excludeSwitches", ["enable-logging"])
+        if self.profile == "lean":
+            options.page_load_strategy = "eager"
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_argument(f"--disk-cache-size={LEAN_DISK_CACHE_BYTES}")
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if self.capture_network:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         return options
 
+    @property
+    def images_enabled(self):
+        """
+        False with the lean profile: image elements are in the page but never rendered, so never visible.
+        """
+        return self.profile != "lean"
+
+    def apply_profile(self):
+        if self.profile == "lean":
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+
+    def get_profile_dir(self):
+        """
+        Each worker gets its own Chrome profile so several browsers can run side by side on one host.
+        """
+        if self.profile_dir is None:
+            self.profile_dir = tempfile.mkdtemp(prefix=f"chrome-worker-{self.worker_id}-")
+        return self.profile_dir
+
     def set_webdriver(self, browser="Chrome"):
         options = self.set_chrome_options()
         try:
-            self.driver = start(browser, options=options)
+            self.driver = self.start_cached_driver(browser, options) or self.start_resolved_driver(browser, options)
             self.driver.set_window_size(1920, 1080)
+            self.apply_profile()
         except WebDriverException as e:
             self.logger.error(f"Error starting the WebDriver: {e}")
             self.driver = None
+            raise
+
+    def start_cached_driver(self, browser, options):
+        """
+        Starts Chrome with the driver binary cached by an earlier launch. Returns None when nothing is cached,
+        or when the cached binary no longer works (e.g. Chrome was updated); the cache entry is dropped then.
+        """
+        path = self.read_driver_cache().get(browser)
+        if browser != "Chrome" or not path or not os.path.exists(path):
+            return None
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        try:
+            driver = webdriver.Chrome(service=Service(path), options=options)
+        except WebDriverException as e:
+            self.logger.warning(f"Cached driver {path} failed to start, resolving it again: {e}")
+            self.write_driver_cache(browser, None)
+            return None
+        self.driver_source = "cache"
+        return driver
+
+    def start_resolved_driver(self, browser, options):
+        """
+        Resolves (or downloads) the driver through RPA.core.webdriver, starts it and caches its path.
+        """
+        from RPA.core.webdriver import download, start
+
+        try:
+            path = download(browser)
+        except Exception as e:
+            self.logger.warning(f"Could not resolve the {browser} driver binary: {e}")
+            path = None
+        if browser != "Chrome" or not path:
+            self.driver_source = "rpa"
+            return start(browser, options=options)
+
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        driver = webdriver.Chrome(service=Service(path), options=options)
+        self.write_driver_cache(browser, path)
+        self.driver_source = "resolved"
+        return driver
+
+    def read_driver_cache(self):
+        if not self.driver_cache_path or not os.path.exists(self.driver_cache_path):
+            return {}
+        try:
+            with open(self.driver_cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable driver cache {self.driver_cache_path}: {e}")
+            return {}
+
+    def write_driver_cache(self, browser, path):
+        """
+        Stores (or with path None, forgets) the driver binary of browser. Written atomically, since
+        several workers may launch at the same time.
+        """
+        if not self.driver_cache_path:
+            return
+        cache = self.read_driver_cache()
+        if path:
+            cache[browser] = path
+        else:
+            cache.pop(browser, None)
+        tmp_path = f"{self.driver_cache_path}.{os.getpid()}.part"
+        try:
+            os.makedirs(os.path.dirname(self.driver_cache_path) or ".", exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self.driver_cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write driver cache {self.driver_cache_path}: {e}")
 
     def open_url(self, url: str, screenshot: str = None):
         try:
@@ -39,11 +191,35 @@ class CustomSelenium:
                 self.driver.get_screenshot_as_file(screenshot)
         except WebDriverException as e:
             self.logger.error(f"Error opening URL {url}: {e}")
+            if getattr(self.driver, "supervised_by", None) is not None:
+                # The supervisor has already restarted a dead browser; anything else is not fixed by a restart
+                raise
             self.restart_driver()
             self.driver.get(url)
             if screenshot:
                 self.driver.get_screenshot_as_file(screenshot)
 
+    def page_load_timing(self):
+        """
+        Navigation timing of the current page in milliseconds.
+        """
+        return self.driver.execute_script("""
+            var nav = performance.getEntriesByType('navigation')[0];
+            return nav ? {dom_content_loaded: nav.domContentLoadedEventEnd, load: nav.loadEventEnd} : null;
+        """)
+
+    def network_bytes(self):
+        """
+        Bytes received since the last call, summed from Network.loadingFinished events.
+        Requires capture_network=True.
+        """
+        total = 0
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            if message["method"] == "Network.loadingFinished":
+                total += message["params"].get("encodedDataLength", 0)
+        return total
+
     def driver_quit(self):
         if self.driver:
             self.driver.quit()
@@ -69,4 +245,7 @@ class CustomSelenium:
             self.driver_quit()
             self.logger.info("Browser closed successfully")
         except WebDriverException as e:
-            self.logger.error(f"Error closing the browser: {e}")
\ No newline at end of file
+            self.logger.error(f"Error closing the browser: {e}")
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
\ No newline at end of file
@@ -0,0 +1,92 @@
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+
+RELATIVE_DATE = re.compile(
+    r"\b(?P<count>\d+|an?|one)\s+(?P<unit>sec|second|min|minute|hr|hour|day|week|month|year)s?\s+ago\b",
+    re.IGNORECASE,
+)
+ABSOLUTE_DATE = re.compile(
+    r"\b(?P<day_first>\d{1,2}\s+[A-Za-z]{3,9}\.?,?\s+\d{4})\b"
+    r"|\b(?P<month_first>[A-Za-z]{3,9}\.?\s+\d{1,2},?\s+\d{4})\b"
+    r"|\b(?P<iso>\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2})?)?)"
+)
+
+UNITS = {
+    "sec": timedelta(seconds=1), "second": timedelta(seconds=1),
+    "min": timedelta(minutes=1), "minute": timedelta(minutes=1),
+    "hr": timedelta(hours=1), "hour": timedelta(hours=1),
+    "day": timedelta(days=1), "week": timedelta(weeks=1),
+    "month": timedelta(days=30), "year": timedelta(days=365),
+}
+
+
+class DateParser:
+    """
+    Turns the dates shown on result cards ("Published On 12 Aug 2024", "Last update Aug 12, 2024",
+    "3 hours ago", "yesterday") into timezone-aware UTC datetimes. Dates without a time of day
+    resolve to midnight. Relative dates are counted back from now.
+    """
+
+    def __init__(self, now=None):
+        self.logger = logging.getLogger(__name__)
+        self.fixed_now = now
+
+    def now(self):
+        return self.fixed_now or datetime.now(timezone.utc)
+
+    def parse(self, text):
+        """
+        :return: The datetime in text, or None when there is none ("N/A", missing date).
+        """
+        if not text:
+            return None
+        relative = RELATIVE_DATE.search(text)
+        if relative:
+            count = relative.group("count").lower()
+            count = 1 if count in ("a", "an", "one") else int(count)
+            return self.now() - count * UNITS[relative.group("unit").lower()]
+        lowered = text.lower()
+        if "yesterday" in lowered:
+            return self.now() - timedelta(days=1)
+        if "just now" in lowered or "today" in lowered:
+            return self.now()
+
+        absolute = ABSOLUTE_DATE.search(text)
+        if absolute is None:
+            return None
+        if absolute.group("iso"):
+            parsed = datetime.fromisoformat(absolute.group("iso"))
+            return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+        if absolute.group("day_first"):
+            day, month, year = absolute.group("day_first").replace(",", " ").replace(".", " ").split()
+        else:
+            month, day, year = absolute.group("month_first").replace(",", " ").replace(".", " ").split()
+        try:
+            # "August", "Aug" and "Sept" all reduce to the abbreviation %b expects
+            return datetime.strptime(f"{day} {month[:3]} {year}", "%d %b %Y").replace(tzinfo=timezone.utc)
+        except ValueError:
+            self.logger.debug(f"Unrecognised date: {text}")
+            return None
+
+    def cutoff(self, since=None, months=None):
+        """
+        Oldest publication time to keep, or None for no limit.
+        :param since: ISO date or datetime ("2024-08-01"), or a number of days back from today (7 = the last 7 days).
+        :param months: Calendar months to include: 0 or 1 = the current month, 2 = this and the previous month, ...
+        """
+        cutoffs = []
+        today = self.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if since not in (None, ""):
+            if isinstance(since, (int, float)) or str(since).isdigit():
+                cutoffs.append(today - timedelta(days=int(since)))
+            else:
+                parsed = datetime.fromisoformat(str(since))
+                cutoffs.append(parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed)
+        if months is not None:
+            year, month = today.year, today.month - max(int(months), 1) + 1
+            while month < 1:
+                year, month = year - 1, month + 12
+            cutoffs.append(today.replace(year=year, month=month, day=1))
+        # When both are given the narrower window wins
+        return max(cutoffs) if cutoffs else None
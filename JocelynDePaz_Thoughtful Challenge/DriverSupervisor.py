@@ -0,0 +1,264 @@
+import logging
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Error messages chromedriver returns once the session can no longer be used, with the restart reason recorded for each.
+DEAD_SESSION_MESSAGES = {
+    "invalid session id": "session_lost",
+    "session deleted because of page crash": "renderer_crashed",
+    "tab crashed": "renderer_crashed",
+    "page crash": "renderer_crashed",
+    "receiving message from renderer": "renderer_unresponsive",
+    "unable to receive message from renderer": "renderer_unresponsive",
+    "chrome not reachable": "browser_unreachable",
+    "not connected to devtools": "browser_unreachable",
+    "disconnected": "browser_unreachable",
+    "no such window": "window_lost",
+    "target window already closed": "window_lost",
+}
+
+
+class DriverHung(WebDriverException):
+    """
+    A WebDriver command did not answer within its deadline.
+    """
+
+
+class DriverRestarted(Exception):
+    """
+    The supervisor replaced a dead or hung browser. The page state is gone, so the caller has to
+    restore the search (Aljazeera.stream_news does) before carrying on.
+    """
+
+    def __init__(self, reason):
+        super().__init__(f"Browser restarted: {reason}")
+        self.reason = reason
+
+
+def dead_session_reason(error):
+    """
+    The restart reason for error, or None when the session is still usable (e.g. an element was not found).
+    """
+    if isinstance(error, DriverHung):
+        return "command_hung"
+    if isinstance(error, ConnectionError) or type(error).__module__.startswith("urllib3."):
+        # The HTTP connection to chromedriver itself failed: the driver process is gone
+        return "driver_unreachable"
+    if isinstance(error, WebDriverException):
+        message = (error.msg or str(error)).lower()
+        for fragment, reason in DEAD_SESSION_MESSAGES.items():
+            if fragment in message:
+                return reason
+    return None
+
+
+class DriverSupervisor:
+    """
+    Watches every WebDriver command of a BrowserSession's driver.
+
+    Each command runs against a deadline: page loads and async scripts get the browser's own timeout plus
+    a grace period, everything else command_timeout. A command that misses its deadline, or an error showing
+    the session is gone (crashed renderer, lost session, unreachable driver), makes the supervisor stop the
+    browser (killing it when quit hangs too) and launch a new one, after an exponential backoff from the
+    second restart on. It then raises DriverRestarted so the caller can restore its page state, instead of
+    running into one wait timeout after another. After max_restarts restarts in one work item the original
+    error is raised.
+    """
+
+    def __init__(self, session, command_timeout=30, page_load_timeout=30, script_timeout=30, grace=10,
+                 probe_timeout=3, max_restarts=3, backoff=1.0, max_backoff=30):
+        """
+        :param command_timeout: Deadline of ordinary commands, in seconds.
+        :param page_load_timeout: Page load timeout set on the browser; navigation gets it plus grace.
+        :param script_timeout: Async script timeout set on the browser; async scripts get it plus grace.
+        :param probe_timeout: Deadline of the health probe after a wait timed out.
+        :param max_restarts: Restarts allowed per work item.
+        :param backoff: Delay before the second restart of a work item, doubling for each further one.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.session = session
+        self.command_timeout = command_timeout
+        self.page_load_timeout = page_load_timeout
+        self.script_timeout = script_timeout
+        self.grace = grace
+        self.probe_timeout = probe_timeout
+        self.max_restarts = max_restarts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.runner = None
+        self.item_restarts = 0
+        self.restarts = []
+        self.hung_commands = {}
+
+    def configure(self, command_timeout=None, max_restarts=None):
+        if command_timeout is not None:
+            self.command_timeout = float(command_timeout)
+        if max_restarts is not None:
+            self.max_restarts = max(0, int(max_restarts))
+
+    def begin_item(self):
+        self.item_restarts = 0
+
+    def attach(self, driver):
+        """
+        Sets the browser's page load and script timeouts and puts every command of driver under supervision.
+        """
+        if getattr(driver, "supervised_by", None) is self:
+            return
+        driver.set_page_load_timeout(self.page_load_timeout)
+        driver.set_script_timeout(self.script_timeout)
+        execute = driver.execute
+
+        def supervised_execute(driver_command, params=None):
+            return self.execute(execute, driver_command, params)
+
+        driver.unsupervised_execute = execute
+        driver.execute = supervised_execute
+        driver.supervised_by = self
+
+    def deadline(self, command):
+        if command == "get":
+            return self.page_load_timeout + self.grace
+        if command == "executeAsyncScript":
+            return self.script_timeout + self.grace
+        return self.command_timeout
+
+    def run(self, function, deadline, *args):
+        """
+        Runs function on the runner thread and waits at most deadline seconds. A runner stuck in a hung
+        command is abandoned (its thread ends once the browser is stopped).
+        """
+        if self.runner is None:
+            self.runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webdriver")
+        future = self.runner.submit(function, *args)
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeout:
+            self.runner.shutdown(wait=False)
+            self.runner = None
+            raise
+
+    def execute(self, execute, command, params):
+        if command == "setTimeouts" and params:
+            # Keeps the deadlines in line with timeouts set elsewhere (e.g. click_show_more)
+            self.page_load_timeout = params.get("pageLoad", self.page_load_timeout * 1000) / 1000
+            self.script_timeout = params.get("script", self.script_timeout * 1000) / 1000
+        try:
+            return self.run(execute, self.deadline(command), command, params)
+        except FutureTimeout:
+            self.hung_commands[command] = self.hung_commands.get(command, 0) + 1
+            error = DriverHung(f"WebDriver command '{command}' did not answer within {self.deadline(command):.1f}s")
+        except Exception as e:
+            error = e
+        if command == "quit":
+            if isinstance(error, DriverHung):
+                driver = getattr(execute, "__self__", None)
+                self.kill(getattr(getattr(getattr(driver, "service", None), "process", None), "pid", None))
+            raise error
+        reason = dead_session_reason(error)
+        if reason is None:
+            raise error
+        self.recover(reason, error)
+
+    def probe(self):
+        """
+        Checks that the page still answers, quickly. Called after a wait timed out, to tell a slow page
+        from a dead browser; restarts the browser (raising DriverRestarted) in the latter case.
+        """
+        driver = self.session.browser.driver
+        if driver is None or getattr(driver, "supervised_by", None) is not self:
+            return
+        try:
+            self.run(driver.unsupervised_execute, self.probe_timeout, "executeScript",
+                     {"script": "return document.readyState", "args": []})
+        except FutureTimeout:
+            self.recover("page_unresponsive", DriverHung(f"Page did not answer a probe within {self.probe_timeout}s"))
+        except Exception as e:
+            reason = dead_session_reason(e)
+            if reason is not None:
+                self.recover(reason, e)
+
+    def recover(self, reason, error):
+        """
+        Replaces the browser and raises DriverRestarted, or raises error once the restart budget is spent.
+        """
+        if self.item_restarts >= self.max_restarts:
+            self.logger.error(f"Browser failed again ({reason}) after {self.item_restarts} restarts, giving up: {error}")
+            raise error
+        delay = 0 if self.item_restarts == 0 else min(self.backoff * 2 ** (self.item_restarts - 1), self.max_backoff)
+        self.item_restarts += 1
+        self.logger.warning(f"Restarting the browser ({reason}) in {delay:.1f}s, restart {self.item_restarts}/{self.max_restarts}: {error}")
+        time.sleep(delay)
+        started = time.perf_counter()
+        self.stop_driver()
+        self.session.relaunch(reason)
+        self.restarts.append({
+            "reason": reason,
+            "error": str(error)[:200],
+            "at": time.time(),
+            "delay_s": delay,
+            "restart_s": round(time.perf_counter() - started, 3),
+        })
+        raise DriverRestarted(reason)
+
+    def stop_driver(self):
+        """
+        Quits the current driver without supervision; kills chromedriver and Chrome when quit does not return.
+        """
+        browser = self.session.browser
+        driver, browser.driver = browser.driver, None
+        if driver is None:
+            return
+        driver.execute = getattr(driver, "unsupervised_execute", driver.execute)
+        pid = getattr(getattr(getattr(driver, "service", None), "process", None), "pid", None)
+        quitter = threading.Thread(target=self.quit_quietly, args=(driver,), daemon=True)
+        quitter.start()
+        quitter.join(self.grace)
+        if quitter.is_alive():
+            self.logger.warning("Browser did not quit in time, killing it")
+            self.kill(pid)
+
+    def quit_quietly(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.debug(f"Ignoring error while quitting a dead browser: {e}")
+
+    def kill(self, pid):
+        if pid is None:
+            return
+        if psutil is None:
+            try:
+                os.kill(pid, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+            except OSError:
+                pass
+            return
+        try:
+            root = psutil.Process(pid)
+            for process in root.children(recursive=True) + [root]:
+                try:
+                    process.kill()
+                except psutil.Error:
+                    pass
+        except psutil.Error:
+            pass
+
+    def metrics(self):
+        reasons = {}
+        for restart in self.restarts:
+            reasons[restart["reason"]] = reasons.get(restart["reason"], 0) + 1
+        return {
+            "restarts": len(self.restarts),
+            "restart_reasons": reasons,
+            "hung_commands": dict(self.hung_commands),
+            "restart_log": self.restarts[-20:],
+        }
@@ -0,0 +1,136 @@
+from urllib.parse import urljoin, urlparse, urlencode, parse_qsl, urlunparse
+
+from lxml import etree, html
+
+from HttpPool import HttpPool, raise_for_retryable
+from SearchBackend import SearchBackend
+
+# Compiled once; same card match as Aljazeera.ARTICLES_XPATH.
+CARDS = etree.XPath("//article[contains(@class, 'gc u-clickable-card')]")
+LINK = etree.XPath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' u-clickable-card__link ')][1]")
+DATE = etree.XPath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' screen-reader-text ')][1]")
+EXCERPT = etree.XPath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' gc__excerpt ')][1]")
+IMAGE = etree.XPath(".//img[contains(concat(' ', normalize-space(@class), ' '), ' gc__image ')][1]")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+
+def node_text(nodes):
+    if not nodes:
+        return None
+    return " ".join(nodes[0].text_content().split())
+
+
+def parse_cards(page, page_url, limit=None):
+    """
+    Parses the result cards of a search results page.
+    :param page: HTML text or bytes.
+    :param page_url: URL the page was served from, used to resolve relative links.
+    :param limit: Maximum number of cards to return.
+    """
+    document = html.fromstring(page)
+    cards = []
+    for article in CARDS(document):
+        if limit is not None and len(cards) >= limit:
+            break
+        link = LINK(article)
+        image = IMAGE(article)
+        href = link[0].get("href") if link else None
+        src = image[0].get("src") if image else None
+        cards.append({
+            "title": node_text(link),
+            "news_url": urljoin(page_url, href) if href else None,
+            "date": node_text(DATE(article)),
+            "description": node_text(EXCERPT(article)),
+            "image_url": urljoin(page_url, src) if src else None,
+        })
+    return cards
+
+
+class HttpBackend(HttpPool, SearchBackend):
+    """
+    Browser-free backend: fetches the server-rendered search results over a pooled HTTP session
+    and parses the cards with compiled lxml XPath expressions. Further pages are requested with
+    page_param until max_results cards are collected or a page adds no new cards.
+
+    The cards of each page are yielded as soon as it is parsed, while the next page is already being
+    fetched on the pool, so the records of one page are built during the request for the next.
+    """
+    name = "http"
+    thread_name_prefix = "search-page"
+    resource = "results page"
+
+    def __init__(self, timeout=15, page_param="page", max_pages=200, retries=2, backoff=0.5):
+        # One page is prefetched at a time: the next URL is only known once the current page is parsed
+        super().__init__(max_workers=1, per_host=1, retries=retries, backoff=backoff, timeout=timeout)
+        self.page_param = page_param
+        self.max_pages = max_pages
+        self.bytes_received = 0
+        # Called with the body and URL of every results page fetched (e.g. Aljazeera.snapshot_page)
+        self.on_page = None
+
+    def create_session(self):
+        session = super().create_session()
+        session.headers["User-Agent"] = USER_AGENT
+        return session
+
+    def page_url(self, search_url, page):
+        if page == 0:
+            return search_url
+        parts = urlparse(search_url)
+        query = dict(parse_qsl(parts.query))
+        query[self.page_param] = str(page)
+        return urlunparse(parts._replace(query=urlencode(query)))
+
+    def fetch_page(self, url):
+        def send():
+            response = self.session.get(url, timeout=self.timeout)
+            raise_for_retryable(response, url)
+            return response
+
+        response = self.with_retries(url, send)
+        self.bytes_received += len(response.content)
+        return response
+
+    def fetch_cards(self, search_url, max_results, stop_at=None):
+        return [card for cards in self.fetch_card_batches(search_url, max_results, stop_at) for card in cards]
+
+    def fetch_card_batches(self, search_url, max_results, stop_at=None, start=0):
+        executor = self.start()
+        seen = set()
+        read = 0
+        skip = start
+        future = executor.submit(self.fetch_page, self.page_url(search_url, 0))
+        try:
+            for page in range(self.max_pages):
+                url = self.page_url(search_url, page)
+                response, future = future.result(), None
+                if response.status_code == 404:
+                    break
+                response.raise_for_status()
+                if self.on_page is not None:
+                    self.on_page(response.content, response.url)
+
+                new_cards = [card for card in parse_cards(response.content, response.url) if card["news_url"] not in seen]
+                if not new_cards:
+                    break
+                for card in new_cards:
+                    seen.add(card["news_url"])
+                cards = new_cards[:max_results - read]
+                read += len(cards)
+                self.logger.info(f"Fetched {len(new_cards)} cards from {url}")
+                stopped = stop_at is not None and any(stop_at(card) for card in cards)
+                if read < max_results and not stopped and page + 1 < self.max_pages:
+                    future = executor.submit(self.fetch_page, self.page_url(search_url, page + 1))
+
+                cards, skip = cards[skip:], max(0, skip - len(cards))
+                if cards:
+                    yield cards
+                if stopped:
+                    self.logger.info(f"Stopped paging at {url}: reached the cutoff")
+                if future is None:
+                    break
+        finally:
+            # The search ended early (or failed): the prefetched page is not needed
+            if future is not None:
+                future.cancel()
@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RetryableStatus(Exception):
+    pass
+
+
+def raise_for_retryable(response, url):
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        raise RetryableStatus(f"HTTP {response.status_code} for {url}")
+
+
+class HttpPool:
+    """
+    Bounded thread pool sharing one keep-alive connection pool, with at most per_host requests in flight
+    for each host and retries with exponential backoff. Base of ImageDownloader and ArticleReader, which
+    extend start and close with their own resources.
+
+    The pool is built on the first submit; configure drains it, and the next submit builds it again
+    with the new settings.
+    """
+    thread_name_prefix = "http"
+    # What a request fetches, for the retry log lines
+    resource = "request"
+    # Setting name -> conversion of the value given to configure
+    settings = {
+        "max_workers": lambda value: max(1, int(value)),
+        "per_host": lambda value: max(1, int(value)),
+        "retries": lambda value: max(0, int(value)),
+        "backoff": float,
+    }
+
+    def __init__(self, max_workers=8, per_host=4, retries=3, backoff=0.5, timeout=30):
+        self.logger = logging.getLogger(type(self).__module__)
+        self.executor = None
+        self.session = None
+        self.host_limits = {}
+        self.lock = threading.Lock()
+        self.timeout = timeout
+        self.apply_settings(max_workers=max_workers, per_host=per_host, retries=retries, backoff=backoff)
+
+    def configure(self, max_workers=None, per_host=None, retries=None, backoff=None):
+        """
+        Updates the pool settings; None leaves a setting unchanged.
+        """
+        self.update_settings(max_workers=max_workers, per_host=per_host, retries=retries, backoff=backoff)
+
+    def update_settings(self, **settings):
+        """
+        Drains the running pool and applies the settings that are not None.
+        :return: False when there was nothing to change.
+        """
+        settings = {name: value for name, value in settings.items() if value is not None}
+        if not settings:
+            return False
+        self.close()
+        self.apply_settings(**settings)
+        self.host_limits = {}
+        return True
+
+    def apply_settings(self, **settings):
+        for name, value in settings.items():
+            setattr(self, name, self.settings[name](value) if value is not None else None)
+
+    def create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def start(self):
+        if self.executor is None:
+            self.session = self.create_session()
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix)
+        return self.executor
+
+    def with_retries(self, url, send):
+        """
+        Calls send() while holding one of the per_host slots of url's host, retrying connection errors,
+        timeouts and RetryableStatus with exponential backoff.
+        :return: What send returns.
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.host_limit(url):
+                    return send()
+            except (requests.ConnectionError, requests.Timeout, RetryableStatus) as e:
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff * (2 ** attempt)
+                attempt += 1
+                self.logger.warning(f"Retrying {self.resource} {url} in {delay:.1f}s (attempt {attempt}/{self.retries}): {e}")
+                time.sleep(delay)
+
+    def host_limit(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.host_limits:
+                self.host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_limits[host]
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.session is not None:
+            self.session.close()
+            self.session = None
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import tempfile
+
+from HttpPool import HttpPool, raise_for_retryable
+
+
+class ImageDownloader(HttpPool):
+    """
+    Downloads images on a bounded thread pool that shares one keep-alive connection pool.
+    Downloads are streamed to a temporary file next to the target and renamed when complete,
+    so an image is never held fully in memory and a half-written file never replaces a good one.
+    """
+    thread_name_prefix = "image-download"
+    resource = "image download"
+
+    def __init__(self, max_workers=8, per_host=4, retries=3, backoff=0.5, timeout=30, chunk_size=64 * 1024):
+        super().__init__(max_workers, per_host, retries, backoff, timeout)
+        self.chunk_size = chunk_size
+
+    def submit(self, url, path, etag=None, last_modified=None):
+        """
+        Queues a download and returns immediately.
+        :param url: Image URL.
+        :param path: Destination file path.
+        :param etag: ETag of the copy already at path, sent as If-None-Match.
+        :param last_modified: Last-Modified of the copy already at path, sent as If-Modified-Since.
+        :return: Future resolving to the download result (see download).
+        """
+        return self.start().submit(self.download, url, path, etag, last_modified)
+
+    def download(self, url, path, etag=None, last_modified=None):
+        """
+        Downloads url to path, retrying connection errors and retryable status codes with exponential backoff.
+        A 304 answer to the conditional request leaves the existing file untouched.
+        :return: Dict with path, not_modified, etag, last_modified, bytes and the sha256 of the content.
+        """
+        self.start()
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return self.with_retries(url, lambda: self.stream_to_file(url, path, headers))
+
+    def stream_to_file(self, url, path, headers=None):
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self.session.get(url, stream=True, timeout=self.timeout, headers=headers) as response:
+            raise_for_retryable(response, url)
+            result = {
+                "path": path,
+                "not_modified": response.status_code == 304,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "bytes": 0,
+                "sha256": None,
+            }
+            if result["not_modified"]:
+                return result
+            response.raise_for_status()
+            digest = hashlib.sha256()
+            tmp = tempfile.NamedTemporaryFile(dir=directory, suffix=".part", delete=False)
+            try:
+                with tmp:
+                    for chunk in response.iter_content(self.chunk_size):
+                        tmp.write(chunk)
+                        digest.update(chunk)
+                        result["bytes"] += len(chunk)
+                os.replace(tmp.name, path)
+            except BaseException:
+                os.remove(tmp.name)
+                raise
+            result["sha256"] = digest.hexdigest()
+            return result
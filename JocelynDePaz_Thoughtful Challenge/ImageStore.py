@@ -0,0 +1,171 @@
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+
+
+def sanitize_filename(filename):
+    return re.sub(r'[<>:"/\\|?*]', '_', filename)
+
+
+def image_base_name(title=""):
+    """
+    Readable part of an image alias: the first three words of the article title.
+    """
+    return sanitize_filename("_".join(title.split()[:3]))
+
+
+class ImageStore:
+    """
+    Content-addressed image storage: each distinct image is stored once under blobs/<sha256[:2]>/<sha256>.jpg,
+    and the output rows point at a readable alias (<first three title words>_<sha256[:8]>.jpg) hard-linked
+    to the blob, so articles sharing a title prefix never overwrite each other.
+
+    The URL -> hash manifest lets repeated URLs (in the same run or later runs) skip the download
+    entirely; URLs seen for the first time are streamed and hashed, and dropped if the bytes are
+    already stored under another URL.
+    """
+
+    def __init__(self, root, downloader, alias_dir):
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        self.downloader = downloader
+        self.alias_dir = alias_dir
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self.manifest = None
+        self.revalidate = False
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.bytes_downloaded = 0
+        self.bytes_deduplicated = 0
+        self.downloads_skipped = 0
+        self.blobs_written = 0
+
+    def configure(self, revalidate=None):
+        """
+        :param revalidate: Re-check the stored images with a conditional request (the ETag and Last-Modified
+            kept in the manifest), so an image replaced behind a known URL is downloaded again. Off by default.
+        """
+        if revalidate is not None:
+            self.revalidate = bool(revalidate)
+
+    def load_manifest(self):
+        if self.manifest is None:
+            self.manifest = {}
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    self.manifest = json.load(f)
+        return self.manifest
+
+    def save_manifest(self):
+        if self.manifest is None:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.part"
+        with self.lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def blob_path(self, sha256):
+        return os.path.join(self.root, "blobs", sha256[:2], f"{sha256}.jpg")
+
+    def submit(self, url):
+        """
+        Queues url on the downloader pool. Concurrent requests for the same URL share one download.
+        :return: Future resolving to the manifest entry (sha256, size, etag, last_modified).
+        """
+        with self.lock:
+            future = self.in_flight.get(url)
+            if future is None:
+                future = self.in_flight[url] = self.downloader.start().submit(self.fetch, url)
+                return future
+            self.downloads_skipped += 1
+        # Outside the lock: the callback runs right away when the download has already finished
+        future.add_done_callback(self.count_shared_download)
+        return future
+
+    def count_shared_download(self, future):
+        if future.exception() is None:
+            with self.lock:
+                self.bytes_deduplicated += future.result()["size"]
+
+    def fetch(self, url):
+        """
+        Returns the manifest entry for url, downloading it only if it is unknown or its blob is missing.
+        With revalidate set, a known URL is re-checked with a conditional request instead.
+        """
+        with self.lock:
+            entry = self.load_manifest().get(url)
+        if entry and os.path.exists(self.blob_path(entry["sha256"])):
+            if not self.revalidate:
+                with self.lock:
+                    self.downloads_skipped += 1
+                    self.bytes_deduplicated += entry["size"]
+                return entry
+            etag, last_modified = entry.get("etag"), entry.get("last_modified")
+        else:
+            etag, last_modified = None, None
+
+        staging = os.path.join(self.root, "staging", uuid.uuid4().hex)
+        result = self.downloader.download(url, staging, etag, last_modified)
+        if result["not_modified"]:
+            with self.lock:
+                self.downloads_skipped += 1
+                self.bytes_deduplicated += entry["size"]
+            return entry
+
+        blob = self.blob_path(result["sha256"])
+        with self.lock:
+            self.bytes_downloaded += result["bytes"]
+            if os.path.exists(blob):
+                os.remove(staging)
+                self.bytes_deduplicated += result["bytes"]
+            else:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                os.replace(staging, blob)
+                self.blobs_written += 1
+            entry = {
+                "sha256": result["sha256"],
+                "size": result["bytes"],
+                "etag": result["etag"],
+                "last_modified": result["last_modified"],
+                "fetched_at": time.time(),
+            }
+            self.manifest[url] = entry
+        return entry
+
+    def alias(self, entry, base_name):
+        """
+        Links a readable <base_name>_<hash prefix>.jpg in alias_dir to the blob and returns its file name.
+        """
+        image_name = f"{base_name}_{entry['sha256'][:8]}.jpg"
+        alias_path = os.path.join(self.alias_dir, image_name)
+        if not os.path.exists(alias_path):
+            os.makedirs(self.alias_dir, exist_ok=True)
+            try:
+                os.link(self.blob_path(entry["sha256"]), alias_path)
+            except OSError:
+                # Hard links are not available on every filesystem
+                shutil.copyfile(self.blob_path(entry["sha256"]), alias_path)
+        return image_name
+
+    def finish(self):
+        """
+        Persists the manifest and forgets the in-flight downloads of the current batch.
+        """
+        with self.lock:
+            self.in_flight = {}
+        self.save_manifest()
+
+    def stats(self):
+        return {
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_saved_by_dedup": self.bytes_deduplicated,
+            "downloads_skipped": self.downloads_skipped,
+            "blobs_written": self.blobs_written,
+        }
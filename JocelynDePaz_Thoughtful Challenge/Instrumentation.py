@@ -0,0 +1,263 @@
+import cProfile
+import functools
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+
+def timed(name):
+    """
+    Method decorator that runs the method inside a span of the instance's instrumentation.
+    :param name: Span name used in the run report.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.span(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class Instrumentation:
+    """
+    Collects the timing of one run and writes it as a JSON run report.
+
+    Spans nest, and work items are the top-level spans. Each span records its wall time,
+    the part of it spent waiting on the page (WebDriverWait, 'Show more', sleeps), the time
+    spent inside WebDriver commands, the number of commands issued and the bytes downloaded
+    while it was open. Active time is wall time minus waiting.
+    """
+
+    def __init__(self, report_path):
+        self.logger = logging.getLogger(__name__)
+        self.report_path = report_path
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.items = []
+        self.spans = []
+        self.stack = []
+        self.commands = {}
+        self.command_count = 0
+        self.command_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.wait_depth = 0
+        self.byte_sources = {}
+
+    def attach_driver(self, driver):
+        """
+        Counts and times every WebDriver command the driver (and its elements) sends. Safe to call repeatedly.
+        """
+        if getattr(driver, "instrumented_by", None) is self:
+            return
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.count_command(driver_command, time.perf_counter() - started)
+
+        driver.execute = counted_execute
+        driver.instrumented_by = self
+
+    def count_command(self, name, seconds):
+        self.commands[name] = self.commands.get(name, 0) + 1
+        self.command_count += 1
+        self.command_seconds += seconds
+
+    def track_bytes(self, name, counter):
+        """
+        Registers a byte source reported per span.
+        :param name: Key in the report, e.g. "images".
+        :param counter: Callable returning the cumulative number of bytes downloaded so far.
+        """
+        self.byte_sources[name] = counter
+
+    def bytes_so_far(self):
+        return {name: counter() for name, counter in self.byte_sources.items()}
+
+    @contextmanager
+    def waiting(self):
+        """
+        Counts the enclosed block as time spent waiting on the page rather than working.
+        """
+        self.wait_depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.wait_depth -= 1
+            if self.wait_depth == 0:
+                self.wait_seconds += time.perf_counter() - started
+
+    def sleep(self, seconds):
+        with self.waiting():
+            time.sleep(seconds)
+
+    def snapshot(self):
+        return {
+            "time": time.perf_counter(),
+            "wait": self.wait_seconds,
+            "command_time": self.command_seconds,
+            "commands": self.command_count,
+            "bytes": self.bytes_so_far(),
+        }
+
+    @contextmanager
+    def span(self, name, **attrs):
+        start = self.snapshot()
+        span = {
+            "name": name,
+            "start_s": round(start["time"] - self.origin, 4),
+            "attrs": attrs,
+            "children": [],
+        }
+        (self.stack[-1]["children"] if self.stack else self.spans).append(span)
+        self.stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.stack.pop()
+            span.update(self.measure(start))
+
+    def measure(self, start):
+        end = self.snapshot()
+        duration = end["time"] - start["time"]
+        wait = end["wait"] - start["wait"]
+        return {
+            "duration_s": round(duration, 4),
+            "wait_s": round(wait, 4),
+            "active_s": round(duration - wait, 4),
+            "webdriver_s": round(end["command_time"] - start["command_time"], 4),
+            "webdriver_commands": end["commands"] - start["commands"],
+            "bytes": {name: value - start["bytes"].get(name, 0) for name, value in end["bytes"].items()},
+        }
+
+    @contextmanager
+    def item(self, name, profile=None, **attrs):
+        """
+        Top-level span for one work item, optionally profiled.
+        :param profile: None, "cprofile" or "pyinstrument"; the profile is saved under profiles/ next to the report.
+        """
+        commands_before = dict(self.commands)
+        self.stack, outer_stack = [], self.stack
+        with self.profile(profile, name) as profile_path:
+            try:
+                with self.span(name, **attrs) as span:
+                    yield span
+                span["status"] = "done"
+            except BaseException:
+                span["status"] = "failed"
+                raise
+            finally:
+                self.stack = outer_stack
+                span["commands_by_name"] = {
+                    command: count - commands_before.get(command, 0)
+                    for command, count in self.commands.items() if count != commands_before.get(command, 0)
+                }
+                if profile_path:
+                    span["profile"] = profile_path
+                self.items.append(self.spans.pop())
+                self.logger.info(
+                    f"{name}: {span['duration_s']:.2f}s ({span['wait_s']:.2f}s waiting), "
+                    f"{span['webdriver_commands']} WebDriver commands, bytes {span['bytes']}"
+                )
+
+    @contextmanager
+    def profile(self, kind, name):
+        """
+        Profiles the enclosed block with cProfile or pyinstrument and yields the output path (None when off).
+        """
+        if not kind:
+            yield None
+            return
+        directory = os.path.join(os.path.dirname(self.report_path) or ".", "profiles")
+        os.makedirs(directory, exist_ok=True)
+        if kind == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                self.logger.warning("pyinstrument is not installed, profiling with cProfile instead")
+                kind = "cprofile"
+        if kind == "pyinstrument":
+            path = os.path.join(directory, f"{name}.html")
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield path
+            finally:
+                profiler.stop()
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+        elif kind == "cprofile":
+            path = os.path.join(directory, f"{name}.prof")
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield path
+            finally:
+                profiler.disable()
+                profiler.dump_stats(path)
+        else:
+            raise ValueError(f"Unknown profiler: {kind}")
+        self.logger.info(f"Saved {kind} profile to {path}")
+
+    def stages(self):
+        """
+        Totals per span name over the whole run.
+        """
+        totals = {}
+
+        def walk(spans):
+            for span in spans:
+                stage = totals.setdefault(span["name"], {
+                    "count": 0, "duration_s": 0.0, "wait_s": 0.0, "active_s": 0.0, "webdriver_commands": 0,
+                })
+                stage["count"] += 1
+                for key in ("duration_s", "wait_s", "active_s"):
+                    stage[key] = round(stage[key] + span.get(key, 0.0), 4)
+                stage["webdriver_commands"] += span.get("webdriver_commands", 0)
+                walk(span["children"])
+
+        # The item spans themselves are reported under items
+        for item in self.items:
+            walk(item["children"])
+        walk(self.spans)
+        return totals
+
+    def report(self, **extra):
+        duration = time.perf_counter() - self.origin
+        return {
+            "started_at": self.started_at,
+            "duration_s": round(duration, 4),
+            "wait_s": round(self.wait_seconds, 4),
+            "active_s": round(duration - self.wait_seconds, 4),
+            "webdriver_s": round(self.command_seconds, 4),
+            "webdriver_commands": self.command_count,
+            "commands_by_name": dict(self.commands),
+            "bytes": self.bytes_so_far(),
+            "stages": self.stages(),
+            "items": self.items,
+            "spans": self.spans,
+            **extra,
+        }
+
+    def write_report(self, **extra):
+        """
+        Writes the run report as JSON to report_path.
+        :param extra: Additional top-level sections (session metrics, store stats, ...).
+        """
+        os.makedirs(os.path.dirname(self.report_path) or ".", exist_ok=True)
+        tmp_path = f"{self.report_path}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(**extra), f, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.report_path)
+        self.logger.info(f"Saved run report to {self.report_path}")
+        return self.report_path
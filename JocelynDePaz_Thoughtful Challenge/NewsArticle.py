@@ -0,0 +1,217 @@
+import json
+from array import array
+
+# Every field a news record can have, in output order. The first eight are set on every record;
+# money_mentions is added by TextAnalytics and the body_* fields by deep mode (ArticleReader).
+FIELDS = (
+    "title",
+    "date",
+    "published_at",
+    "description",
+    "image_name",
+    "search_phrase_count",
+    "contains_money",
+    "news_url",
+    "money_mentions",
+    "body_word_count",
+    "body_phrase_count",
+    "body_contains_money",
+    "body_money_mentions",
+)
+
+# Fields NewsBatch keeps in typed arrays (one machine word or byte per record) instead of lists.
+TYPED_COLUMNS = {"search_phrase_count": "q", "contains_money": "b"}
+
+encode = json.JSONEncoder(ensure_ascii=False).encode
+ENCODED_KEYS = {field: encode(field) + ": " for field in FIELDS}
+# Values encoded without going through the encoder; everything else (lists of money mentions) does.
+ENCODE_SCALAR = {
+    str: json.encoder.encode_basestring,
+    int: int.__repr__,
+    bool: lambda value: "true" if value else "false",
+    type(None): lambda value: "null",
+}
+
+
+class Missing:
+    """
+    Marks a field a NewsBatch record does not have. Unpickles as the same MISSING object, so a batch
+    can be handed between processes.
+    """
+
+    def __reduce__(self):
+        return "MISSING"
+
+    def __repr__(self):
+        return "MISSING"
+
+
+MISSING = Missing()
+
+
+class NewsArticle:
+    """
+    One news record. Slotted, so a record costs a fixed block of pointers instead of a dict.
+
+    Behaves like the dict records it replaces where the rest of the robot touches them: record["title"],
+    record.get("body_word_count"), record.update(...). A field that was never set (money_mentions before the
+    analysis, the body_* fields outside deep mode) is absent, as a missing key was, and left out of to_dict and
+    to_json. Only the FIELDS can be set.
+    """
+    __slots__ = FIELDS
+
+    def __init__(self, title, date="N/A", published_at=None, description="N/A", image_name="N/A",
+                 search_phrase_count=0, contains_money=False, news_url=None, **optional):
+        self.title = title
+        self.date = date
+        self.published_at = published_at
+        self.description = description
+        self.image_name = image_name
+        self.search_phrase_count = search_phrase_count
+        self.contains_money = contains_money
+        self.news_url = news_url
+        for field, value in optional.items():
+            setattr(self, field, value)
+
+    @classmethod
+    def from_card(cls, card, published=None):
+        """
+        Builds the record of a search result card (see SearchBackend.fetch_cards); missing texts become 'N/A'.
+        search_phrase_count, contains_money and money_mentions are filled in by TextAnalytics.analyse_batch.
+        :param published: Publication datetime parsed from the card's date, if any.
+        """
+        return cls(
+            card["title"],
+            date=card["date"] if card["date"] is not None else "N/A",
+            published_at=published.isoformat() if published else None,
+            description=card["description"] if card["description"] is not None else "N/A",
+            news_url=card["news_url"]
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a record from a dict record (checkpoint, crawl index, work-item payload). Unknown keys are ignored.
+        """
+        record = cls.__new__(cls)
+        for field in FIELDS:
+            value = data.get(field, MISSING)
+            if value is not MISSING:
+                setattr(record, field, value)
+        return record
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __setitem__(self, field, value):
+        try:
+            setattr(self, field, value)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __contains__(self, field):
+        return field in ENCODED_KEYS and hasattr(self, field)
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def update(self, values):
+        for field, value in values.items():
+            self[field] = value
+
+    def keys(self):
+        return [field for field in FIELDS if hasattr(self, field)]
+
+    def to_dict(self):
+        """
+        Plain dict of the set fields, for APIs that need one (work-item payloads).
+        """
+        return {field: getattr(self, field) for field in self.keys()}
+
+    def to_json(self, fields=None):
+        """
+        JSON object of the record, encoded field by field without building a dict first.
+        :param fields: Fields to write, in order, missing ones as null. Defaults to the set fields.
+        """
+        if fields is None:
+            fields = self.keys()
+        parts = []
+        for field in fields:
+            value = getattr(self, field, None)
+            parts.append(ENCODED_KEYS[field] + ENCODE_SCALAR.get(type(value), encode)(value))
+        return "{" + ", ".join(parts) + "}"
+
+    def __eq__(self, other):
+        if isinstance(other, NewsArticle):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"NewsArticle({self.to_dict()!r})"
+
+
+def json_default(value):
+    """
+    default= hook for json.dump(s), so structures holding records (checkpoint entries) serialise directly.
+    """
+    if isinstance(value, NewsArticle):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class NewsBatch:
+    """
+    Many records stored column by column: one list per field, and typed arrays for the counts and flags,
+    instead of one object per record. Used where whole runs of records are held at once (e.g. the outputs
+    merged from the worker pool). Optional fields only get a column once a record has them.
+
+    Iterating yields a NewsArticle per row, built on the fly.
+    """
+
+    def __init__(self, records=()):
+        self.columns = {field: array(TYPED_COLUMNS[field]) if field in TYPED_COLUMNS else [] for field in FIELDS[:8]}
+        self.size = 0
+        self.extend(records)
+
+    def append(self, record):
+        """
+        :param record: NewsArticle or dict record.
+        """
+        get = record.get
+        for field in FIELDS:
+            value = get(field, MISSING)
+            column = self.columns.get(field)
+            if column is None:
+                if value is MISSING:
+                    continue
+                column = self.columns[field] = [MISSING] * self.size
+            if field in TYPED_COLUMNS:
+                value = int(value) if value is not MISSING and value is not None else 0
+            column.append(value)
+        self.size += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("NewsBatch index out of range")
+        record = NewsArticle.__new__(NewsArticle)
+        for field, column in self.columns.items():
+            value = column[index]
+            if value is not MISSING:
+                setattr(record, field, bool(value) if field == "contains_money" else value)
+        return record
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self[index]
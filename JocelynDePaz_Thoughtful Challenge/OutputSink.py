@@ -0,0 +1,218 @@
+import csv
+import logging
+import os
+import uuid
+
+# Columns written to the tabular outputs, in order.
+NEWS_COLUMNS = [
+    "title",
+    "date",
+    "published_at",
+    "description",
+    "image_name",
+    "search_phrase_count",
+    "contains_money",
+    "news_url",
+    # Deep mode only (empty otherwise)
+    "body_word_count",
+    "body_phrase_count",
+    "body_contains_money",
+]
+
+# Parquet column types other than string. Fixed up front, since a column can be empty in the first
+# row group (e.g. deep mode fields) and filled in later ones.
+PARQUET_TYPES = {
+    "search_phrase_count": "int64",
+    "contains_money": "bool",
+    "body_word_count": "int64",
+    "body_phrase_count": "int64",
+    "body_contains_money": "bool",
+}
+
+
+class OutputSink:
+    """
+    Appends news records (NewsArticle) to an output file as they are produced, without keeping them in memory.
+    Files are written under a temporary name and moved into place on close, so a reader never
+    sees a half-written file.
+    """
+    extension = None
+
+    def __init__(self, path, columns=None):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.tmp_path = f"{path}.part"
+        self.columns = columns or NEWS_COLUMNS
+        # Identifies this file in the checkpoint: a later run writes the same path from scratch
+        self.key = f"{path}#{uuid.uuid4().hex[:8]}"
+        self.rows = 0
+        self.is_open = False
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.is_open = True
+        return self
+
+    def write(self, record):
+        raise NotImplementedError
+
+    def write_many(self, records):
+        if not self.is_open:
+            self.open()
+        for record in records:
+            self.write(record)
+            self.rows += 1
+
+    def finish(self):
+        raise NotImplementedError
+
+    def close(self):
+        if not self.is_open:
+            return
+        self.finish()
+        os.replace(self.tmp_path, self.path)
+        self.is_open = False
+        self.logger.info(f"Saved {self.rows} rows to {self.path}")
+
+    def row(self, record):
+        return [getattr(record, column, None) for column in self.columns]
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ExcelSink(OutputSink):
+    """
+    Write-only (constant memory) openpyxl workbook with a single 'News' sheet.
+    """
+    extension = "xlsx"
+
+    def __init__(self, path, columns=None, sheet_name="News"):
+        super().__init__(path, columns)
+        self.sheet_name = sheet_name
+        self.workbook = None
+        self.sheet = None
+
+    def open(self):
+        from openpyxl import Workbook
+
+        super().open()
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(self.sheet_name)
+        self.sheet.append(self.columns)
+        return self
+
+    def write(self, record):
+        self.sheet.append(self.row(record))
+
+    def finish(self):
+        self.workbook.save(self.tmp_path)
+        self.workbook = None
+        self.sheet = None
+
+
+class JsonlSink(OutputSink):
+    """
+    One JSON object per line. Lines are flushed as written, so the data survives a crash.
+    """
+    extension = "jsonl"
+
+    def open(self):
+        super().open()
+        self.file = open(self.tmp_path, "w", encoding="utf-8")
+        return self
+
+    def write(self, record):
+        self.file.write(record.to_json(self.columns))
+        self.file.write("\n")
+        self.file.flush()
+
+    def finish(self):
+        self.file.close()
+
+
+class CsvSink(OutputSink):
+    extension = "csv"
+
+    def open(self):
+        super().open()
+        self.file = open(self.tmp_path, "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+        return self
+
+    def write(self, record):
+        self.writer.writerow(self.row(record))
+
+    def finish(self):
+        self.file.close()
+
+
+class ParquetSink(OutputSink):
+    """
+    Columnar output. Rows are buffered in batches of batch_size and written as row groups.
+    Requires pyarrow.
+    """
+    extension = "parquet"
+
+    def __init__(self, path, columns=None, batch_size=5000):
+        super().__init__(path, columns)
+        self.batch_size = batch_size
+        self.batch = []
+        self.writer = None
+
+    def open(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Parquet output requires the pyarrow package")
+        super().open()
+        return self
+
+    def write(self, record):
+        self.batch.append(record)
+        if len(self.batch) >= self.batch_size:
+            self.flush_batch()
+
+    def schema(self):
+        import pyarrow as pa
+
+        return pa.schema([(column, pa.type_for_alias(PARQUET_TYPES.get(column, "string"))) for column in self.columns])
+
+    def flush_batch(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self.batch:
+            return
+        table = pa.table({column: [getattr(record, column, None) for record in self.batch] for column in self.columns}, schema=self.schema())
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.tmp_path, table.schema)
+        self.writer.write_table(table)
+        self.batch = []
+
+    def finish(self):
+        self.flush_batch()
+        if self.writer is None:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            pq.write_table(pa.table({column: [] for column in self.columns}, schema=self.schema()), self.tmp_path)
+        else:
+            self.writer.close()
+            self.writer = None
+
+
+SINKS = {sink.extension: sink for sink in (ExcelSink, JsonlSink, CsvSink, ParquetSink)}
+
+
+def create_sink(output_format, directory, name="task_extracted", columns=None):
+    """
+    Creates the sink for an output format ('xlsx', 'jsonl', 'csv' or 'parquet') writing <directory>/<name>.<format>.
+    """
+    if output_format not in SINKS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return SINKS[output_format](os.path.join(directory, f"{name}.{output_format}"), columns=columns)
@@ -0,0 +1,204 @@
+import logging
+import queue
+import threading
+import time
+from robocorp import workitems
+
+# Marks the end of the stream on a stage queue.
+END = object()
+
+
+class WorkItemSink:
+    """
+    Creates one output work item per record. Used as a pipeline sink, so the items are created
+    in flushes while the browser is still loading results.
+    """
+    # Output work items outlive the attempt that created them, so every attempt shares the key
+    key = "workitems"
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.rows = 0
+
+    def write_many(self, records):
+        for record in records:
+            workitems.outputs.create(payload=record.to_dict())
+            self.rows += 1
+            self.logger.info(f"Work item created for news: {record['title']}")
+
+
+class CheckpointedSink:
+    """
+    Wraps a sink so a resumed work item does not write a record twice: records the checkpoint lists as
+    written to the sink (by the failed attempt) are skipped, and the ones written now are added to it.
+    """
+
+    def __init__(self, sink, checkpoint):
+        self.sink = sink
+        self.checkpoint = checkpoint
+
+    def write_many(self, records):
+        # A record without a URL cannot be told apart from the others, so it is always written
+        records = [record for record in records
+                   if not record["news_url"] or not self.checkpoint.is_written(self.sink.key, record["news_url"])]
+        if records:
+            self.sink.write_many(records)
+            self.checkpoint.mark_written(self.sink.key, [record["news_url"] for record in records if record["news_url"]])
+
+
+class NewsPipeline:
+    """
+    Streams news records from the producer to the output sinks in three stages:
+
+        producer (calling thread) -> enricher thread -> writer thread -> sinks
+
+    The stages are connected by bounded queues, so a slow stage blocks the one before it instead of
+    letting records pile up: when image downloads or the sinks fall behind, the producer (the browser)
+    waits. The writer buffers records and flushes them to every sink together, once flush_size records
+    are waiting or the oldest one has waited flush_interval seconds.
+
+    The producer keeps running in the calling thread, so the WebDriver is only used from one thread.
+    """
+
+    def __init__(self, enrich, sinks, queue_size=50, flush_size=25, flush_interval=2.0):
+        """
+        :param enrich: Called with each record before it is written (e.g. waits for its image); returns nothing.
+        :param sinks: Objects with write_many(records), e.g. WorkItemSink and the OutputSink files.
+        :param queue_size: Records each stage queue holds before the stage before it blocks.
+        :param flush_size: Records written to the sinks per flush.
+        :param flush_interval: Seconds a record waits at most before its flush.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.enrich = enrich
+        self.sinks = sinks
+        self.flush_size = max(1, int(flush_size))
+        self.flush_interval = flush_interval
+        self.enrich_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.failed = threading.Event()
+        self.error = None
+        self.produced = 0
+        self.written = 0
+        self.flushes = 0
+        self.producer_blocked_s = 0.0
+        self.first_output_s = None
+        self.started = None
+
+    def run(self, records):
+        """
+        Pushes the records through the stages and waits until the last one is written.
+        When the producer fails, the records it produced before are still written and its error is raised
+        afterwards. When a stage fails, nothing more is written, the producer (a generator) is closed and
+        the stage's error is raised.
+        :return: Number of records written.
+        """
+        self.started = time.perf_counter()
+        threads = [
+            threading.Thread(target=self.stage, args=(self.enrich_worker,), name="pipeline-enrich", daemon=True),
+            threading.Thread(target=self.stage, args=(self.write_worker,), name="pipeline-write", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        records = iter(records)
+        try:
+            for record in records:
+                blocked = time.perf_counter()
+                if self.failed.is_set() or not self.put(self.enrich_queue, record):
+                    break
+                self.producer_blocked_s += time.perf_counter() - blocked
+                self.produced += 1
+        finally:
+            # A producer left behind by a failed stage runs its own cleanup (e.g. closes the backends) now
+            if hasattr(records, "close"):
+                records.close()
+            self.put(self.enrich_queue, END)
+            for thread in threads:
+                thread.join()
+        if self.error is not None:
+            raise self.error
+        self.logger.info(f"Pipeline wrote {self.written} records in {self.flushes} flushes, "
+                         f"first output after {self.first_output_s or 0:.1f} s, producer blocked {self.producer_blocked_s:.1f} s")
+        return self.written
+
+    def stats(self):
+        return {
+            "produced": self.produced,
+            "written": self.written,
+            "flushes": self.flushes,
+            "first_output_s": round(self.first_output_s, 3) if self.first_output_s is not None else None,
+            "producer_blocked_s": round(self.producer_blocked_s, 3),
+        }
+
+    def put(self, target, item):
+        """
+        Blocks while target is full. Gives up (returns False) once another stage has failed,
+        except for END, which always gets through so the next stage can finish.
+        """
+        while True:
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if self.failed.is_set():
+                    if item is not END:
+                        return False
+                    # Make room; the records behind a failure are not written anyway
+                    try:
+                        target.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def stage(self, worker):
+        try:
+            worker()
+        except Exception as e:
+            self.logger.error(f"Pipeline stage failed: {str(e)}")
+            if self.error is None:
+                self.error = e
+            self.failed.set()
+            # Drain the input so the stage before this one is not left blocked
+            source = self.enrich_queue if worker == self.enrich_worker else self.write_queue
+            while source.get() is not END:
+                pass
+            if worker == self.enrich_worker:
+                self.put(self.write_queue, END)
+
+    def enrich_worker(self):
+        while True:
+            record = self.enrich_queue.get()
+            if record is END:
+                self.put(self.write_queue, END)
+                return
+            self.enrich(record)
+            self.put(self.write_queue, record)
+
+    def write_worker(self):
+        buffer = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                record = self.write_queue.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+            if record is END:
+                self.flush(buffer)
+                return
+            if record is not None:
+                if not buffer:
+                    deadline = time.monotonic() + self.flush_interval
+                buffer.append(record)
+            if buffer and (len(buffer) >= self.flush_size or time.monotonic() >= deadline):
+                self.flush(buffer)
+                buffer = []
+                deadline = None
+
+    def flush(self, records):
+        if not records or self.failed.is_set():
+            return
+        for sink in self.sinks:
+            sink.write_many(records)
+        self.written += len(records)
+        self.flushes += 1
+        if self.first_output_s is None:
+            self.first_output_s = time.perf_counter() - self.started
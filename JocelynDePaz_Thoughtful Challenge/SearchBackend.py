@@ -0,0 +1,46 @@
+class SearchBackend:
+    """
+    Source of raw search result cards for Aljazeera.
+    fetch_cards returns dicts with title, news_url, date, description and image_url
+    (None when a field is missing), which Aljazeera.build_news_records turns into news records.
+    """
+    name = None
+
+    def fetch_cards(self, search_url, max_results, stop_at=None):
+        """
+        :param stop_at: Optional callable; once it returns True for a card, no further pages are needed.
+        """
+        raise NotImplementedError
+
+    def fetch_card_batches(self, search_url, max_results, stop_at=None, start=0):
+        """
+        Yields the cards in batches as they become available. Backends that can stream override this.
+        :param start: Number of result cards already read (e.g. before a browser restart); they are skipped.
+        """
+        yield self.fetch_cards(search_url, max_results, stop_at)[start:]
+
+    def close(self):
+        pass
+
+
+class SeleniumBackend(SearchBackend):
+    """
+    Drives the headless browser through the scraper's own search, load-more and batched extraction steps.
+    """
+    name = "selenium"
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    def fetch_cards(self, search_url, max_results, stop_at=None):
+        # load_more_results applies the scraper's own stop_at while loading
+        self.scraper.open_search()
+        self.scraper.load_more_results()
+        return self.scraper.read_loaded_cards()
+
+    def fetch_card_batches(self, search_url, max_results, stop_at=None, start=0):
+        if self.scraper.extraction_mode != "windowed":
+            yield self.fetch_cards(search_url, max_results, stop_at)[start:]
+            return
+        self.scraper.open_search()
+        yield from self.scraper.read_card_windows(start)
@@ -0,0 +1,318 @@
+import argparse
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+SEARCH_FILE = "search.json"
+PAGES_FILE = "pages.jsonl"
+
+# Image stores opened by the re-extraction processes, keyed by (root, alias_dir).
+image_stores = {}
+
+
+class SnapshotArchive:
+    """
+    Compressed copies of the search results pages loaded while scraping, so the card parsing and the text
+    analytics can be re-run over them later without the site (see reextract).
+
+    Each search gets a directory <root>/<search_id>/ with:
+
+        search.json         phrase, sort order, result limit, date cutoff, backend and start time
+        page-<n>.html.gz    every results page, in the order it was loaded
+        pages.jsonl         URL, capture time and sizes of each page
+
+    Pages are compressed and written on a background thread, so the browser does not wait for gzip.
+    A snapshot that cannot be written is logged and skipped; it never fails the work item.
+    """
+
+    def __init__(self, root, compresslevel=6):
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        self.compresslevel = compresslevel
+        self.executor = None
+        self.pending = []
+        self.lock = threading.Lock()
+        self.search_dir = None
+        self.page_index = 0
+        self.searches = 0
+        self.pages = 0
+        self.failed = 0
+        self.bytes_raw = 0
+        self.bytes_stored = 0
+
+    def begin_search(self, **metadata):
+        """
+        Starts the directory of a new search; the pages saved from now on belong to it.
+        :param metadata: Search settings (search_phrase, sort_by, max_results, cutoff, backend, ...).
+        :return: The search id (its directory name).
+        """
+        started = time.time()
+        settings = json.dumps(metadata, sort_keys=True, default=str)
+        key = hashlib.sha1(f"{settings}:{started}:{os.getpid()}".encode("utf-8")).hexdigest()[:8]
+        # Sorts by start time, then by order within the process
+        search_id = f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime(started))}-{self.searches:05d}-{key}"
+        self.search_dir = os.path.join(self.root, search_id)
+        self.page_index = 0
+        self.searches += 1
+        self.submit(self.write_search, self.search_dir, dict(metadata, search_id=search_id, started_at=started))
+        return search_id
+
+    def save(self, page, url):
+        """
+        Queues a results page of the current search.
+        :param page: HTML text or bytes.
+        :param url: URL the page was served from (relative links are resolved against it on re-extraction).
+        """
+        if self.search_dir is None:
+            return
+        self.submit(self.write_page, self.search_dir, self.page_index, page, url, time.time())
+        self.page_index += 1
+
+    def submit(self, function, *args):
+        if self.executor is None:
+            # One thread: the pages of a search are written in order, after its search.json
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot")
+        self.pending.append(self.executor.submit(function, *args))
+
+    def write_search(self, directory, metadata):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, SEARCH_FILE)
+        with open(f"{path}.part", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(f"{path}.part", path)
+
+    def write_page(self, directory, index, page, url, captured_at):
+        data = page.encode("utf-8") if isinstance(page, str) else page
+        name = f"page-{index:04d}.html.gz"
+        path = os.path.join(directory, name)
+        compressed = gzip.compress(data, compresslevel=self.compresslevel, mtime=0)
+        with open(f"{path}.part", "wb") as f:
+            f.write(compressed)
+        os.replace(f"{path}.part", path)
+        with open(os.path.join(directory, PAGES_FILE), "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "index": index,
+                "file": name,
+                "url": url,
+                "captured_at": captured_at,
+                "bytes": len(data),
+                "stored_bytes": len(compressed),
+            }) + "\n")
+        with self.lock:
+            self.pages += 1
+            self.bytes_raw += len(data)
+            self.bytes_stored += len(compressed)
+
+    def finish(self):
+        """
+        Waits until the queued pages are written.
+        """
+        pending, self.pending = self.pending, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                self.failed += 1
+                self.logger.error(f"Failed to write page snapshot: {str(e)}")
+
+    def stats(self):
+        return {
+            "searches": self.searches,
+            "pages": self.pages,
+            "failed": self.failed,
+            "bytes": self.bytes_raw,
+            "stored_bytes": self.bytes_stored,
+        }
+
+    def close(self):
+        self.finish()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+
+def find_searches(root):
+    """
+    Directories under root holding an archived search, oldest first (e.g. output/ with its worker-<id>/ folders).
+    """
+    directories = []
+    for directory, _, files in os.walk(root):
+        if SEARCH_FILE in files:
+            directories.append(directory)
+    return sorted(directories, key=os.path.basename)
+
+
+def load_search(directory):
+    """
+    :return: (search metadata, page entries in load order). A page line cut off by a crash is ignored.
+    """
+    with open(os.path.join(directory, SEARCH_FILE), encoding="utf-8") as f:
+        search = json.load(f)
+    pages = []
+    pages_path = os.path.join(directory, PAGES_FILE)
+    if os.path.exists(pages_path):
+        with open(pages_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    pages.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    return search, sorted(pages, key=lambda page: page["index"])
+
+
+def image_store(images_root, alias_dir):
+    from ImageStore import ImageStore
+
+    if images_root is None or not os.path.exists(os.path.join(images_root, "manifest.json")):
+        return None
+    key = (images_root, alias_dir)
+    if key not in image_stores:
+        image_stores[key] = ImageStore(images_root, None, alias_dir=alias_dir)
+    return image_stores[key]
+
+
+def archived_image_name(store, url, title):
+    """
+    Alias of the image the live run downloaded for url, linked into the output directory, or 'N/A'.
+    """
+    from ImageStore import image_base_name
+
+    entry = store.load_manifest().get(url) if store is not None and url else None
+    if entry is None or not os.path.exists(store.blob_path(entry["sha256"])):
+        return 'N/A'
+    return store.alias(entry, image_base_name(title))
+
+
+def reextract_search(directory, images_root=None, alias_dir=None):
+    """
+    Runs in the re-extraction processes: parses the cards of every archived page of a search and builds
+    the records the way the live run does (duplicates across pages, the result limit and the date cutoff
+    included), then analyses them with the current TextAnalytics. Relative card dates ("3 hours ago")
+    are read as of the page's capture time.
+    :return: (search metadata, NewsBatch of the records, number of pages read).
+    """
+    from DateParser import DateParser
+    from HttpBackend import parse_cards
+    from NewsArticle import NewsArticle, NewsBatch
+    from TextAnalytics import TextAnalytics
+
+    search, pages = load_search(directory)
+    max_results = search.get("max_results")
+    cutoff = datetime.fromisoformat(search["cutoff"]) if search.get("cutoff") else None
+    store = image_store(images_root, alias_dir)
+    records = []
+    seen = set()
+    for page in pages:
+        with gzip.open(os.path.join(directory, page["file"])) as f:
+            cards = parse_cards(f.read(), page["url"])
+        dates = DateParser(now=datetime.fromtimestamp(page["captured_at"], timezone.utc))
+        done = False
+        for card in cards:
+            if card["title"] is None or card["news_url"] in seen:
+                continue
+            seen.add(card["news_url"])
+            published = dates.parse(card["date"])
+            if cutoff is not None and published is not None and published < cutoff:
+                # Sorted newest first, nothing after the first expired card is kept
+                done = search.get("sort_by") == "Date"
+                if done:
+                    break
+                continue
+            record = NewsArticle.from_card(card, published)
+            record.image_name = archived_image_name(store, card["image_url"], record.title)
+            records.append(record)
+            if max_results is not None and len(records) >= max_results:
+                done = True
+                break
+        if done:
+            break
+    TextAnalytics(search.get("search_phrase")).analyse_batch(records)
+    return search, NewsBatch(records), len(pages)
+
+
+def reextract(root, output_dir, output_formats=("xlsx",), workers=None, images_root=None):
+    """
+    Re-runs the card parsing and text analytics over every search archived under root in a process pool,
+    and writes the standard outputs (task_extracted.<format>) to output_dir. No browser is launched.
+    Searches are written in archive order; a search that cannot be read is logged and skipped.
+    :param images_root: Image store of the live runs; images it holds are linked into output_dir as image_name.
+    :return: Summary of the run, also saved as reextract_report.json in output_dir.
+    """
+    from OutputSink import create_sink
+
+    logger = logging.getLogger(__name__)
+    started = time.perf_counter()
+    directories = find_searches(root)
+    sinks = [create_sink(output_format, output_dir) for output_format in output_formats]
+    summary = {"searches": 0, "failed": 0, "pages": 0, "records": 0}
+    max_workers = workers or os.cpu_count() or 1
+    try:
+        for sink in sinks:
+            sink.open()
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            # At most two searches per process are in flight, so finished batches waiting for their turn
+            # (archive order) do not pile up in memory on a large archive
+            pending = iter(directories)
+            futures = deque()
+            for directory in itertools.islice(pending, max_workers * 2):
+                futures.append((directory, pool.submit(reextract_search, directory, images_root, output_dir)))
+            while futures:
+                directory, future = futures.popleft()
+                queued = next(pending, None)
+                if queued is not None:
+                    futures.append((queued, pool.submit(reextract_search, queued, images_root, output_dir)))
+                try:
+                    search, records, pages = future.result()
+                except Exception as e:
+                    summary["failed"] += 1
+                    logger.error(f"Failed to re-extract {directory}: {str(e)}")
+                    continue
+                for sink in sinks:
+                    sink.write_many(records)
+                summary["searches"] += 1
+                summary["pages"] += pages
+                summary["records"] += len(records)
+                logger.info(f"Re-extracted {len(records)} records from {pages} pages: "
+                            f"'{search.get('search_phrase')}' sorted by {search.get('sort_by')} ({search.get('search_id')})")
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    summary["workers"] = max_workers
+    with open(os.path.join(output_dir, "reextract_report.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    logger.info(f"Re-extracted {summary['searches']} searches ({summary['pages']} pages, {summary['records']} records) "
+                f"in {summary['seconds']:.2f} s, {summary['failed']} failed")
+    return summary
+
+
+# Command line entry point, run from the robot root:
+#     python -m SnapshotArchive output/snapshots --output output/reextracted --workers 8
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-runs the card parsing and text analytics over archived search results pages.")
+    parser.add_argument("archive", nargs="?", default=os.environ.get("SNAPSHOT_PATH", os.path.join("output", "snapshots")),
+                        help="Snapshot directory, searched recursively (default: output/snapshots or SNAPSHOT_PATH)")
+    parser.add_argument("--output", default=os.path.join("output", "reextracted"), help="Directory for the outputs")
+    parser.add_argument("--formats", default=os.environ.get("OUTPUT_FORMATS", "xlsx"),
+                        help="Comma-separated list of xlsx, jsonl, csv and parquet")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--images", default=os.path.join("output", "images"),
+                        help="Image store of the live runs, used for image_name (default: output/images)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    os.makedirs(args.output, exist_ok=True)
+    reextract(args.archive, args.output, args.formats.split(","), args.workers, args.images)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import logging
+import re
+from bisect import bisect_right
+
+# \d and \s are the Unicode classes the per-article patterns used: amounts in other scripts' digits
+# and separated by a no-break space ("5\xa0dollars") count as money.
+AMOUNT = r"\d+(?:,\d{3})*(?:\.\d{1,2})?"
+
+# Every format the separate check_for_money patterns accepted, in one alternation:
+# $12, £1,200.50, €3 (symbol first) and 12 dollars, 12 USD, 3 pounds, 3 euros (currency word after).
+# An optional scale word ("$2 million", "$3bn", "5 billion dollars") is captured for the normalised value.
+MONEY_PATTERN = re.compile(
+    rf"(?P<symbol>[$£€])(?P<symbol_amount>{AMOUNT})(?:\s?(?P<symbol_scale>thousand|million|billion|trillion|bn|m|k)\b)?"
+    rf"|(?P<amount>{AMOUNT})(?:\s+(?P<scale>thousand|million|billion|trillion))?\s+(?P<word>dollars?|usd|pounds?|euros?)",
+    re.IGNORECASE,
+)
+
+# A money mention can only start at one of these characters, or at a digit of another script.
+DIGITS = "0123456789"
+MONEY_START_CHARACTERS = "$£€" + DIGITS
+ASCII_BYTES = bytes(range(128))
+
+# Joins the texts of a batch; it is neither a digit, a word character nor whitespace, so no match can span two texts.
+SEPARATOR = "\x00"
+
+CURRENCIES = {
+    "$": "USD", "dollar": "USD", "dollars": "USD", "usd": "USD",
+    "£": "GBP", "pound": "GBP", "pounds": "GBP",
+    "€": "EUR", "euro": "EUR", "euros": "EUR",
+}
+
+SCALES = {
+    None: 1, "k": 1e3, "thousand": 1e3, "m": 1e6, "million": 1e6,
+    "bn": 1e9, "billion": 1e9, "trillion": 1e12,
+}
+
+
+def money_matches(text):
+    """
+    Yields the MONEY_PATTERN matches in text, the same ones finditer would, but only tries the regex
+    where a mention can start. Finding those positions with str.find is far cheaper than letting the
+    regex engine step through every character. Texts with digits outside 0-9 (rare) are scanned with finditer.
+    """
+    if has_other_digits(text):
+        yield from MONEY_PATTERN.finditer(text)
+        return
+    candidates = []
+    for character in MONEY_START_CHARACTERS:
+        position = text.find(character)
+        while position != -1:
+            candidates.append(position)
+            position = text.find(character, position + 1)
+    candidates.sort()
+
+    end = 0
+    for position in candidates:
+        # A match starting inside a run of digits is covered by the one starting at its first digit
+        if position < end or (position and text[position] in DIGITS and text[position - 1] in DIGITS):
+            continue
+        match = MONEY_PATTERN.match(text, position)
+        if match:
+            end = match.end()
+            yield match
+
+
+def has_other_digits(text):
+    """
+    True when text has a digit outside 0-9 (\\d also matches those: the other str.isdecimal characters).
+    Dropping the ASCII bytes of the UTF-8 text leaves only the few other characters to look at.
+    """
+    if text.isascii():
+        return False
+    others = text.encode("utf-8").translate(None, ASCII_BYTES).decode("utf-8")
+    return any(character.isdecimal() for character in others)
+
+
+def money_mention(match):
+    if match.group("symbol"):
+        amount, scale, currency = match.group("symbol_amount"), match.group("symbol_scale"), match.group("symbol")
+    else:
+        amount, scale, currency = match.group("amount"), match.group("scale"), match.group("word")
+    return {
+        "text": match.group(0),
+        "amount": amount,
+        "currency": CURRENCIES[currency.lower()],
+        "value": float(amount.replace(",", "")) * SCALES[scale.lower() if scale else None],
+    }
+
+
+def is_word_character(character):
+    return character.isalnum() or character == "_"
+
+
+class TextAnalytics:
+    """
+    Text checks run on every article: search phrase counts and money mentions.
+    Create one per search phrase and hand it whole batches of records through analyse_batch.
+    """
+
+    def __init__(self, search_phrase):
+        self.logger = logging.getLogger(__name__)
+        self.search_phrase = search_phrase or ""
+        self.phrase = self.search_phrase.lower()
+
+    def count_phrase(self, text):
+        """
+        Counts the case-insensitive occurrences of the search phrase that are whole words
+        ("Gaza" is not counted inside "Gazans").
+        """
+        text = text.lower()
+        if not self.phrase or self.phrase not in text:
+            return 0
+        count = 0
+        size = len(self.phrase)
+        position = text.find(self.phrase)
+        while position != -1:
+            end = position + size
+            if (position == 0 or not is_word_character(text[position - 1])) and \
+                    (end == len(text) or not is_word_character(text[end])):
+                count += 1
+            position = text.find(self.phrase, position + 1)
+        return count
+
+    def find_money(self, text):
+        """
+        :return: List of money mentions, each a dict with the matched text, amount, currency and
+            the normalised value (the amount with its scale word applied).
+        """
+        return [money_mention(match) for match in money_matches(text)]
+
+    def analyse(self, title, description):
+        """
+        :return: Dict with search_phrase_count, contains_money and money_mentions for one article.
+        """
+        record = self.analyse_batch([{"title": title, "description": description}])[0]
+        return {field: record[field] for field in ("search_phrase_count", "contains_money", "money_mentions")}
+
+    def analyse_batch(self, records):
+        """
+        Adds search_phrase_count, contains_money and money_mentions to every record (title and
+        description required). The money scan runs once over the whole batch.
+        :return: The records.
+        """
+        texts = [f"{record['title']}\n{record['description']}" for record in records]
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + len(SEPARATOR)
+
+        mentions = [[] for _ in records]
+        for match in money_matches(SEPARATOR.join(texts)):
+            mentions[bisect_right(starts, match.start()) - 1].append(money_mention(match))
+
+        with_money = 0
+        for record, text, record_mentions in zip(records, texts, mentions):
+            record["search_phrase_count"] = self.count_phrase(text)
+            record["contains_money"] = bool(record_mentions)
+            record["money_mentions"] = record_mentions
+            if record_mentions:
+                with_money += 1
+                self.logger.debug(f"Money mentioned in: {record['title']}")
+        if len(records) > 1:
+            self.logger.info(f"Analysed {len(records)} articles, {with_money} mention money")
+        return records
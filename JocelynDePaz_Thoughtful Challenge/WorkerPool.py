@@ -0,0 +1,180 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+
+# Outcome of each work item a worker processed, one JSON line per item (see report_item).
+ITEM_RESULTS = "item_results.jsonl"
+
+
+def worker_output_dir(worker_id, output_root=None):
+    return os.path.join(output_root or os.path.join(os.getcwd(), "output"), f"worker-{worker_id}")
+
+
+def report_item(directory, index, state, records, code=None, message=None):
+    """
+    Called by process_news in a worker: appends the outcome of its index-th work item to
+    <directory>/item_results.jsonl, so the pool can release the matching input item.
+    :param state: "DONE" or "FAILED".
+    :param records: Output work items created for the item.
+    """
+    with open(os.path.join(directory, ITEM_RESULTS), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"index": index, "state": state, "records": records, "code": code, "message": message}) + "\n")
+
+
+def queued_payloads():
+    """
+    Payloads of the local input queue (the FileAdapter's work-items file), read without reserving the items.
+    :return: The payloads in queue order, or None when the items can only be read by reserving them (Control Room).
+    """
+    adapter = os.environ.get("RC_WORKITEM_ADAPTER") or os.environ.get("RPA_WORKITEMS_ADAPTER")
+    path = os.environ.get("RC_WORKITEM_INPUT_PATH") or os.environ.get("RPA_INPUT_WORKITEM_PATH")
+    if adapter not in (None, "FileAdapter") or not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return [item.get("payload") for item in json.load(f)]
+
+
+class WorkerPool:
+    """
+    Runs the process_news task in several worker processes, each with its own Chrome
+    (debugging port and profile dir come from WORKER_ID) and its own output folder.
+
+    The queued payloads are split round-robin into one local work-item file per worker and
+    every worker reserves and completes its items through the FileAdapter, reporting the outcome
+    of each one. Once all workers exit, run returns the outcome and output records of every payload,
+    so the caller can release each input item only after its worker processed it.
+    """
+
+    def __init__(self, workers, output_root=None, task_file="tasks.py", task_name="process_news"):
+        self.logger = logging.getLogger(__name__)
+        self.workers = max(1, int(workers))
+        self.output_root = output_root or os.path.join(os.getcwd(), "output")
+        self.task_file = task_file
+        self.task_name = task_name
+
+    def partition(self, payloads):
+        partitions = [[] for _ in range(min(self.workers, len(payloads)) or 1)]
+        for index, payload in enumerate(payloads):
+            partitions[index % len(partitions)].append(payload)
+        return partitions
+
+    def paths(self, worker_id):
+        directory = worker_output_dir(worker_id, self.output_root)
+        return {
+            "dir": directory,
+            "input": os.path.join(directory, "work-items-in", "work-items.json"),
+            "output": os.path.join(directory, "work-items-out", "work-items.json"),
+            "results": os.path.join(directory, ITEM_RESULTS),
+        }
+
+    def launch(self, worker_id, payloads):
+        paths = self.paths(worker_id)
+        os.makedirs(os.path.dirname(paths["input"]), exist_ok=True)
+        os.makedirs(os.path.dirname(paths["output"]), exist_ok=True)
+        with open(paths["input"], "w") as f:
+            json.dump([{"payload": payload, "files": {}} for payload in payloads], f, indent=2)
+        for stale in (paths["output"], paths["results"]):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+        env = dict(
+            os.environ,
+            WORKER_ID=str(worker_id),
+            RC_WORKITEM_ADAPTER="FileAdapter",
+            RC_WORKITEM_INPUT_PATH=paths["input"],
+            RC_WORKITEM_OUTPUT_PATH=paths["output"],
+        )
+        command = [sys.executable, "-m", "robocorp.tasks", "run", self.task_file, "-t", self.task_name, "-o", paths["dir"]]
+        self.logger.info(f"Starting worker {worker_id} with {len(payloads)} work items")
+        return subprocess.Popen(command, env=env)
+
+    def collect(self, worker_id):
+        path = self.paths(worker_id)["output"]
+        if not os.path.exists(path):
+            self.logger.warning(f"Worker {worker_id} produced no output work items")
+            return []
+        with open(path) as f:
+            return [item["payload"] for item in json.load(f) if item.get("payload")]
+
+    def item_results(self, worker_id, count, return_code):
+        """
+        Outcome of each of a worker's count work items, in its queue order: {"state", "code", "message",
+        "records"}, with the output records the item created. An item the worker did not report (it crashed
+        or was killed first) is failed, and gets the outputs created after the last reported item.
+        """
+        reported = {}
+        path = self.paths(worker_id)["results"]
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Cut off when the worker died while writing it
+                        break
+                    reported[result["index"]] = result
+        outputs = self.collect(worker_id)
+
+        results = []
+        start = 0
+        for index in range(count):
+            result = reported.get(index) or {
+                "state": "FAILED",
+                "code": "WORKER_FAILED",
+                "message": f"Worker {worker_id} exited with code {return_code} before reporting the work item",
+            }
+            end = start + result["records"] if "records" in result else len(outputs)
+            results.append(dict(result, records=outputs[start:end]))
+            start = end
+        return results
+
+    def reports(self, name="run_report.json"):
+        """
+        Run reports written by the workers, keyed by worker id.
+        """
+        reports = {}
+        for worker_id in range(self.workers):
+            path = os.path.join(self.paths(worker_id)["dir"], name)
+            if os.path.exists(path):
+                with open(path) as f:
+                    reports[str(worker_id)] = json.load(f)
+        return reports
+
+    def run(self, payloads):
+        """
+        Processes the payloads on the worker pool.
+        :param payloads: Work-item payloads in queue order.
+        :return: Outcome and output records of each payload, in the same order (see item_results).
+        """
+        partitions = self.partition(list(range(len(payloads))))
+        processes = [self.launch(worker_id, [payloads[index] for index in part])
+                     for worker_id, part in enumerate(partitions) if part]
+
+        results = [None] * len(payloads)
+        for worker_id, process in enumerate(processes):
+            return_code = process.wait()
+            if return_code != 0:
+                self.logger.error(f"Worker {worker_id} exited with code {return_code}")
+            part = partitions[worker_id]
+            for index, result in zip(part, self.item_results(worker_id, len(part), return_code)):
+                results[index] = result
+        failed = sum(result["state"] != "DONE" for result in results)
+        self.logger.info(f"Workers finished {len(results) - failed} work items, {failed} failed, "
+                         f"{sum(len(result['records']) for result in results)} records")
+        return results
+
+    def save_json(self, news_data, name="news.json"):
+        """
+        Writes the records as a JSON array, one record per line, encoding each record on its own.
+        """
+        path = os.path.join(self.output_root, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for index, record in enumerate(news_data):
+                f.write(",\n  " if index else "\n  ")
+                f.write(record.to_json())
+            f.write("\n]\n")
+        self.logger.info(f"Saved merged records to {path}")
+        return path
@@ -0,0 +1,49 @@
+"""
+Throughput of the browser-free HTTP backend versus the Selenium backend on the local fixture site.
+Both runs go through Aljazeera.collect_news and include image downloads.
+
+Run from the robot root:  python -m benchmarks.bench_backends 10 100 1000
+"""
+import json
+import os
+import sys
+import time
+
+from Aljazeera import Aljazeera
+from benchmarks.fixture_site import FixtureSite
+
+
+def run(sizes):
+    results = []
+    for size in sizes:
+        with FixtureSite(article_count=size, page_size=min(size, 100)) as site:
+            for backend in ("http", "selenium"):
+                scraper = Aljazeera(base_url=site.url, output_dir=os.path.join(os.getcwd(), "output", "bench_backends"))
+                scraper.configure(site.phrase, size, "Date", backend=backend)
+                # Lift the 100-result cap so both backends are asked for the same number of cards.
+                scraper.max_results = size
+                try:
+                    started = time.perf_counter()
+                    news_data = scraper.collect_news()
+                    scraper.join_image_downloads()
+                    elapsed = time.perf_counter() - started
+                finally:
+                    scraper.close_browser()
+                rate = len(news_data) / elapsed if elapsed else 0
+                results.append({
+                    "backend": backend,
+                    "requested": size,
+                    "articles": len(news_data),
+                    "seconds": round(elapsed, 3),
+                    "articles_per_second": round(rate, 1),
+                })
+                print(f"{backend:>8} | {size:>5} requested | {len(news_data):>5} articles | {elapsed:7.2f} s | {rate:8.1f} articles/s")
+
+    output_path = os.path.join(os.getcwd(), "output", "bench_backends.json")
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    run([int(size) for size in sys.argv[1:]] or [10, 100, 1000])
@@ -0,0 +1,95 @@
+"""
+Export time and peak RSS for the previous RPA.Excel.Files export and the streaming output sinks.
+Each case runs in its own process so peak RSS is not shared between cases. Rows are generated and
+handed to the sinks in batches of 100, like work items arriving during a run.
+
+Run from the robot root:  python -m benchmarks.bench_export 20000
+"""
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+from NewsArticle import NewsArticle
+from OutputSink import NEWS_COLUMNS, create_sink
+
+BATCH_SIZE = 100
+
+
+def synthetic_rows(count):
+    for i in range(count):
+        yield NewsArticle(
+            f"Million-dollar story number {i} makes headlines",
+            date=f"{i % 28 + 1} Aug 2024",
+            description=f"Officials pledged ${i},000 after the announcement on day {i}. " * 3,
+            image_name=f"Million-dollar_story_number_{i}.jpg",
+            search_phrase_count=i % 4,
+            contains_money=i % 2 == 0,
+            news_url=f"https://www.aljazeera.com/news/2024/8/{i % 28 + 1}/story-{i}",
+        )
+
+
+def batches(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_rpa_excel(count, directory):
+    """The previous save_to_excel: every row copied into a list, then the whole workbook written at once."""
+    from RPA.Excel.Files import Files
+
+    excel = Files()
+    path = os.path.join(directory, "rpa_excel.xlsx")
+    excel.create_workbook(path)
+    excel.create_worksheet("News")
+    excel.set_active_worksheet("News")
+    processed_data = [{column: row.get(column) for column in NEWS_COLUMNS} for row in synthetic_rows(count)]
+    excel.append_rows_to_worksheet(processed_data, header=True)
+    excel.save_workbook(path)
+
+
+def export_sink(output_format, count, directory):
+    with create_sink(output_format, directory, name=f"sink_{output_format}") as sink:
+        for batch in batches(synthetic_rows(count)):
+            sink.write_many(batch)
+
+
+def run_case(name, count, directory, queue):
+    started = time.perf_counter()
+    try:
+        if name == "rpa_excel":
+            export_rpa_excel(count, directory)
+        else:
+            export_sink(name, count, directory)
+        error = None
+    except Exception as e:
+        error = str(e)
+    elapsed = time.perf_counter() - started
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((name, elapsed, peak_kib, error))
+
+
+def run(count=20000):
+    directory = os.path.join(os.getcwd(), "output", "bench_export")
+    os.makedirs(directory, exist_ok=True)
+    queue = multiprocessing.Queue()
+    for name in ("rpa_excel", "xlsx", "jsonl", "csv", "parquet"):
+        process = multiprocessing.Process(target=run_case, args=(name, count, directory, queue))
+        process.start()
+        process.join()
+        name, elapsed, peak_kib, error = queue.get()
+        if error:
+            print(f"{name:>10} | skipped: {error}")
+        else:
+            print(f"{name:>10} | {count} rows | {elapsed:7.2f} s | peak RSS {peak_kib / 1024:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,68 @@
+"""
+Compares the legacy per-element extraction with the batched single-script extraction.
+Counts WebDriver commands and wall time against the local fixture site.
+
+Run from the robot root:  python -m benchmarks.bench_extraction 10 50 100
+"""
+import json
+import os
+import sys
+import time
+
+from Aljazeera import Aljazeera
+from benchmarks.fixture_site import FixtureSite
+
+
+class CommandCounter:
+    """Counts every command the driver sends to chromedriver by wrapping WebDriver.execute."""
+
+    def __init__(self, driver):
+        self.count = 0
+        self.driver = driver
+        self.original_execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            return self.original_execute(driver_command, params)
+
+        driver.execute = counting_execute
+
+    def reset(self):
+        self.count = 0
+
+
+def run(sizes):
+    results = []
+    scraper = Aljazeera()
+    scraper.browser.set_webdriver()
+    counter = CommandCounter(scraper.browser.driver)
+    try:
+        with FixtureSite() as site:
+            for size in sizes:
+                for mode in ("legacy", "batched"):
+                    scraper.configure(site.phrase, size, "Date", extraction_mode=mode, use_index=False)
+                    scraper.browser.open_url(f"{site.search_url()}?count={size}")
+                    counter.reset()
+                    started = time.perf_counter()
+                    news_data = scraper.extract_latest_news()
+                    scraper.join_image_downloads()
+                    elapsed = time.perf_counter() - started
+                    results.append({
+                        "mode": mode,
+                        "articles": len(news_data),
+                        "webdriver_commands": counter.count,
+                        "wall_time_s": round(elapsed, 3),
+                    })
+                    print(f"{mode:>8} | {len(news_data):>4} articles | {counter.count:>5} commands | {elapsed:8.2f} s")
+    finally:
+        scraper.close_browser()
+
+    output_path = os.path.join(os.getcwd(), "output", "bench_extraction.json")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    run([int(size) for size in sys.argv[1:]] or [10, 50, 100])
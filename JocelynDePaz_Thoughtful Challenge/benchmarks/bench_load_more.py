@@ -0,0 +1,61 @@
+"""
+Per-click 'Show more' latency of the event-driven loader (Aljazeera.load_more_results)
+versus the previous approach: wait for the button to be clickable, click, then poll the
+card count with WebDriverWait's default 0.5 s poll frequency.
+
+Run from the robot root:  python -m benchmarks.bench_load_more 100 0.2
+"""
+import sys
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from Aljazeera import Aljazeera, ARTICLES_XPATH
+from benchmarks.fixture_site import FixtureSite
+
+
+def polling_load_more(scraper):
+    driver = scraper.browser.driver
+    latencies = []
+    loaded = len(driver.find_elements(By.XPATH, ARTICLES_XPATH))
+    while loaded < scraper.max_results:
+        if not driver.find_elements(By.CLASS_NAME, "show-more-button"):
+            break
+        started = time.perf_counter()
+        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.CLASS_NAME, "show-more-button"))).click()
+        before = loaded
+        WebDriverWait(driver, 10).until(lambda d: len(d.find_elements(By.XPATH, ARTICLES_XPATH)) > before)
+        loaded = len(driver.find_elements(By.XPATH, ARTICLES_XPATH))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return loaded, latencies
+
+
+def report(name, loaded, latencies, elapsed):
+    average = sum(latencies) / len(latencies) if latencies else 0
+    print(f"{name:>14} | {loaded:>4} cards | {len(latencies):>3} clicks | {average:7.0f} ms/click | {elapsed:6.2f} s total")
+
+
+def run(max_results=100, latency=0.2):
+    with FixtureSite(article_count=max_results, page_size=10, latency=latency) as site:
+        scraper = Aljazeera(base_url=site.url)
+        try:
+            scraper.configure(site.phrase, max_results, "Relevance")
+
+            scraper.open_search()
+            started = time.perf_counter()
+            loaded, latencies = polling_load_more(scraper)
+            report("polling", loaded, latencies, time.perf_counter() - started)
+
+            scraper.open_search()
+            started = time.perf_counter()
+            scraper.load_more_results()
+            loaded = len(scraper.browser.driver.find_elements(By.XPATH, ARTICLES_XPATH))
+            report("event-driven", loaded, scraper.show_more_latencies, time.perf_counter() - started)
+        finally:
+            scraper.close_browser()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100, float(sys.argv[2]) if len(sys.argv) > 2 else 0.2)
@@ -0,0 +1,37 @@
+"""
+Times how long it takes to reach the sorted search results with the direct search URL
+versus the interactive homepage flow, on both fixture page shapes:
+a site that serves /search/<phrase> and one that only answers the homepage search box.
+
+Run from the robot root:  python -m benchmarks.bench_navigation
+"""
+import time
+
+from selenium.webdriver.common.by import By
+
+from Aljazeera import Aljazeera, ARTICLES_XPATH
+from benchmarks.fixture_site import FixtureSite
+
+
+def run(article_count=20):
+    results = []
+    for direct_search in (True, False):
+        with FixtureSite(article_count, direct_search=direct_search) as site:
+            scraper = Aljazeera(base_url=site.url)
+            try:
+                for mode in ("direct", "interactive"):
+                    scraper.configure(site.phrase, article_count, "Date", navigation_mode=mode)
+                    started = time.perf_counter()
+                    scraper.open_search()
+                    elapsed = time.perf_counter() - started
+                    cards = len(scraper.browser.driver.find_elements(By.XPATH, ARTICLES_XPATH))
+                    shape = "search url" if direct_search else "search box only"
+                    results.append({"site": shape, "mode": mode, "cards": cards, "seconds": round(elapsed, 3)})
+                    print(f"{shape:>15} | {mode:>11} | {cards:>4} cards | {elapsed:6.2f} s | {scraper.browser.driver.current_url}")
+            finally:
+                scraper.close_browser()
+    return results
+
+
+if __name__ == "__main__":
+    run()
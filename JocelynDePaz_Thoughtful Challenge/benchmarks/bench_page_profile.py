@@ -0,0 +1,51 @@
+"""
+Page-load time and bytes transferred with the "standard" and "lean" browser profiles.
+Defaults to the live Al Jazeera homepage and search page, since the ads, trackers and fonts
+the lean profile blocks only exist there.
+
+Run from the robot root:  python -m benchmarks.bench_page_profile [url ...]
+"""
+import sys
+import time
+
+from CustomSelenium import CustomSelenium
+
+DEFAULT_URLS = [
+    "https://www.aljazeera.com/",
+    "https://www.aljazeera.com/search/million?sort=date",
+]
+
+
+def measure(profile, urls, repeats):
+    browser = CustomSelenium(profile=profile, capture_network=True)
+    browser.set_webdriver()
+    results = []
+    try:
+        for url in urls:
+            for _ in range(repeats):
+                browser.network_bytes()
+                started = time.perf_counter()
+                browser.open_url(url)
+                elapsed = (time.perf_counter() - started) * 1000
+                timing = browser.page_load_timing() or {}
+                results.append({
+                    "profile": profile,
+                    "url": url,
+                    "get_ms": round(elapsed),
+                    "dom_content_loaded_ms": round(timing.get("dom_content_loaded") or 0),
+                    "bytes": browser.network_bytes(),
+                })
+    finally:
+        browser.close_browser()
+    return results
+
+
+def run(urls, repeats=3):
+    for profile in ("standard", "lean"):
+        for row in measure(profile, urls, repeats):
+            print(f"{row['profile']:>8} | {row['get_ms']:>6} ms get | {row['dom_content_loaded_ms']:>6} ms DCL | "
+                  f"{row['bytes'] / 1024:9.0f} KiB | {row['url']}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:] or DEFAULT_URLS)
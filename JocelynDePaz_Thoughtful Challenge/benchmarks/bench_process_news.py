@@ -0,0 +1,161 @@
+"""
+End-to-end benchmark of tasks.process_news against the local fixture site.
+
+Each scale runs the task in a fresh process through the robocorp FileAdapter (one work item asking
+for that many articles), exactly like a worker of the Run Parallel task, with ALJAZEERA_BASE_URL
+pointing at the fixture. Wall time, per-article latency, peak memory of the task process tree and
+WebDriver round trips (from the task's run_report.json) are printed and appended to
+output/bench_process_news.jsonl, one line per scale, so runs before and after a change can be compared.
+
+--deep also reads every article in deep mode; those results are compared only with earlier --deep runs.
+
+Run from the robot root:  python -m benchmarks.bench_process_news 10 50 100 --latency 0.05
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import threading
+import time
+
+from WorkerPool import WorkerPool
+from benchmarks.fixture_site import FixtureSite
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RESULTS_PATH = os.path.join(os.getcwd(), "output", "bench_process_news.jsonl")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+class PeakMemory:
+    """
+    Samples the resident memory of a process and all its descendants (Chrome included) until stopped.
+    Without psutil, falls back to the largest single child process reported by getrusage.
+    """
+
+    def __init__(self, pid, interval=0.1):
+        self.pid = pid
+        self.interval = interval
+        self.peak_bytes = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        if psutil is None:
+            return
+        try:
+            root = psutil.Process(self.pid)
+        except psutil.Error:
+            return
+        while not self.stopped.is_set():
+            try:
+                processes = [root] + root.children(recursive=True)
+                total = 0
+                for process in processes:
+                    try:
+                        total += process.memory_info().rss
+                    except psutil.Error:
+                        pass
+                self.peak_bytes = max(self.peak_bytes, total)
+            except psutil.Error:
+                break
+            self.stopped.wait(self.interval)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stopped.set()
+        self.thread.join()
+        if psutil is None:
+            self.peak_bytes = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+
+    @property
+    def tree(self):
+        return psutil is not None
+
+
+def run_scale(size, latency, output_root, deep=False):
+    shutil.rmtree(output_root, ignore_errors=True)
+    with FixtureSite(article_count=size, page_size=10, latency=latency) as site:
+        os.environ["ALJAZEERA_BASE_URL"] = site.url
+        pool = WorkerPool(1, output_root=output_root)
+        payload = {"search_phrase": site.phrase, "max_results": size, "sort_by": "Date", "use_index": False, "deep": deep}
+        started = time.perf_counter()
+        process = pool.launch(0, [payload])
+        with PeakMemory(process.pid) as memory:
+            return_code = process.wait()
+        elapsed = time.perf_counter() - started
+
+    articles = len(pool.collect(0))
+    report = pool.reports().get("0", {})
+    item = (report.get("items") or [{}])[0]
+    article_spans = report.get("stages", {}).get("article", {})
+    return {
+        "scale": size,
+        "latency_s": latency,
+        "deep": deep,
+        "return_code": return_code,
+        "articles": articles,
+        "wall_s": round(elapsed, 3),
+        "item_s": item.get("duration_s"),
+        "wait_s": item.get("wait_s"),
+        "per_article_ms": round(elapsed / articles * 1000, 1) if articles else None,
+        "article_span_ms": round(article_spans["duration_s"] / article_spans["count"] * 1000, 2) if article_spans else None,
+        "peak_rss_mb": round(memory.peak_bytes / (1024 * 1024), 1),
+        "peak_rss_scope": "process tree" if memory.tree else "largest child",
+        "webdriver_commands": report.get("webdriver_commands"),
+        "webdriver_s": report.get("webdriver_s"),
+    }
+
+
+def previous_results(path):
+    previous = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                result = json.loads(line)
+                previous[(result["scale"], result["latency_s"], result.get("deep", False))] = result
+    return previous
+
+
+def run(sizes, latency=0.0, deep=False):
+    previous = previous_results(RESULTS_PATH)
+    meta = {"run_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "git": git_revision(), "python": platform.python_version()}
+    results = []
+    print(f"{'scale':>6} | {'articles':>8} | {'wall s':>8} | {'ms/article':>10} | {'peak MB':>8} | {'WD cmds':>7} | vs previous")
+    for size in sizes:
+        result = dict(meta, **run_scale(size, latency, os.path.join(os.getcwd(), "output", "bench_process_news", str(size)), deep))
+        results.append(result)
+        before = previous.get((size, latency, deep))
+        change = f"{(result['wall_s'] / before['wall_s'] - 1) * 100:+.0f}% ({before['git']})" if before and before["wall_s"] else "-"
+        print(f"{size:>6} | {result['articles']:>8} | {result['wall_s']:>8.2f} | {result['per_article_ms'] or 0:>10.1f} | "
+              f"{result['peak_rss_mb']:>8.1f} | {result['webdriver_commands'] or 0:>7} | {change}")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "a") as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=[10, 50, 100], help="Articles requested per run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay of every fixture page and fragment, in seconds")
+    parser.add_argument("--deep", action="store_true", help="Read every article in deep mode")
+    args = parser.parse_args()
+    run(args.sizes, args.latency, args.deep)
@@ -0,0 +1,124 @@
+"""
+Memory of the news records: the previous dict records against NewsArticle and NewsBatch.
+
+For each representation the records are built and held, as a run holds them (checkpoint entries,
+the records merged from the worker pool), then serialised the way the outputs do it: a work-item payload,
+a JSONL line and a tabular row (Excel/CSV) per record. Reported per representation:
+
+    held MiB        memory retained by the records (tracemalloc), strings included
+    B/record        the same per record, and without the strings shared by every representation
+    peak MiB        highest traced memory while building and serialising
+    build / write   wall time
+
+Each representation runs in its own process. Needs no browser or third-party package.
+
+Run from the robot root:  python -m benchmarks.bench_records 100000
+"""
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+
+from NewsArticle import NewsArticle, NewsBatch
+from OutputSink import NEWS_COLUMNS
+
+
+def fields(i):
+    # New string objects for every record, as read from the page
+    return {
+        "title": f"Million-dollar story number {i} makes headlines",
+        "date": f"{i % 28 + 1} Aug 2024",
+        "published_at": f"2024-08-{i % 28 + 1:02d}T00:00:00",
+        "description": f"Officials pledged ${i},000 after the announcement on day {i}. " * 3,
+        "image_name": f"Million-dollar_story_number_{i}.jpg",
+        "search_phrase_count": i % 4,
+        "contains_money": i % 2 == 0,
+        "news_url": f"https://www.aljazeera.com/news/2024/8/{i % 28 + 1}/story-{i}",
+        "money_mentions": [],
+    }
+
+
+def build_dicts(count):
+    return [fields(i) for i in range(count)]
+
+
+def build_articles(count):
+    return [NewsArticle(**fields(i)) for i in range(count)]
+
+
+def build_batch(count):
+    batch = NewsBatch()
+    for i in range(count):
+        batch.append(NewsArticle(**fields(i)))
+    return batch
+
+
+def write_dicts(records, out):
+    for record in records:
+        json.dumps(record, ensure_ascii=False)  # work-item payload
+        out.write(json.dumps({column: record.get(column) for column in NEWS_COLUMNS}, ensure_ascii=False))
+        out.write("\n")
+        [record.get(column) for column in NEWS_COLUMNS]  # Excel / CSV row
+
+
+def write_records(records, out):
+    for record in records:
+        json.dumps(record.to_dict(), ensure_ascii=False)
+        out.write(record.to_json(NEWS_COLUMNS))
+        out.write("\n")
+        [getattr(record, column, None) for column in NEWS_COLUMNS]
+
+
+CASES = {
+    "dict": (build_dicts, write_dicts),
+    "NewsArticle": (build_articles, write_records),
+    "NewsBatch": (build_batch, write_records),
+}
+
+
+def string_bytes(count):
+    """Size of the string values themselves, the same for every representation."""
+    return sum(sys.getsizeof(value) for i in range(count) for value in fields(i).values() if isinstance(value, str))
+
+
+def run_case(name, count, queue):
+    build, write = CASES[name]
+    with open(os.devnull, "w", encoding="utf-8") as out:
+        # Timed untraced first, since tracemalloc slows down every allocation
+        started = time.perf_counter()
+        records = build(count)
+        built = time.perf_counter()
+        write(records, out)
+        written = time.perf_counter()
+        del records
+
+        tracemalloc.start()
+        records = build(count)
+        held = tracemalloc.get_traced_memory()[0]
+        write(records, out)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    queue.put((name, held, peak, built - started, written - built))
+
+
+def run(count=100000):
+    strings = string_bytes(min(count, 10000)) * count / min(count, 10000)
+    queue = multiprocessing.Queue()
+    results = {}
+    print(f"{'records':>12} | {'held MiB':>8} | {'B/record':>8} | {'w/o strings':>11} | {'peak MiB':>8} | {'build s':>7} | {'write s':>7}")
+    for name in CASES:
+        process = multiprocessing.Process(target=run_case, args=(name, count, queue))
+        process.start()
+        name, held, peak, build_s, write_s = queue.get()
+        process.join()
+        results[name] = {"held_bytes": held, "peak_bytes": peak, "build_s": build_s, "write_s": write_s}
+        print(f"{name:>12} | {held / 2 ** 20:8.1f} | {held / count:8.0f} | {(held - strings) / count:11.0f} | "
+              f"{peak / 2 ** 20:8.1f} | {build_s:7.2f} | {write_s:7.2f}")
+    print(json.dumps({"records": count, "results": results}))
+    return results
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
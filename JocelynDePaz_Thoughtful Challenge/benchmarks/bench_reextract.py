@@ -0,0 +1,63 @@
+"""
+Offline re-extraction throughput: SnapshotArchive.reextract over a synthetic archive of searches.
+
+The archive is written with SnapshotArchive from fixture search pages (pages_per_search pages of 10 cards
+each per search), then re-extracted to JSONL with 1 worker process and with the CPU count. No browser and
+no network are involved. Reports searches, pages and records per second, and the archive size on disk.
+
+Run from the robot root:  python -m benchmarks.bench_reextract 2000 --pages 3
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+
+from SnapshotArchive import SnapshotArchive, reextract
+from benchmarks.fixture_site import render_search_page
+
+PHRASES = ["Million", "Gaza", "Election", "Climate", "Economy"]
+CARDS_PER_PAGE = 10
+
+
+def build_archive(root, searches, pages_per_search):
+    archive = SnapshotArchive(root)
+    for search in range(searches):
+        phrase = PHRASES[search % len(PHRASES)]
+        archive.begin_search(search_phrase=phrase, sort_by="Date", max_results=100, cutoff=None, backend="http")
+        for page in range(pages_per_search):
+            html = render_search_page(CARDS_PER_PAGE, phrase=phrase, sort="date", start=page * CARDS_PER_PAGE)
+            archive.save(html, f"http://127.0.0.1/search/{phrase}?sort=date&page={page}")
+    archive.close()
+    return archive.stats()
+
+
+def run(searches=2000, pages_per_search=3):
+    directory = os.path.join(os.getcwd(), "output", "bench_reextract")
+    shutil.rmtree(directory, ignore_errors=True)
+    root = os.path.join(directory, "snapshots")
+
+    started = time.perf_counter()
+    stats = build_archive(root, searches, pages_per_search)
+    print(f"archived {stats['searches']} searches, {stats['pages']} pages in {time.perf_counter() - started:.2f} s: "
+          f"{stats['bytes'] / 2 ** 20:.1f} MiB of HTML stored in {stats['stored_bytes'] / 2 ** 20:.1f} MiB")
+
+    results = {}
+    for workers in sorted({1, os.cpu_count() or 1}):
+        output_dir = os.path.join(directory, f"workers-{workers}")
+        os.makedirs(output_dir, exist_ok=True)
+        summary = reextract(root, output_dir, output_formats=["jsonl"], workers=workers)
+        results[workers] = summary
+        seconds = summary["seconds"] or 1e-9
+        print(f"{workers:>3} workers | {summary['searches']:>6} searches | {summary['records']:>7} records | {seconds:7.2f} s | "
+              f"{summary['searches'] / seconds:8.1f} searches/s | {summary['pages'] / seconds:8.1f} pages/s")
+    print(json.dumps({"archive": stats, "reextract": results}))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("searches", nargs="?", type=int, default=2000, help="Archived searches")
+    parser.add_argument("--pages", type=int, default=3, help="Results pages per search")
+    args = parser.parse_args()
+    run(args.searches, args.pages)
@@ -0,0 +1,119 @@
+"""
+Cold start of tasks.process_news: time from spawning the task process to the first loaded search results.
+
+Each run starts the task in a fresh process through the robocorp FileAdapter (one work item, one article),
+like a worker of the Run Parallel task, with ALJAZEERA_BASE_URL pointing at the fixture site. The moment the
+first search results were loaded is taken from the task's run_report.json (end of the first open_search_url
+span). Three setups are compared:
+
+    cold       empty driver cache (the driver is resolved through RPA.core.webdriver), no pre-warm
+    cached     driver binary path read from the cache, no pre-warm
+    prewarmed  cached driver, Chrome launched in the background while the work item is read
+
+The time to import the task module (without building the scraper) is reported as well.
+Locally the FileAdapter reads the work item almost instantly, so pre-warming only overlaps Chrome's boot with
+the task setup here; with Control Room the reservation of the work item takes longer and hides more of it.
+
+Run from the robot root:  python -m benchmarks.bench_startup --runs 3
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from WorkerPool import WorkerPool
+from benchmarks.fixture_site import FixtureSite
+
+IMPORT_SCRIPT = "import time; started = time.perf_counter(); import tasks; print(time.perf_counter() - started)"
+
+MODES = {
+    "cold": {"fresh_cache": True, "prewarm": "0"},
+    "cached": {"fresh_cache": False, "prewarm": "0"},
+    "prewarmed": {"fresh_cache": False, "prewarm": "1"},
+}
+
+
+def import_time():
+    result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, text=True, cwd=os.getcwd())
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1] if result.stderr else "import failed")
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def first_span_end(spans, name):
+    """
+    End of the earliest span called name, in seconds after the instrumentation started, or None.
+    """
+    ends = []
+    for span in spans:
+        if span["name"] == name:
+            ends.append(span["start_s"] + span["duration_s"])
+        nested = first_span_end(span.get("children", []), name)
+        if nested is not None:
+            ends.append(nested)
+    return min(ends) if ends else None
+
+
+def run_once(site, mode, cache_path, output_root):
+    settings = MODES[mode]
+    if settings["fresh_cache"] and os.path.exists(cache_path):
+        os.remove(cache_path)
+    os.environ.update(ALJAZEERA_BASE_URL=site.url, DRIVER_CACHE_PATH=cache_path, PREWARM_BROWSER=settings["prewarm"])
+
+    shutil.rmtree(output_root, ignore_errors=True)
+    pool = WorkerPool(1, output_root=output_root)
+    payload = {"search_phrase": site.phrase, "max_results": 1, "sort_by": "Date", "use_index": False, "resume": False}
+    spawned_at = time.time()
+    return_code = pool.launch(0, [payload]).wait()
+
+    report = pool.reports().get("0", {})
+    search_end = first_span_end(report.get("items", []), "open_search_url")
+    if return_code != 0 or search_end is None:
+        print(f"{mode}: run failed (exit code {return_code})")
+        return None
+    return {
+        "setup_s": report["started_at"] - spawned_at,
+        "first_search_s": report["started_at"] + search_end - spawned_at,
+        "driver_source": report.get("session", {}).get("driver_source"),
+        "prewarmed": report.get("session", {}).get("prewarmed"),
+    }
+
+
+def run(runs=3):
+    output_root = os.path.join(os.getcwd(), "output", "bench_startup")
+    cache_path = os.path.join(tempfile.mkdtemp(prefix="bench-startup-"), "drivers.json")
+    results = {}
+    try:
+        with FixtureSite(article_count=10) as site:
+            for _ in range(runs):
+                # Interleaved, so a warming disk cache favours no setup in particular
+                for mode in MODES:
+                    result = run_once(site, mode, cache_path, output_root)
+                    if result:
+                        results.setdefault(mode, []).append(result)
+    finally:
+        shutil.rmtree(os.path.dirname(cache_path), ignore_errors=True)
+
+    imported = import_time()
+    print(f"import tasks: {imported:.3f} s" if imported is not None else "import tasks: failed")
+    print(f"{'mode':>10} | {'runs':>4} | {'to scraper s':>12} | {'first search s':>14} | driver")
+    for mode, samples in results.items():
+        setup = statistics.median(sample["setup_s"] for sample in samples)
+        first_search = statistics.median(sample["first_search_s"] for sample in samples)
+        print(f"{mode:>10} | {len(samples):>4} | {setup:>12.2f} | {first_search:>14.2f} | {samples[-1]['driver_source']}")
+    summary = {mode: [sample["first_search_s"] for sample in samples] for mode, samples in results.items()}
+    print(json.dumps({"import_tasks_s": imported, "first_search_s": summary}))
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Runs per setup; the median is reported")
+    args = parser.parse_args()
+    run(args.runs)
@@ -0,0 +1,82 @@
+"""
+Throughput of the previous per-article checks (seven money regexes tried one by one, phrase counted with
+.lower().count() on title and description) versus TextAnalytics.analyse_batch, on synthetic articles.
+
+Run from the robot root:  python -m benchmarks.bench_text_analytics 100000
+"""
+import random
+import re
+import sys
+import time
+
+from TextAnalytics import TextAnalytics
+
+PHRASE = "Gaza"
+
+LEGACY_MONEY_PATTERNS = [
+    r"\$\d+(?:\.\d{1,2})?",
+    r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+dollars?",
+    r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+USD",
+    r"£\d+(?:,\d{3})*(?:\.\d{1,2})?",
+    r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+pounds?",
+    r"€\d+(?:,\d{3})*(?:\.\d{1,2})?",
+    r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+euros?",
+]
+
+WORDS = ("talks ceasefire officials said the aid convoy border crossing hospital after week "
+         "minister government report children killed families displaced northern southern").split()
+MONEY = ["$5", "$2.5 million", "£1,200", "€30bn", "400 dollars", "12 USD", "3 pounds", "7 euros"]
+
+
+def synthetic_articles(count, seed=7):
+    rng = random.Random(seed)
+    articles = []
+    for _ in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(9))
+        description = " ".join(rng.choice(WORDS) for _ in range(30))
+        if rng.random() < 0.5:
+            title = f"{PHRASE} {title}"
+        if rng.random() < 0.3:
+            description = f"{description} {rng.choice(MONEY)} {PHRASE.lower()}"
+        articles.append({"title": title, "description": description})
+    return articles
+
+
+def legacy(articles):
+    results = []
+    for article in articles:
+        title, description = article["title"], article["description"]
+        count = title.lower().count(PHRASE.lower()) + description.lower().count(PHRASE.lower())
+        text = title + " " + description
+        contains_money = False
+        for pattern in LEGACY_MONEY_PATTERNS:
+            if re.search(pattern, text, re.IGNORECASE):
+                contains_money = True
+                break
+        results.append((count, contains_money))
+    return results
+
+
+def batched(articles):
+    records = [dict(article) for article in articles]
+    TextAnalytics(PHRASE).analyse_batch(records)
+    return [(record["search_phrase_count"], record["contains_money"]) for record in records]
+
+
+def run(count):
+    articles = synthetic_articles(count)
+    timings = {}
+    results = {}
+    for name, function in (("legacy", legacy), ("batched", batched)):
+        started = time.perf_counter()
+        results[name] = function(articles)
+        timings[name] = time.perf_counter() - started
+        print(f"{name:>8} | {count} articles | {timings[name]:6.3f} s | {count / timings[name]:>10.0f} articles/s")
+
+    money_agrees = sum(a[1] == b[1] for a, b in zip(results["legacy"], results["batched"]))
+    print(f"speed-up: {timings['legacy'] / timings['batched']:.1f}x, contains_money agrees on {money_agrees}/{count}")
+    return timings
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
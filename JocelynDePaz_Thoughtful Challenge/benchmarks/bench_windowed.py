@@ -0,0 +1,112 @@
+"""
+Browser memory and per-batch latency of windowed extraction versus keeping every card in the page,
+on a fixture search with 10 cards per 'Show more' click.
+
+After each batch the DOM node count, the page's JS heap and (with psutil) the RSS of the Chrome process
+tree are sampled. The run fails (exit code 1) unless windowed extraction stays bounded: the last quarter
+of the batches may not use more than 1.5x the DOM nodes or JS heap of the first quarter.
+
+Run from the robot root:  python -m benchmarks.bench_windowed 1000
+"""
+import os
+import sys
+import time
+
+from Aljazeera import Aljazeera
+from benchmarks.fixture_site import FixtureSite
+
+PAGE_SIZE = 10
+GROWTH_LIMIT = 1.5
+
+PAGE_MEMORY_SCRIPT = """
+return {
+    nodes: document.getElementsByTagName('*').length,
+    heap: performance.memory ? performance.memory.usedJSHeapSize : null
+};
+"""
+
+
+class SamplingAljazeera(Aljazeera):
+    """
+    Samples page memory after every 'Show more' click of the regular (non-windowed) loader.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.samples = []
+
+    def sample(self, latency_ms):
+        page = self.browser.driver.execute_script(PAGE_MEMORY_SCRIPT)
+        self.samples.append({"latency_ms": latency_ms, "nodes": page["nodes"], "heap": page["heap"], "rss_mb": self.session.memory_mb()})
+
+    def click_show_more(self):
+        result = super().click_show_more()
+        if self.extraction_mode != "windowed":
+            self.sample(result["ms"])
+        return result
+
+
+def run_mode(site, size, mode):
+    scraper = SamplingAljazeera(base_url=site.url, output_dir=os.path.join(os.getcwd(), "output", "bench_windowed"))
+    try:
+        scraper.configure(site.phrase, size, "Relevance", extraction_mode="windowed" if mode == "windowed" else "batched",
+                          use_index=False)
+        scraper.open_search()
+        started = time.perf_counter()
+        if mode == "windowed":
+            cards = 0
+            for batch in scraper.read_card_windows():
+                cards += len(batch)
+                scraper.sample(scraper.window_latencies[-1])
+        else:
+            # The regular loader, with the 100-result cap lifted for comparison
+            scraper.max_results = size
+            scraper.load_more_results()
+            read_started = time.perf_counter()
+            cards = len(scraper.read_loaded_cards())
+            scraper.sample((time.perf_counter() - read_started) * 1000)
+        elapsed = time.perf_counter() - started
+    finally:
+        scraper.close_browser()
+    return cards, elapsed, scraper.samples
+
+
+def quarter_peak(samples, key, last=False):
+    quarter = max(1, len(samples) // 4)
+    values = [sample[key] for sample in (samples[-quarter:] if last else samples[:quarter]) if sample[key] is not None]
+    return max(values) if values else None
+
+
+def summarise(mode, cards, elapsed, samples):
+    first_latency = sum(s["latency_ms"] for s in samples[:5]) / min(5, len(samples))
+    last_latency = sum(s["latency_ms"] for s in samples[-5:]) / min(5, len(samples))
+    rss = [s["rss_mb"] for s in samples if s["rss_mb"] is not None]
+    print(f"{mode:>9} | {cards:>5} cards | {elapsed:7.2f} s | batch latency {first_latency:6.0f} -> {last_latency:6.0f} ms | "
+          f"DOM nodes {quarter_peak(samples, 'nodes')} -> {quarter_peak(samples, 'nodes', last=True)} | "
+          f"JS heap {quarter_peak(samples, 'heap')} -> {quarter_peak(samples, 'heap', last=True)} | "
+          f"Chrome RSS {f'{rss[0]:.0f} -> {max(rss):.0f} MB' if rss else 'n/a (no psutil)'}")
+
+
+def is_bounded(samples):
+    for key in ("nodes", "heap"):
+        first, last = quarter_peak(samples, key), quarter_peak(samples, key, last=True)
+        if first and last and last > first * GROWTH_LIMIT:
+            print(f"windowed extraction is not bounded: {key} grew from {first} to {last}")
+            return False
+    return True
+
+
+def run(size=1000):
+    with FixtureSite(article_count=size, page_size=PAGE_SIZE) as site:
+        results = {mode: run_mode(site, size, mode) for mode in ("all-cards", "windowed")}
+    for mode, (cards, elapsed, samples) in results.items():
+        summarise(mode, cards, elapsed, samples)
+
+    cards, _, samples = results["windowed"]
+    bounded = cards == size and is_bounded(samples)
+    print(f"windowed memory bounded at {size} articles: {'yes' if bounded else 'NO'}")
+    return bounded
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000) else 1)
@@ -0,0 +1,283 @@
+"""
+Local stand-in for the Al Jazeera search results page, used by the benchmarks.
+Serves the same card structure Aljazeera depends on so runs never hit aljazeera.com.
+"""
+import hashlib
+import html
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote
+
+# Smallest valid JPEG (1x1 pixel), served for every card image.
+PIXEL_JPEG = bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c140d0c0b0b0c1912130f"
+    "141d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27393d38323c2e333432ffc0000b08000100010101"
+    "1100ffc4001f0000010501010101010100000000000000000102030405060708090a0bffc400b5100002010303020403050504"
+    "040000017d01020300041105122131410613516107227114328191a1082342b1c11552d1f02433627282090a161718191a25"
+    "262728292a3435363738393a434445464748494a535455565758595a636465666768696a737475767778797a838485868788"
+    "898a92939495969798999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9bac2c3c4c5c6c7c8c9cad2d3d4d5d6d7d8d9dae1e2e3"
+    "e4e5e6e7e8e9eaf1f2f3f4f5f6f7f8f9faffda0008010100003f00fbd3ffd9"
+)
+
+# Age gap between consecutive fixture articles, so date cutoffs land partway through the results.
+ARTICLE_INTERVAL_HOURS = 6
+
+
+def render_date(index):
+    """
+    Newest first, one article every ARTICLE_INTERVAL_HOURS: the first day's cards read "N hours ago",
+    older ones show the calendar date like the real cards.
+    """
+    hours = index * ARTICLE_INTERVAL_HOURS
+    if hours < 24:
+        return f"{hours or 1} hours ago"
+    published = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return f"{published.day} {published.strftime('%b %Y')}"
+
+
+def render_card(index, phrase):
+    title = html.escape(f"{phrase} story number {index} makes headlines")
+    date = render_date(index)
+    excerpt = html.escape(f"Officials pledged ${index},000 after the {phrase.lower()} announcement on day {index}.")
+    return f"""
+<article class="gc u-clickable-card gc--type-post gc--list gc--with-image">
+  <div class="gc__content">
+    <div class="gc__header-wrap">
+      <h3 class="gc__title"><a class="u-clickable-card__link" href="/news/2024/8/{index % 28 + 1}/story-{index}"><span>{title}</span></a></h3>
+    </div>
+    <div class="gc__body-wrap"><div class="gc__excerpt"><p>{excerpt}</p></div></div>
+    <footer class="gc__footer">
+      <div class="gc__date"><div class="date-simple">
+        <span class="screen-reader-text">Published On {date}</span>
+        <span aria-hidden="true">{date}</span>
+      </div></div>
+    </footer>
+  </div>
+  <div class="gc__image-wrap"><div class="responsive-image">
+    <img class="gc__image" loading="lazy" src="/images/{index}.jpg" alt="">
+  </div></div>
+</article>"""
+
+
+COOKIE_BANNER = """
+<div id="onetrust-consent-sdk" style="position:fixed;bottom:0;left:0;right:0;height:200px;background:#fff;z-index:1000">
+  <button onclick="document.cookie='consent=1;path=/';document.getElementById('onetrust-consent-sdk').remove()">Allow all</button>
+</div>"""
+
+ADS = """
+<div class="container--ads" style="position:fixed;top:0;left:0;right:0;height:120px;background:#eee;z-index:900">
+  <button class="ads__close-button" onclick="this.parentNode.remove()">Close</button>
+</div>"""
+
+
+def render_search_bar(search_path, phrase=""):
+    return f"""
+<form class="search-bar" onsubmit="location.href='{search_path}' + encodeURIComponent(this.querySelector('input').value); return false;">
+  <div class="search-bar__input-container"><input class="search-bar__input" type="text" value="{html.escape(phrase)}"></div>
+</form>"""
+
+
+def render_page(title, body, consent):
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} - Al Jazeera</title></head>
+<body>
+{body}
+{"" if consent else COOKIE_BANNER}
+</body></html>"""
+
+
+def render_home_page(search_path, consent=False):
+    body = f"""
+<header class="site-header">
+  <div class="site-header__search-trigger">
+    <button class="no-styles-button" onclick="document.getElementById('search-overlay').style.display='block'">Search</button>
+  </div>
+  <button class="site-header__menu-trigger" onclick="document.getElementById('search-overlay').style.display='block'">Menu</button>
+</header>
+<div id="search-overlay" style="display:none">{render_search_bar(search_path)}</div>
+<main><h1>Latest news</h1></main>"""
+    return render_page("Home", body, consent)
+
+
+SHOW_MORE_SCRIPT = """
+<script>
+function loadMore(button) {
+  button.disabled = true;
+  fetch(location.pathname + '?fragment=1&page=' + button.dataset.page).then(function (response) {
+    var hasMore = response.headers.get('X-Has-More') === '1';
+    return response.text().then(function (cards) {
+      document.querySelector('.search-result__list').insertAdjacentHTML('beforeend', cards);
+      if (hasMore) {
+        button.dataset.page = Number(button.dataset.page) + 1;
+        button.disabled = false;
+      } else {
+        button.remove();
+      }
+    });
+  });
+}
+</script>"""
+
+
+def render_cards(start, count, phrase):
+    return "".join(render_card(i, phrase) for i in range(start, start + count))
+
+
+def render_search_page(count, phrase="Million", sort="relevance", search_path="/search/", consent=True, start=0, next_page=None):
+    cards = render_cards(start, count, phrase)
+    show_more = ""
+    if next_page is not None:
+        show_more = f'<button class="show-more-button" data-page="{next_page}" onclick="loadMore(this)">Show more</button>{SHOW_MORE_SCRIPT}'
+    options = "".join(
+        f'<option value="{value}"{" selected" if value == sort else ""}>{label}</option>'
+        for value, label in (("relevance", "Relevance"), ("date", "Date"))
+    )
+    body = f"""
+{render_search_bar(search_path, phrase)}
+<select id="search-sort-option" onchange="location.href=location.pathname + '?sort=' + this.value">{options}</select>
+{ADS}
+<main class="search-result__list">{cards}</main>
+{show_more}"""
+    return render_page("Search", body, consent)
+
+
+# Paragraphs of every fixture article page, so deep mode has a full body to analyse.
+ARTICLE_PARAGRAPHS = 12
+
+
+def render_article_page(index, phrase="Million", consent=True):
+    paragraphs = "".join(
+        f"<p>Paragraph {number} of story {index}: the {html.escape(phrase.lower())} pledge of ${index},{number:03d} "
+        f"was discussed by officials and families in the region.</p>"
+        for number in range(ARTICLE_PARAGRAPHS)
+    )
+    body = f"""
+<main id="main-content-area">
+  <header class="article-header"><h1>{html.escape(f"{phrase} story number {index} makes headlines")}</h1></header>
+  {ADS}
+  <div class="wysiwyg wysiwyg--all-content">{paragraphs}</div>
+  <aside class="more-on"><p>Related: other stories</p></aside>
+</main>"""
+    return render_page("Article", body, consent)
+
+
+def render_not_found_page(consent=True):
+    return render_page("Page not found", "<main><h1>Sorry, this page was not found</h1></main>", consent)
+
+
+class FixtureSite:
+    """
+    Serves the fixture pages from a background thread.
+    Use as a context manager; the base URL is available as .url once started.
+
+    Search pages hold page_size cards; ?page=N serves the following ones (the HTTP backend pages this way)
+    and ?count=N puts the first N cards on a single page. 'Show more' appends the next page in place,
+    like the real site, and every page or fragment response is delayed by latency seconds.
+
+    Every card links to an article page under /news/, read by deep mode.
+
+    Card images are served with an ETag (hash of .image) and answer a matching If-None-Match with 304;
+    image_statuses lists the status of every image response.
+
+    With direct_search=False the site mimics a layout where /search/<phrase> does not exist
+    and results are only reachable through the homepage search box (served under /results/).
+    """
+
+    def __init__(self, article_count=100, phrase="Million", direct_search=True, page_size=None, latency=0.0):
+        self.article_count = article_count
+        self.page_size = page_size or article_count
+        self.latency = latency
+        self.phrase = phrase
+        self.direct_search = direct_search
+        self.image = PIXEL_JPEG
+        self.image_statuses = []
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/"
+
+    @property
+    def search_path(self):
+        return "/search/" if self.direct_search else "/results/"
+
+    def search_url(self):
+        return f"{self.url}{self.search_path.strip('/')}/{self.phrase}"
+
+    def start(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                consent = "consent=1" in (self.headers.get("Cookie") or "")
+                if parsed.path.startswith("/images/"):
+                    image = site.image
+                    etag = f'"{hashlib.sha1(image).hexdigest()[:16]}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        site.image_statuses.append(304)
+                        self.respond(304, "image/jpeg", b"", {"ETag": etag})
+                    else:
+                        site.image_statuses.append(200)
+                        self.respond(200, "image/jpeg", image, {"ETag": etag})
+                elif parsed.path.startswith("/news/") and "story-" in parsed.path:
+                    time.sleep(site.latency)
+                    index = int(parsed.path.rsplit("story-", 1)[1])
+                    self.respond_html(200, render_article_page(index, site.phrase, consent))
+                elif parsed.path == "/":
+                    self.respond_html(200, render_home_page(site.search_path, consent))
+                elif parsed.path.startswith(site.search_path):
+                    phrase = unquote(parsed.path[len(site.search_path):]) or site.phrase
+                    time.sleep(site.latency)
+                    sort = query.get("sort", ["relevance"])[0]
+                    if "count" in query:
+                        self.respond_html(200, render_search_page(int(query["count"][0]), phrase, sort, site.search_path, consent))
+                        return
+                    page = int(query.get("page", ["0"])[0])
+                    start = page * site.page_size
+                    count = max(0, min(site.page_size, site.article_count - start))
+                    next_page = page + 1 if start + count < site.article_count else None
+                    if "fragment" in query:
+                        body = render_cards(start, count, phrase).encode("utf-8")
+                        self.respond(200, "text/html; charset=utf-8", body, {"X-Has-More": "1" if next_page else "0"})
+                    else:
+                        self.respond_html(200, render_search_page(count, phrase, sort, site.search_path, consent, start, next_page))
+                else:
+                    self.respond_html(404, render_not_found_page(consent))
+
+            def respond_html(self, status, page):
+                self.respond(status, "text/html; charset=utf-8", page.encode("utf-8"))
+
+            def respond(self, status, content_type, body, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -1,10 +1,47 @@
 from robocorp.tasks import task
 from robocorp import workitems
-from Aljazeera import Aljazeera
+from WorkerPool import WorkerPool, queued_payloads, report_item, worker_output_dir
+from Pipeline import CheckpointedSink, NewsPipeline, WorkItemSink
 import logging
+import os
 
-scraper = Aljazeera()
-news_data = []
+# Set by WorkerPool for each worker process so browsers and outputs don't collide.
+WORKER_ID = os.environ.get("WORKER_ID")
+# ALJAZEERA_BASE_URL points the scraper at another host, e.g. the local benchmark fixture site.
+BASE_URL = os.environ.get("ALJAZEERA_BASE_URL")
+# "standard" loads everything; "lean" blocks ads, trackers, images and fonts in the browser.
+BROWSER_PROFILE = os.environ.get("BROWSER_PROFILE", "standard")
+# Crawl index shared across runs (and workers); defaults to output/crawl_index.sqlite
+INDEX_PATH = os.environ.get("CRAWL_INDEX_PATH")
+# Comma-separated list of xlsx, jsonl, csv and parquet
+OUTPUT_FORMATS = os.environ.get("OUTPUT_FORMATS", "xlsx").split(",")
+# Page snapshots for offline re-extraction (python -m SnapshotArchive): "1" archives every work item's
+# results pages unless its payload sets "snapshot"; SNAPSHOT_PATH defaults to output/snapshots
+SNAPSHOT_PAGES = os.environ.get("SNAPSHOT_PAGES", "0") == "1"
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH")
+# Seconds after which an unfinished work item's checkpoint is no longer resumed (default 24 h)
+CHECKPOINT_MAX_AGE = float(os.environ.get("CHECKPOINT_MAX_AGE", 24 * 3600))
+# "0" skips launching Chrome in the background while the first work item is read
+PREWARM_BROWSER = os.environ.get("PREWARM_BROWSER", "1") != "0"
+scraper = None
+
+
+def get_scraper():
+    """
+    Builds the scraper on first use instead of at import time, so loading the task module stays cheap.
+    """
+    global scraper
+    if scraper is None:
+        from Aljazeera import Aljazeera
+
+        if WORKER_ID is not None:
+            scraper = Aljazeera(worker_id=int(WORKER_ID), output_dir=worker_output_dir(WORKER_ID), base_url=BASE_URL,
+                                browser_profile=BROWSER_PROFILE, index_path=INDEX_PATH, snapshot_path=SNAPSHOT_PATH)
+        else:
+            scraper = Aljazeera(base_url=BASE_URL, browser_profile=BROWSER_PROFILE, index_path=INDEX_PATH,
+                                snapshot_path=SNAPSHOT_PATH)
+        scraper.output_formats = OUTPUT_FORMATS
+    return scraper
 
 # Configure logging
 logging.basicConfig(
@@ -17,58 +54,152 @@ def process_news():
     """
     Main task that processes the news by configuring, searching, filtering, and saving to Excel.
     """
+    scraper = None
     try:
-        for item in workitems.inputs:
+        scraper = get_scraper()
+        if PREWARM_BROWSER:
+            # Chrome boots while the first work item is reserved and read
+            scraper.session.prewarm()
+        for index, item in enumerate(workitems.inputs):
             try:
                 # Configure the scraper
                 search_phrase = item.payload.get('search_phrase')
                 max_results = item.payload.get('max_results', 1)
                 sort_by = item.payload.get('sort_by')
-                scraper.configure(search_phrase, max_results, sort_by)
-
-                # Open the site
-                scraper.open_site()
+                # Per-item timings end up in output/run_report.json; "profile" is "cprofile" or "pyinstrument"
+                with scraper.instrumentation.item(f"item-{index}", profile=item.payload.get('profile'),
+                                                  search_phrase=search_phrase) as span:
+                    scraper.configure(
+                        search_phrase, max_results, sort_by,
+                        extraction_mode=item.payload.get('extraction_mode', 'batched'),
+                        navigation_mode=item.payload.get('navigation', 'direct'),
+                        backend=item.payload.get('backend', 'selenium'),
+                        use_index=item.payload.get('use_index', True),
+                        only_new=item.payload.get('only_new', False),
+                        since=item.payload.get('since'),
+                        months=item.payload.get('months'),
+                        resume=item.payload.get('resume', True),
+                        deep=item.payload.get('deep', False),
+                        snapshot=item.payload.get('snapshot', SNAPSHOT_PAGES),
+                        item_id=item.id,
+                        checkpoint_max_age=item.payload.get('checkpoint_max_age', CHECKPOINT_MAX_AGE)
+                    )
+                    scraper.images.configure(
+                        max_workers=item.payload.get('image_concurrency'),
+                        per_host=item.payload.get('image_per_host'),
+                        retries=item.payload.get('image_retries')
+                    )
+                    scraper.image_store.configure(revalidate=item.payload.get('image_revalidate', False))
+                    # Per-command deadlines and restarts of a hung or crashed browser
+                    scraper.session.supervisor.configure(
+                        command_timeout=item.payload.get('driver_command_timeout'),
+                        max_restarts=item.payload.get('driver_max_restarts')
+                    )
+                    if item.payload.get('deep'):
+                        scraper.article_reader().configure(
+                            max_workers=item.payload.get('deep_concurrency'),
+                            per_host=item.payload.get('deep_per_host'),
+                            rate_per_host=item.payload.get('deep_rate'),
+                            parse_workers=item.payload.get('deep_parse_workers')
+                        )
 
-                # Initiate the search
-                scraper.initiate_search()
+                    # Stream the news from the search results through the image downloads (and deep mode
+                    # article reads) to the output work items and files, written in flushes while the
+                    # browser keeps loading. Records a failed attempt already wrote to a sink are not written again.
+                    pipeline = NewsPipeline(
+                        scraper.finish_record,
+                        [CheckpointedSink(sink, scraper.checkpoint) for sink in [WorkItemSink(), *scraper.open_outputs()]],
+                        queue_size=item.payload.get('queue_size', 50),
+                        flush_size=item.payload.get('flush_size', 25),
+                        flush_interval=item.payload.get('flush_interval', 2.0)
+                    )
+                    try:
+                        pipeline.run(scraper.stream_news())
+                    finally:
+                        span["pipeline"] = pipeline.stats()
 
-                # Perform the search
-                scraper.search_news()
+                    # Store the finished records in the crawl index and checkpoint
+                    scraper.join_image_downloads()
 
-                # Filter and sort the results
-                scraper.filter_and_sort_results()
-
-                # Load more results if necessary
-                scraper.load_more_results()
+                    # Mark the work item as done; a retry no longer needs its checkpoint
+                    item.done()
+                    scraper.clear_checkpoint()
+                if WORKER_ID is not None:
+                    report_item(scraper.output_dir, index, 'DONE', len(item.outputs))
+            except Exception as err:
+                code = handle_exceptions(err, item)
+                if WORKER_ID is not None:
+                    report_item(scraper.output_dir, index, 'FAILED', len(item.outputs), code, str(err))
 
-                # Extract the latest news
-                news_data = scraper.extract_latest_news()
+    except Exception as general_err:
+        logging.error(f"General error in processing task: {str(general_err)}")
+        raise
+    finally:
+        # Outputs and the warm browser are finalised once at the end of the run
+        if scraper is not None:
+            scraper.close_outputs()
+            scraper.write_run_report()
+            scraper.close_browser()
 
-                # Save the news data to work items
-                for data in news_data:
-                    workitems.outputs.create(payload=data)
-                    logging.info(f"Work item created for news: {data['title']}")
+@task
+def process_news_parallel():
+    """
+    Hands the queued work items to a pool of process_news worker processes and merges their outputs.
+    The pool size comes from the NEWS_WORKERS environment variable and defaults to the CPU count.
+    Each input item stays in the queue until its worker has processed it, and is then done or failed
+    the way the worker left it.
+    """
+    from NewsArticle import NewsBatch
 
-                # Save the news data to Excel
-                scraper.save_to_excel(news_data)
+    scraper = get_scraper()
+    try:
+        workers = int(os.environ.get("NEWS_WORKERS", os.cpu_count() or 1))
+        pool = WorkerPool(workers, output_root=scraper.output_dir)
+        news_data = NewsBatch()
 
-                # Finalize the process
-                scraper.close_browser()
+        payloads = queued_payloads()
+        if payloads is not None:
+            results = pool.run(payloads)
+            for index, item in enumerate(workitems.inputs):
+                result = results[index] if index < len(results) else pool.run([item.payload])[0]
+                release_item(item, result, news_data)
+        else:
+            # Only one input can be reserved at a time, so without the local queue file they run one by one
+            logging.warning("Input queue cannot be read ahead; processing the work items one at a time")
+            for item in workitems.inputs:
+                release_item(item, pool.run([item.payload])[0], news_data)
 
-                # Mark the work item as done
-                item.done()
-            except Exception as err:
-                handle_exceptions(err, item)
+        scraper.save_to_excel(news_data)
+        scraper.close_outputs()
+        pool.save_json(news_data)
+        scraper.write_run_report(workers=pool.reports())
 
     except Exception as general_err:
-        logging.error(f"General error in processing task: {str(general_err)}")
+        logging.error(f"General error in parallel processing task: {str(general_err)}")
         raise
 
+def release_item(item, result, news_data):
+    """
+    Creates the output work items of an input item from the records its worker produced, then releases it:
+    done, or failed with the worker's error code and message.
+    :param result: Outcome of the item in the worker (see WorkerPool.item_results).
+    :param news_data: NewsBatch the records are merged into.
+    """
+    for record in result["records"]:
+        workitems.outputs.create(payload=record)
+    news_data.extend(result["records"])
+    if result["state"] == 'DONE':
+        item.done()
+    else:
+        item.fail(exception_type='APPLICATION', code=result["code"], message=result["message"])
+        logging.error(f"Work item failed in worker: {result['message']}")
+
 def handle_exceptions(err, work_item):
     """
     Handles exceptions by logging the error and marking the work item as failed.
     :param err: The exception that occurred.
     :param work_item: The work item that was being processed when the exception occurred.
+    :return: The error code the work item was failed with.
     """
     error_message = str(err)
     logging.error(f"Error: {error_message}")
@@ -86,9 +217,14 @@ def handle_exceptions(err, work_item):
         exception_type = 'APPLICATION'
         code = 'UNCAUGHT_ERROR'
     
-    work_item.inputs.current.fail(
-        exception_type=exception_type,
-        code=code,
-        message=error_message
-    )
-    logging.error(f"Work item failed with error: {error_message}")
\ No newline at end of file
+    if work_item.released:
+        # Already failed where the error was raised, with that step's own code
+        code = (work_item.exception or {}).get('code') or code
+    else:
+        work_item.fail(
+            exception_type=exception_type,
+            code=code,
+            message=error_message
+        )
+    logging.error(f"Work item failed with error: {error_message}")
+    return code
\ No newline at end of file
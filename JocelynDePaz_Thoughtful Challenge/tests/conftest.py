@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The robot's modules live in the robot root (robot.yaml puts it on PYTHONPATH)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,89 @@
+import json
+import os
+import time
+
+from Checkpoint import Checkpoint
+from NewsArticle import NewsArticle
+
+SETTINGS = {"search_phrase": "Gaza", "max_results": 10, "sort_by": "Date"}
+
+
+def card(i):
+    return {"title": f"Story {i}", "date": "3 hours ago", "description": None, "news_url": f"https://example.com/{i}"}
+
+
+def saved_checkpoint(directory, item_id="item-1", stage="extracted", **kwargs):
+    checkpoint = Checkpoint.for_item(directory, item_id=item_id, **kwargs, **SETTINGS)
+    for i in range(3):
+        checkpoint.add(card(i), NewsArticle.from_card(card(i)), True)
+    checkpoint.save(stage)
+    return checkpoint
+
+
+def test_retry_of_the_same_item_resumes(tmp_path):
+    saved_checkpoint(tmp_path)
+    checkpoint = Checkpoint.for_item(tmp_path, item_id="item-1", **SETTINGS)
+    assert checkpoint.load()
+    assert checkpoint.stage == "extracted"
+    assert checkpoint.is_processed(card(2))
+
+
+def test_other_item_with_the_same_settings_starts_over(tmp_path):
+    saved_checkpoint(tmp_path)
+    checkpoint = Checkpoint.for_item(tmp_path, item_id="item-2", **SETTINGS)
+    assert not checkpoint.load()
+    assert checkpoint.stage == "extracting"
+
+
+def test_expired_checkpoint_is_discarded(tmp_path):
+    old = saved_checkpoint(tmp_path)
+    with open(old.path, encoding="utf-8") as f:
+        lines = f.readlines()
+    lines[0] = json.dumps({"created_at": time.time() - 3600}) + "\n"
+    with open(old.path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    assert Checkpoint.for_item(tmp_path, max_age=7200, item_id="item-1", **SETTINGS).load()
+    checkpoint = Checkpoint.for_item(tmp_path, max_age=60, item_id="item-1", **SETTINGS)
+    assert not checkpoint.load()
+    assert not os.path.exists(checkpoint.path)
+    assert checkpoint.entries == []
+
+
+def test_checkpoint_without_creation_time_ages_by_file_time(tmp_path):
+    old = saved_checkpoint(tmp_path)
+    with open(old.path, encoding="utf-8") as f:
+        lines = [line for line in f if "created_at" not in line]
+    with open(old.path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    os.utime(old.path, (time.time() - 3600, time.time() - 3600))
+
+    assert not Checkpoint.for_item(tmp_path, max_age=60, item_id="item-1", **SETTINGS).load()
+
+
+def test_rewrite_keeps_the_creation_time(tmp_path):
+    checkpoint = saved_checkpoint(tmp_path)
+    created_at = checkpoint.created_at
+    checkpoint.rewrite()
+    reloaded = Checkpoint.for_item(tmp_path, item_id="item-1", **SETTINGS)
+    assert reloaded.load()
+    assert reloaded.created_at == created_at
+    assert len(reloaded.entries) == 3
+
+
+def test_written_records_are_kept_per_sink(tmp_path):
+    checkpoint = saved_checkpoint(tmp_path, stage=None)
+    checkpoint.mark_written("workitems", ["https://example.com/0", "https://example.com/1"])
+    checkpoint.mark_written("task_extracted.xlsx#1", ["https://example.com/0"])
+
+    reloaded = Checkpoint.for_item(tmp_path, item_id="item-1", **SETTINGS)
+    assert reloaded.load()
+    assert reloaded.is_written("workitems", "https://example.com/1")
+    assert not reloaded.is_written("workitems", "https://example.com/2")
+    assert not reloaded.is_written("task_extracted.xlsx#2", "https://example.com/0")
+
+    reloaded.rewrite()
+    rewritten = Checkpoint.for_item(tmp_path, item_id="item-1", **SETTINGS)
+    assert rewritten.load()
+    assert rewritten.written == reloaded.written
+    assert len(rewritten.entries) == 3
@@ -0,0 +1,33 @@
+from CrawlIndex import CrawlIndex
+from NewsArticle import NewsArticle
+
+
+def card(date):
+    return {"title": "Gaza ceasefire talks", "date": date, "description": "Talks resume.",
+            "news_url": "https://example.com/gaza", "image_url": "https://example.com/gaza.jpg"}
+
+
+def stored_index(tmp_path, date, published_at):
+    index = CrawlIndex(str(tmp_path / "crawl_index.sqlite"))
+    record = NewsArticle.from_card(card(date))
+    record.published_at = published_at
+    index.store([(card(date), record)], "Gaza")
+    return index
+
+
+def test_relative_date_of_the_same_day_is_a_hit(tmp_path):
+    index = stored_index(tmp_path, "3 hours ago", "2024-08-01T09:00:00+00:00")
+    record, search_phrase = index.lookup(card("5 hours ago"), "2024-08-01T07:00:00+00:00")
+    assert record.title == "Gaza ceasefire talks"
+    assert search_phrase == "Gaza"
+
+
+def test_other_publication_day_is_a_miss(tmp_path):
+    index = stored_index(tmp_path, "3 hours ago", "2024-08-01T09:00:00+00:00")
+    assert index.lookup(card("1 day ago"), "2024-07-31T12:00:00+00:00") is None
+
+
+def test_unparsed_date_falls_back_to_the_text(tmp_path):
+    index = stored_index(tmp_path, "sometime", None)
+    assert index.lookup(card("sometime")) is not None
+    assert index.lookup(card("another time")) is None
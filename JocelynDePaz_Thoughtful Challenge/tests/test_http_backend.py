@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("lxml")
+
+from HttpBackend import HttpBackend
+from benchmarks.fixture_site import FixtureSite
+
+
+@pytest.fixture
+def site():
+    with FixtureSite(article_count=25, page_size=10) as site:
+        yield site
+
+
+@pytest.fixture
+def backend():
+    backend = HttpBackend(retries=0)
+    fetch_page = backend.fetch_page
+    backend.requested = []
+
+    def record(url):
+        backend.requested.append(url)
+        return fetch_page(url)
+    backend.fetch_page = record
+    yield backend
+    backend.close()
+
+
+def titles(batches):
+    return [[card["title"] for card in cards] for cards in batches]
+
+
+def test_every_page_is_yielded_as_a_batch(site, backend):
+    batches = list(backend.fetch_card_batches(site.search_url(), 100))
+    assert [len(cards) for cards in batches] == [10, 10, 5]
+    assert len({card["news_url"] for cards in batches for card in cards}) == 25
+
+
+def test_next_page_is_fetched_while_a_batch_is_processed(site, backend):
+    batches = backend.fetch_card_batches(site.search_url(), 100)
+    next(batches)
+    deadline = time.monotonic() + 5
+    while len(backend.requested) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert backend.requested[1].endswith("page=1")
+    batches.close()
+
+
+def test_no_page_is_fetched_past_max_results(site, backend):
+    batches = list(backend.fetch_card_batches(site.search_url(), 15))
+    assert [len(cards) for cards in batches] == [10, 5]
+    assert len(backend.requested) == 2
+
+
+def test_start_skips_the_cards_already_read(site, backend):
+    everything = titles(backend.fetch_card_batches(site.search_url(), 20))
+    resumed = titles(backend.fetch_card_batches(site.search_url(), 20, start=12))
+    assert resumed == [everything[1][2:]]
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from HttpPool import HttpPool, RetryableStatus
+
+
+def flaky(failures):
+    calls = []
+
+    def send():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise RetryableStatus("HTTP 503")
+        return len(calls)
+    return send, calls
+
+
+def test_retryable_failures_are_retried():
+    send, calls = flaky(2)
+    assert HttpPool(retries=2, backoff=0).with_retries("http://example.com/a", send) == 3
+
+
+def test_gives_up_after_the_retries():
+    send, calls = flaky(5)
+    with pytest.raises(RetryableStatus):
+        HttpPool(retries=1, backoff=0).with_retries("http://example.com/a", send)
+    assert len(calls) == 2
+
+
+def test_configure_drains_the_pool_and_keeps_unset_values():
+    pool = HttpPool(max_workers=2, per_host=3, retries=1)
+    executor = pool.start()
+    limit = pool.host_limit("http://example.com/a")
+    assert pool.host_limit("http://example.com/b") is limit
+
+    pool.configure(max_workers="4")
+    assert pool.executor is None and executor._shutdown
+    assert (pool.max_workers, pool.per_host, pool.retries) == (4, 3, 1)
+    assert pool.host_limit("http://example.com/a") is not limit
+
+    pool.configure()
+    assert pool.max_workers == 4
+    pool.close()
@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from ImageDownloader import ImageDownloader
+from ImageStore import ImageStore
+from benchmarks.fixture_site import PIXEL_JPEG, FixtureSite
+
+
+@pytest.fixture
+def site():
+    with FixtureSite(article_count=1) as site:
+        yield site
+
+
+def store_at(tmp_path):
+    return ImageStore(str(tmp_path / "images"), ImageDownloader(max_workers=2, retries=0), str(tmp_path))
+
+
+def fetch(store, url):
+    entry = store.submit(url).result()
+    store.finish()
+    return entry
+
+
+def test_known_image_is_not_requested_again(tmp_path, site):
+    url = f"{site.url}images/story-0.jpg"
+    first = fetch(store_at(tmp_path), url)
+    store = store_at(tmp_path)
+    assert fetch(store, url) == first
+    assert site.image_statuses == [200]
+    assert store.stats()["downloads_skipped"] == 1
+
+
+def test_revalidate_sends_a_conditional_request(tmp_path, site):
+    url = f"{site.url}images/story-0.jpg"
+    first = fetch(store_at(tmp_path), url)
+    assert first["etag"]
+
+    store = store_at(tmp_path)
+    store.configure(revalidate=True)
+    assert fetch(store, url) == first
+    assert site.image_statuses == [200, 304]
+    assert store.stats()["bytes_downloaded"] == 0
+
+    # The image behind the URL changes: the new one is stored
+    site.image = PIXEL_JPEG + b"\x00"
+    changed = fetch(store, url)
+    assert site.image_statuses == [200, 304, 200]
+    assert changed["sha256"] != first["sha256"]
+    assert store_at(tmp_path).load_manifest()[url]["sha256"] == changed["sha256"]
@@ -0,0 +1,54 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("robocorp.workitems")
+pytest.importorskip("requests")
+
+from Aljazeera import Aljazeera
+from benchmarks.fixture_site import FixtureSite
+
+
+def scraper_for(url, tmp_path, search_phrase, sort_by):
+    scraper = Aljazeera(base_url=url, output_dir=str(tmp_path))
+    scraper.configure(search_phrase, 10, sort_by)
+    return scraper
+
+
+def fetch(url):
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+@pytest.mark.parametrize("search_phrase, sort_by, expected", [
+    ("Gaza", "Date", "search/Gaza?sort=date"),
+    ("Gaza", "Relevance", "search/Gaza?sort=relevance"),
+    ("climate change/COP", "Date", "search/climate%20change%2FCOP?sort=date"),
+    ("Gaza", None, "search/Gaza"),
+])
+def test_search_url(tmp_path, search_phrase, sort_by, expected):
+    base_url = "https://www.aljazeera.com/"
+    assert scraper_for(base_url, tmp_path, search_phrase, sort_by).search_url() == base_url + expected
+
+
+def test_search_url_opens_the_sorted_results(tmp_path):
+    with FixtureSite(article_count=5) as site:
+        url = scraper_for(site.url, tmp_path, site.phrase, "Date").search_url()
+        assert url == f"{site.search_url()}?sort=date"
+        status, page = fetch(url)
+    assert status == 200
+    assert page.count("gc u-clickable-card") == 5
+    assert '<option value="date" selected>' in page
+
+
+def test_site_without_a_search_url_answers_not_found(tmp_path):
+    # open_search then falls back to the homepage search box
+    with FixtureSite(article_count=5, direct_search=False) as site:
+        status, page = fetch(scraper_for(site.url, tmp_path, site.phrase, "Date").search_url())
+    assert status == 404
+    assert "gc u-clickable-card" not in page
@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("robocorp.workitems")
+
+from Checkpoint import Checkpoint
+from NewsArticle import NewsArticle
+from Pipeline import CheckpointedSink, NewsPipeline
+
+
+class ListSink:
+    def __init__(self, key):
+        self.key = key
+        self.rows = []
+
+    def write_many(self, records):
+        self.rows.extend(record.title for record in records)
+
+
+def records(count):
+    return [NewsArticle(f"Story {i}", news_url=f"https://example.com/{i}") for i in range(count)]
+
+
+def test_resumed_item_does_not_write_records_twice(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "item.jsonl"))
+    first = ListSink("workitems")
+    NewsPipeline(lambda record: None, [CheckpointedSink(first, checkpoint)], flush_size=1).run(records(2))
+    assert first.rows == ["Story 0", "Story 1"]
+
+    # The retry replays every record: the work items already created are skipped, while the output file
+    # of the new run (another key) gets them all
+    resumed = Checkpoint(str(tmp_path / "item.jsonl"))
+    assert resumed.load()
+    outputs, rows = ListSink("workitems"), ListSink("task_extracted.xlsx#2")
+    sinks = [CheckpointedSink(outputs, resumed), CheckpointedSink(rows, resumed)]
+    NewsPipeline(lambda record: None, sinks).run(records(3))
+    assert outputs.rows == ["Story 2"]
+    assert rows.rows == ["Story 0", "Story 1", "Story 2"]
+
+
+def test_failed_stage_closes_the_producer():
+    closed = []
+
+    def produce():
+        try:
+            for record in records(100):
+                yield record
+        finally:
+            closed.append(True)
+
+    def enrich(record):
+        raise RuntimeError("image download failed")
+
+    with pytest.raises(RuntimeError, match="image download failed"):
+        NewsPipeline(enrich, [ListSink("workitems")], queue_size=2).run(produce())
+    assert closed == [True]
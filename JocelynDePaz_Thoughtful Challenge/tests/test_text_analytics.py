@@ -0,0 +1,72 @@
+import random
+import re
+
+import pytest
+
+from TextAnalytics import TextAnalytics
+
+# The money patterns Aljazeera checked one by one on each article before TextAnalytics, the reference
+# the combined pattern has to agree with.
+LEGACY_MONEY_PATTERNS = [
+    r"\$\d+(?:\.\d{1,2})?",
+    r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+dollars?",
+    r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+USD",
+    r"£\d+(?:,\d{3})*(?:\.\d{1,2})?",
+    r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+pounds?",
+    r"€\d+(?:,\d{3})*(?:\.\d{1,2})?",
+    r"\d+(?:,\d{3})*(?:\.\d{1,2})?\s+euros?",
+]
+
+# Pieces the fuzzed texts are assembled from: ASCII and other scripts' digits, Unicode whitespace
+# (no-break, narrow no-break, thin, ideographic space, tab, newline), separators, symbols and currency words.
+# Scale words between an amount and its currency word are left out: "5 million dollars" is the one format
+# the combined pattern accepts on purpose that the per-article patterns did not (see the test below).
+FRAGMENTS = [
+    "0", "1", "5", "12", "999", "1,200", "3.50", "7.", ",000", "٥", "５", "߅", "१२",
+    " ", "  ", "\xa0", " ", " ", "　", "\t", "\n", "",
+    "$", "£", "€", "dollar", "dollars", "Dollars", "USD", "usd", "pound", "pounds", "euro", "euros",
+    "bn", "k", "the", "cost", "aid", "-", "(", ")", "x",
+]
+
+
+def legacy_contains_money(text):
+    return any(re.search(pattern, text, re.IGNORECASE) for pattern in LEGACY_MONEY_PATTERNS)
+
+
+def fuzzed_texts(count, seed=14):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("It cost 5\xa0dollars", True),
+    ("It cost 5 USD", True),
+    ("It cost ٥ euros", True),
+    ("It cost $５", True),
+    ("It cost 5 dollars", True),
+    ("It cost five dollars", False),
+])
+def test_unicode_whitespace_and_digits_count_as_money(text, expected):
+    assert legacy_contains_money(text) is expected
+    assert bool(TextAnalytics("aid").find_money(text)) is expected
+
+
+def test_scale_word_before_the_currency_word_counts_as_money():
+    assert not legacy_contains_money("5 million dollars")
+    assert TextAnalytics("aid").find_money("5 million dollars")[0]["value"] == 5e6
+
+
+def test_contains_money_agrees_with_the_per_article_patterns():
+    texts = fuzzed_texts(20000)
+    analytics = TextAnalytics("aid")
+    for text in texts:
+        assert bool(analytics.find_money(text)) == legacy_contains_money(text), repr(text)
+
+
+def test_batched_analysis_agrees_with_the_per_article_patterns():
+    texts = fuzzed_texts(5000, seed=41)
+    records = [{"title": title, "description": description} for title, description in zip(texts[::2], texts[1::2])]
+    TextAnalytics("aid").analyse_batch(records)
+    for record in records:
+        expected = legacy_contains_money(record["title"] + " " + record["description"])
+        assert record["contains_money"] == expected, repr(record)
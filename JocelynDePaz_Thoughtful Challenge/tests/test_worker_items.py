@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("robocorp.workitems")
+
+from WorkerPool import WorkerPool
+
+ROBOT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs process_news in a worker process with a scraper that fails to configure the "boom" item.
+WORKER = """
+import sys
+from unittest import mock
+
+import tasks
+from Checkpoint import Checkpoint
+from NewsArticle import NewsArticle
+
+
+def configure(search_phrase, *args, **kwargs):
+    if search_phrase == "boom":
+        raise RuntimeError("NAVIGATION failed for boom")
+    scraper.search_phrase = search_phrase
+    scraper.checkpoint = Checkpoint(f"{sys.argv[1]}/{search_phrase}.jsonl")
+
+
+scraper = mock.MagicMock()
+scraper.output_dir = sys.argv[1]
+scraper.configure.side_effect = configure
+scraper.open_outputs.return_value = []
+scraper.stream_news.side_effect = lambda: iter([NewsArticle(f"Story about {scraper.search_phrase}")])
+tasks.get_scraper = lambda: scraper
+tasks.WORKER_ID = "0"
+tasks.PREWARM_BROWSER = False
+tasks.process_news()
+"""
+
+
+def test_failed_item_is_reported_and_the_next_one_runs(tmp_path):
+    pool = WorkerPool(1, output_root=str(tmp_path))
+    paths = pool.paths(0)
+    os.makedirs(os.path.dirname(paths["input"]))
+    with open(paths["input"], "w") as f:
+        json.dump([{"payload": {"search_phrase": phrase}, "files": {}} for phrase in ("Gaza", "boom", "Climate")], f)
+
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(sys.path),
+        RC_WORKITEM_ADAPTER="FileAdapter",
+        RC_WORKITEM_INPUT_PATH=paths["input"],
+        RC_WORKITEM_OUTPUT_PATH=paths["output"],
+    )
+    process = subprocess.run([sys.executable, "-c", WORKER, paths["dir"]], cwd=ROBOT_ROOT, env=env,
+                             capture_output=True, text=True, timeout=60)
+    assert process.returncode == 0, process.stderr
+
+    results = pool.item_results(0, 3, process.returncode)
+    assert [result["state"] for result in results] == ["DONE", "FAILED", "DONE"]
+    assert results[1]["code"] == "NAVIGATION_ERROR"
+    assert [record["title"] for record in results[2]["records"]] == ["Story about Climate"]
+
+
+def test_scraper_errors_are_not_hidden_by_the_cleanup(tmp_path):
+    script = (
+        "import tasks\n"
+        "def get_scraper():\n"
+        "    raise RuntimeError('Chrome did not start')\n"
+        "tasks.get_scraper = get_scraper\n"
+        "tasks.process_news()\n"
+    )
+    process = subprocess.run([sys.executable, "-c", script], cwd=ROBOT_ROOT, capture_output=True, text=True, timeout=60,
+                             env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), RC_WORKITEM_ADAPTER="FileAdapter"))
+    assert process.returncode != 0
+    assert "RuntimeError: Chrome did not start" in process.stderr
+    assert "AttributeError" not in process.stderr
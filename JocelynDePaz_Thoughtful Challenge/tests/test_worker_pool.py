@@ -0,0 +1,61 @@
+import json
+import os
+
+from WorkerPool import WorkerPool, queued_payloads, report_item
+
+
+def write_outputs(pool, worker_id, records):
+    path = pool.paths(worker_id)["output"]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump([{"payload": record, "files": {}} for record in records], f)
+
+
+def test_reported_items_get_their_own_records(tmp_path):
+    pool = WorkerPool(2, output_root=str(tmp_path))
+    directory = pool.paths(0)["dir"]
+    write_outputs(pool, 0, [{"title": "a"}, {"title": "b"}, {"title": "c"}])
+    report_item(directory, 0, "DONE", 2)
+    report_item(directory, 1, "FAILED", 1, "NETWORK_ERROR", "NETWORK down")
+
+    done, failed = pool.item_results(0, 2, 0)
+    assert done["state"] == "DONE"
+    assert [record["title"] for record in done["records"]] == ["a", "b"]
+    assert failed["state"] == "FAILED"
+    assert failed["code"] == "NETWORK_ERROR"
+    assert [record["title"] for record in failed["records"]] == ["c"]
+
+
+def test_items_a_crashed_worker_did_not_report_are_failed(tmp_path):
+    pool = WorkerPool(1, output_root=str(tmp_path))
+    directory = pool.paths(0)["dir"]
+    write_outputs(pool, 0, [{"title": "a"}, {"title": "b"}])
+    report_item(directory, 0, "DONE", 1)
+    with open(pool.paths(0)["results"], "a") as f:
+        f.write('{"index": 1, "sta')
+
+    results = pool.item_results(0, 3, -9)
+    assert [result["state"] for result in results] == ["DONE", "FAILED", "FAILED"]
+    assert results[1]["code"] == "WORKER_FAILED"
+    assert "-9" in results[1]["message"]
+    # The item in progress when the worker died keeps the outputs it created
+    assert [record["title"] for record in results[1]["records"]] == ["b"]
+    assert results[2]["records"] == []
+
+
+def test_results_follow_the_queue_order(tmp_path):
+    pool = WorkerPool(2, output_root=str(tmp_path))
+    partitions = pool.partition(list(range(5)))
+    assert partitions == [[0, 2, 4], [1, 3]]
+
+
+def test_queued_payloads_reads_the_local_queue(tmp_path, monkeypatch):
+    path = tmp_path / "work-items.json"
+    path.write_text(json.dumps([{"payload": {"search_phrase": "Gaza"}}, {"payload": {"search_phrase": "Climate"}}]))
+    monkeypatch.delenv("RC_WORKITEM_ADAPTER", raising=False)
+    monkeypatch.delenv("RPA_WORKITEMS_ADAPTER", raising=False)
+    monkeypatch.setenv("RC_WORKITEM_INPUT_PATH", str(path))
+    assert queued_payloads() == [{"search_phrase": "Gaza"}, {"search_phrase": "Climate"}]
+
+    monkeypatch.setenv("RC_WORKITEM_ADAPTER", "RobocorpAdapter")
+    assert queued_payloads() is None